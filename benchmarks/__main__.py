@@ -0,0 +1,60 @@
+"""Runs the whole benchmark suite offline and writes a single JSON report.
+
+.. code-block:: bash
+
+    python -m benchmarks --output bench.json
+    python -m benchmarks --quick
+
+The report records the package version, Python version and time of the run, so reports of several
+releases may be compared to track regressions.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from . import client, memory_objects, memory_records, parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="file to write the JSON report to (defaults to stdout)")
+    parser.add_argument("--quick", action="store_true", help="run with small sizes, as a smoke test")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        sizes = {"requests": 20, "repeat": 20, "objects": 50, "records": 10000}
+    else:
+        sizes = {"requests": 500, "repeat": 2000, "objects": 5000, "records": 1000000}
+
+    try:
+        from pbr.version import VersionInfo
+
+        version = VersionInfo("instahashtag").version_string()
+    except Exception:
+        version = None
+
+    report = {
+        "version": version,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "sizes": sizes,
+        "client": client.run(requests=sizes["requests"]),
+        "parse": parse.run(repeat=sizes["repeat"]),
+        "memory_objects": memory_objects.run(count=sizes["objects"]),
+        "memory_records": memory_records.run(count=sizes["records"]),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
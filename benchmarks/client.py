@@ -0,0 +1,123 @@
+"""Measures client throughput and latency against a local :py:class:`~instahashtag.mock.MockServer`.
+
+Reports requests/sec and p50/p95/p99 latency of ``api.tag``, ``api.graph`` and ``api.maps`` for the
+sync and aio transports, and of ``api.tag_many`` at varying concurrency, as JSON.
+
+.. code-block:: bash
+
+    python -m benchmarks.client --requests 500 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from instahashtag import api, utils
+from instahashtag.http import Client
+from instahashtag.mock import MockServer
+
+BBOX = (-80.48712034709753, 25.750749758162012, -79.82794065959753, 25.854604964203453, 12)
+
+
+def percentile(values, q):
+    """Returns the ``q``-th percentile (``0`` to ``100``) of ``values`` by linear interpolation."""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarize(latencies, elapsed):
+    return {
+        "requests": len(latencies),
+        "requests_per_sec": len(latencies) / elapsed if elapsed else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def query(kind, i, client):
+    if kind == "maps":
+        return api.maps(*BBOX, client=client)
+    return getattr(api, kind)("tag{}".format(i), client=client)
+
+
+def sync(kind, requests, url):
+    latencies = []
+    with Client(base_url=url) as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            begin = time.perf_counter()
+            query(kind, i, client)
+            latencies.append(time.perf_counter() - begin)
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+
+async def aio(kind, requests, url, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i, client):
+        async with semaphore:
+            begin = time.perf_counter()
+            await query(kind, i, client)
+            latencies.append(time.perf_counter() - begin)
+
+    async with Client(aio=True, base_url=url, limit_per_host=concurrency) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i, client) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+
+async def batch(requests, url, concurrency):
+    async with Client(aio=True, base_url=url, limit_per_host=concurrency) as client:
+        start = time.perf_counter()
+        errors = 0
+        hashtags = ("tag{}".format(i) for i in range(requests))
+        async for result in api.tag_many(hashtags, concurrency=concurrency, client=client):
+            errors += result.error is not None
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_sec": requests / elapsed,
+    }
+
+
+def run(requests=200, latency=0.005, concurrency=(1, 4, 16, 64)):
+    server = MockServer(latency=latency)
+    report = {"server_latency_ms": latency * 1000, "endpoints": {}, "batch": {}}
+
+    with server.background() as server:
+        for kind in ("tag", "graph", "maps"):
+            report["endpoints"][kind] = {
+                "sync": sync(kind, requests, server.url),
+                "aio": utils.run(aio(kind, requests, server.url, max(concurrency))),
+            }
+        for level in concurrency:
+            report["batch"][str(level)] = utils.run(batch(requests, server.url, level))
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args(argv)
+
+    report = run(args.requests, args.latency, tuple(args.concurrency))
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measures the memory held by ``Tag``, ``Graph`` and ``Maps`` object graphs at scale.
+
+Builds ``--count`` wrapper objects of each type from synthetic replies, materialising every record,
+and prints the retained and peak memory as JSON.
+
+.. code-block:: bash
+
+    python -m benchmarks.memory_objects --count 10000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from instahashtag import Graph, Maps, Tag, mock
+
+
+def build(kind, i):
+    if kind == "tag":
+        tag = Tag.from_body("tag{}".format(i), mock.encode(mock.tag(seed=i)))
+        tag.results
+        return tag
+    elif kind == "graph":
+        graph = Graph.from_body("tag{}".format(i), mock.encode(mock.graph(seed=i)))
+        graph.nodes, graph.edges
+        return graph
+    else:
+        maps = Maps.from_body(0, 0, 1, 1, 12, mock.encode(mock.maps(seed=i)))
+        maps.tags
+        return maps
+
+
+def measure(kind, count):
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(kind, i) for i in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return {"count": count, "bytes": current, "peak_bytes": peak, "bytes_per_object": current / count}
+
+
+def run(count=1000):
+    return {kind: measure(kind, count) for kind in ("tag", "graph", "maps")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    report = run(args.count)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compares the memory used by the result records against plain ``__dict__`` objects.
+
+Builds ``--count`` synthetic records of every record type, drawing hashtags from a vocabulary of
+``--vocabulary`` distinct names (each occurrence being a fresh string, as returned by a JSON
+decoder), and prints the peak memory of each representation as JSON.
+
+.. code-block:: bash
+
+    python -m benchmarks.memory_records --count 1000000
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from instahashtag.wrapper.graph import GraphEdge, GraphNode
+from instahashtag.wrapper.maps import MapsTag
+from instahashtag.wrapper.tag import TagResult
+
+
+class Legacy:
+    """Record stored in a ``__dict__``, as the records were before being slotted."""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def fresh(name):
+    """Returns an equal but distinct string object, as a JSON decoder would."""
+    return (name + " ")[:-1]
+
+
+def rows(kind, count, vocabulary, seed=0):
+    rand = random.Random(seed)
+    names = ["tag{}".format(i) for i in range(vocabulary)]
+
+    for i in range(count):
+        a, b = fresh(rand.choice(names)), fresh(rand.choice(names))
+        if kind == "TagResult":
+            yield {
+                "tag": a,
+                "rank": rand.randint(0, 100),
+                "geo": [rand.uniform(-90, 90), rand.uniform(-180, 180)],
+                "media_count": rand.randint(0, 10 ** 7),
+                "relevance": rand.randint(0, 100),
+                "absRelevance": rand.random(),
+            }
+        elif kind == "GraphNode":
+            yield {
+                "id": a,
+                "relevance": rand.random(),
+                "weight": rand.random(),
+                "x": rand.random(),
+                "y": rand.random(),
+            }
+        elif kind == "GraphEdge":
+            yield {"a": a, "b": b, "id": "{}#{}".format(a, b), "weight": rand.random()}
+        else:
+            yield {
+                "centroid": [rand.uniform(-90, 90), rand.uniform(-180, 180)],
+                "tag": a,
+                "weight": rand.randint(0, 100),
+            }
+
+
+def measure(factory, kind, count, vocabulary):
+    gc.collect()
+    tracemalloc.start()
+    records = [factory(**row) for row in rows(kind, count, vocabulary)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return {"bytes": current, "peak_bytes": peak, "bytes_per_record": current / count}
+
+
+def run(count=1000000, vocabulary=20000):
+    report = {"count": count, "vocabulary": vocabulary, "records": {}}
+    for cls in (TagResult, GraphNode, GraphEdge, MapsTag):
+        kind = cls.__name__
+        legacy = measure(Legacy, kind, count, vocabulary)
+        slotted = measure(cls, kind, count, vocabulary)
+        report["records"][kind] = {
+            "legacy": legacy,
+            "slotted": slotted,
+            "reduction": 1 - slotted["bytes"] / legacy["bytes"],
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    report = run(args.count, args.vocabulary)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
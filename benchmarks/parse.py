@@ -0,0 +1,62 @@
+"""Measures the parse time per response of every installed JSON decoder.
+
+For each endpoint payload, times decoding the raw ``bytes`` body alone, and decoding it into the
+wrapper object with every record materialised. Prints the results (microseconds per response) as JSON.
+
+.. code-block:: bash
+
+    python -m benchmarks.parse --repeat 2000
+"""
+
+import argparse
+import json
+import timeit
+
+from instahashtag import Graph, Maps, Tag, decoder, mock
+
+
+def bodies():
+    return {
+        "tag": mock.encode(mock.tag()),
+        "graph": mock.encode(mock.graph()),
+        "maps": mock.encode(mock.maps()),
+    }
+
+
+def build(kind, body, loads):
+    if kind == "tag":
+        return Tag.from_body("miami", body, loads=loads).results
+    elif kind == "graph":
+        graph = Graph.from_body("miami", body, loads=loads)
+        return graph.nodes, graph.edges
+    else:
+        return Maps.from_body(0, 0, 1, 1, 12, body, loads=loads).tags
+
+
+def run(repeat=2000):
+    report = {"repeat": repeat, "default": decoder.DEFAULT, "decoders": {}}
+    for name, loads in sorted(decoder.DECODERS.items()):
+        results = report["decoders"][name] = {}
+        for kind, body in bodies().items():
+            decode = timeit.timeit(lambda: loads(body), number=repeat)
+            wrap = timeit.timeit(lambda: build(kind, body, loads), number=repeat)
+            results[kind] = {
+                "bytes": len(body),
+                "decode_us": decode / repeat * 1e6,
+                "wrapper_us": wrap / repeat * 1e6,
+            }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
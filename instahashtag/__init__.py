@@ -1 +1,2 @@
 from .wrapper import *
+from .http import Client
@@ -1,14 +1,22 @@
-from typing import Union, Awaitable
+import threading
+from typing import AsyncIterator, Iterable, Iterator, Tuple, Union, Awaitable
 
-from . import http
+from . import batch, http
 
 
-def tag(hashtag: str, aio: bool = False) -> Union[dict, Awaitable]:
+def tag(
+    hashtag: str,
+    aio: bool = False,
+    client: http.Client = None,
+) -> Union[dict, Awaitable]:
     """Sends a request to the server.
 
     Args:
         hashtag: Hashtag to retrieve info from.
         aio: If set to ``True`` will return a Future for use with ``await`` keyword. Defaults to ``False``.
+        client: Optional :py:class:`~instahashtag.http.Client` whose pooled session is reused for the
+            request. When given, the client's transport decides between sync and async, and ``aio``
+            is ignored.
 
     Return:
         Dictionary with given data (see Notes below).
@@ -37,18 +45,27 @@ def tag(hashtag: str, aio: bool = False) -> Union[dict, Awaitable]:
             }
     """
 
-    if aio:
+    if client is not None:
+        return client.tag(hashtag=hashtag)
+    elif aio:
         return http.Aiohttp.tag(hashtag=hashtag)
     else:
         return http.Requests.tag(hashtag=hashtag)
 
 
-def graph(hashtag: str, aio: bool = False) -> Union[dict, Awaitable]:
+def graph(
+    hashtag: str,
+    aio: bool = False,
+    client: http.Client = None,
+) -> Union[dict, Awaitable]:
     """Generates graphing query to send to the server.
 
     Args:
         hashtag: Hashtag to retrieve info from.
         aio: If set to ``True`` will return a Future for use with ``await`` keyword. Defaults to ``False``.
+        client: Optional :py:class:`~instahashtag.http.Client` whose pooled session is reused for the
+            request. When given, the client's transport decides between sync and async, and ``aio``
+            is ignored.
 
     Return:
         Dictionary with given data (see Notes below).
@@ -81,7 +98,9 @@ def graph(hashtag: str, aio: bool = False) -> Union[dict, Awaitable]:
             }
     """
 
-    if aio:
+    if client is not None:
+        return client.graph(hashtag=hashtag)
+    elif aio:
         return http.Aiohttp.graph(hashtag=hashtag)
     else:
         return http.Requests.graph(hashtag=hashtag)
@@ -94,6 +113,7 @@ def maps(
     y2: float,
     zoom: float = 1,
     aio: bool = False,
+    client: http.Client = None,
 ) -> Union[dict, Awaitable]:
     """Generates graphing query to send to the server.
 
@@ -104,6 +124,9 @@ def maps(
         y2: Bottom right y-coordinate corner of the map.
         zoom: Number from 2 to 16 that designates the zoom factor.
         aio: If set to ``True`` will return a Future for use with ``await`` keyword. Defaults to ``False``.
+        client: Optional :py:class:`~instahashtag.http.Client` whose pooled session is reused for the
+            request. When given, the client's transport decides between sync and async, and ``aio``
+            is ignored.
 
     Return:
         Dictionary with given data (see Notes below).
@@ -129,7 +152,191 @@ def maps(
             }
     """
 
-    if aio:
+    if client is not None:
+        return client.maps(x1=x1, y1=y1, x2=x2, y2=y2, zoom=zoom)
+    elif aio:
         return http.Aiohttp.maps(x1=x1, y1=y1, x2=x2, y2=y2, zoom=zoom)
     else:
         return http.Requests.maps(x1=x1, y1=y1, x2=x2, y2=y2, zoom=zoom)
+
+
+async def _many(fetch, queries, concurrency, client):
+    """Runs a batch of ``fetch(query, client)`` calls over one shared asynchronous client."""
+
+    owned = client is None
+    if owned:
+        client = http.Client(aio=True)
+    elif not client.aio:
+        raise ValueError("batch queries require an asynchronous client (aio=True)")
+
+    try:
+        async for result in batch.as_completed(
+            lambda query: fetch(query, client),
+            queries,
+            concurrency=concurrency,
+        ):
+            yield result
+    finally:
+        if owned:
+            await client.aclose()
+
+
+def tag_many(
+    hashtags: Iterable[str],
+    concurrency: int = 10,
+    client: http.Client = None,
+) -> AsyncIterator[batch.BatchResult]:
+    """Asynchronously queries the ``tag`` endpoint for many hashtags.
+
+    .. code-block:: python
+
+        from instahashtag import api
+
+        async def main():
+            async for result in api.tag_many(["miami", "travel"], concurrency=20):
+                if result.error is None:
+                    print(result.query, result.data["rank"])
+
+    Args:
+        hashtags: Iterable of hashtags to retrieve info from.
+        concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+            If not given, one is opened for the duration of the batch.
+
+    Return:
+        Async generator of :py:class:`~instahashtag.batch.BatchResult`, in completion order, whose
+        ``data`` follows the format of :py:func:`tag`.
+    """
+    return _many(lambda hashtag, client: client.tag(hashtag=hashtag), hashtags, concurrency, client)
+
+
+def graph_many(
+    hashtags: Iterable[str],
+    concurrency: int = 10,
+    client: http.Client = None,
+) -> AsyncIterator[batch.BatchResult]:
+    """Asynchronously queries the ``graph`` endpoint for many hashtags.
+
+    Args:
+        hashtags: Iterable of hashtags to retrieve info from.
+        concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+            If not given, one is opened for the duration of the batch.
+
+    Return:
+        Async generator of :py:class:`~instahashtag.batch.BatchResult`, in completion order, whose
+        ``data`` follows the format of :py:func:`graph`.
+    """
+    return _many(lambda hashtag, client: client.graph(hashtag=hashtag), hashtags, concurrency, client)
+
+
+def maps_many(
+    bboxes: Iterable[Tuple[float, float, float, float, float]],
+    concurrency: int = 10,
+    client: http.Client = None,
+) -> AsyncIterator[batch.BatchResult]:
+    """Asynchronously queries the ``maps`` endpoint for many bounding boxes.
+
+    Args:
+        bboxes: Iterable of ``(x1, y1, x2, y2, zoom)`` tuples. The ``zoom`` may be omitted, in
+            which case it defaults to ``1`` as in :py:func:`maps`.
+        concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+            If not given, one is opened for the duration of the batch.
+
+    Return:
+        Async generator of :py:class:`~instahashtag.batch.BatchResult`, in completion order, whose
+        ``query`` is the bounding box tuple and ``data`` follows the format of :py:func:`maps`.
+    """
+    return _many(lambda bbox, client: maps(*bbox, client=client), bboxes, concurrency, client)
+
+
+def _threaded(fetch, queries, workers, ordered, client):
+    """Runs a batch of ``fetch(query, client)`` calls on a thread pool, with a forked client per thread."""
+
+    owned = client is None
+    if owned:
+        client = http.Client()
+    elif client.aio:
+        raise ValueError("threaded batch queries require a synchronous client (aio=False)")
+
+    local = threading.local()
+    forks = []
+    lock = threading.Lock()
+
+    def run(query):
+        forked = getattr(local, "client", None)
+        if forked is None:
+            forked = local.client = client.fork()
+            with lock:
+                forks.append(forked)
+        return fetch(query, forked)
+
+    try:
+        yield from batch.threaded(run, queries, workers=workers, ordered=ordered)
+    finally:
+        for forked in forks:
+            forked.close()
+        if owned:
+            client.close()
+
+
+def tag_threaded(
+    hashtags: Iterable[str],
+    workers: int = 10,
+    ordered: bool = False,
+    client: http.Client = None,
+) -> Iterator[batch.BatchResult]:
+    """Queries the ``tag`` endpoint for many hashtags from a pool of threads, without asyncio.
+
+    Every worker thread gets its own pooled ``requests.Session`` (see :py:func:`~instahashtag.http.Client.fork`),
+    while the cache, limiters and retry policy of ``client`` are shared by all of them.
+
+    .. code-block:: python
+
+        from instahashtag import api
+
+        for result in api.tag_threaded(["miami", "travel"], workers=20, ordered=True):
+            if result.error is None:
+                print(result.query, result.data["rank"])
+
+    Args:
+        hashtags: Iterable of hashtags to retrieve info from.
+        workers: Number of worker threads, i.e. in-flight requests. Defaults to ``10``.
+        ordered: If set to ``True`` results are yielded in the order of ``hashtags``, otherwise as
+            they complete. Defaults to ``False``.
+        client: Optional synchronous :py:class:`~instahashtag.http.Client` whose settings every thread
+            shares. If not given, one is opened for the duration of the batch.
+
+    Return:
+        Generator of :py:class:`~instahashtag.batch.BatchResult`, whose ``data`` follows the format of
+        :py:func:`tag`. Closing it early cancels the remaining hashtags (see :py:func:`~instahashtag.batch.threaded`).
+    """
+    return _threaded(lambda hashtag, client: client.tag(hashtag=hashtag), hashtags, workers, ordered, client)
+
+
+def graph_threaded(
+    hashtags: Iterable[str],
+    workers: int = 10,
+    ordered: bool = False,
+    client: http.Client = None,
+) -> Iterator[batch.BatchResult]:
+    """Queries the ``graph`` endpoint for many hashtags from a pool of threads, without asyncio.
+
+    See :py:func:`tag_threaded` for the arguments; ``data`` follows the format of :py:func:`graph`.
+    """
+    return _threaded(lambda hashtag, client: client.graph(hashtag=hashtag), hashtags, workers, ordered, client)
+
+
+def maps_threaded(
+    bboxes: Iterable[Tuple[float, float, float, float, float]],
+    workers: int = 10,
+    ordered: bool = False,
+    client: http.Client = None,
+) -> Iterator[batch.BatchResult]:
+    """Queries the ``maps`` endpoint for many bounding boxes from a pool of threads, without asyncio.
+
+    See :py:func:`tag_threaded` and :py:func:`maps_many` for the arguments; ``data`` follows the
+    format of :py:func:`maps`.
+    """
+    return _threaded(lambda bbox, client: maps(*bbox, client=client), bboxes, workers, ordered, client)
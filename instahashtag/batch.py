@@ -0,0 +1,145 @@
+import asyncio
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+BatchResult = namedtuple("BatchResult", ["query", "data", "error"])
+BatchResult.__doc__ = """Result of a single item of a batch.
+
+Attributes:
+    query: Item that was queried (a hashtag, or a bounding box tuple).
+    data: Data returned back by the API, or ``None`` if the request failed.
+    error: Exception raised while querying the item, or ``None`` if the request succeeded.
+"""
+
+
+async def _run(fetch: Callable[[Any], Awaitable], query: Any) -> BatchResult:
+    try:
+        data = await fetch(query)
+    except asyncio.CancelledError:
+        raise
+    except Exception as error:
+        return BatchResult(query, None, error)
+    return BatchResult(query, data, None)
+
+
+async def as_completed(
+    fetch: Callable[[Any], Awaitable],
+    queries: Iterable,
+    concurrency: int = 10,
+) -> AsyncIterator[BatchResult]:
+    """Runs ``fetch`` over every item of ``queries``, yielding results as they complete.
+
+    At most ``concurrency`` requests are in-flight at any moment. Items are pulled lazily from
+    ``queries``, so arbitrarily large iterables (or generators) never materialize more than
+    ``concurrency`` tasks at a time. Exceptions raised by ``fetch`` are collected into the
+    :py:class:`BatchResult` of the failing item instead of interrupting the batch.
+
+    Args:
+        fetch: Coroutine function that receives a single item and queries the API.
+        queries: Iterable of items to query.
+        concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+
+    Yields:
+        :py:class:`BatchResult` objects in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1, got {}".format(concurrency))
+
+    queries = iter(queries)
+    pending = set()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    query = next(queries)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(_run(fetch, query)))
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _call(fetch: Callable[[Any], Any], query: Any) -> BatchResult:
+    try:
+        data = fetch(query)
+    except Exception as error:
+        return BatchResult(query, None, error)
+    return BatchResult(query, data, None)
+
+
+def threaded(
+    fetch: Callable[[Any], Any],
+    queries: Iterable,
+    workers: int = 10,
+    ordered: bool = False,
+    max_pending: int = None,
+) -> Iterator[BatchResult]:
+    """Runs the synchronous ``fetch`` over every item of ``queries`` on a pool of ``workers`` threads.
+
+    The synchronous counterpart of :py:func:`as_completed`. Items are pulled lazily from ``queries``
+    and at most ``max_pending`` of them are submitted to the pool at once, so memory stays bounded
+    however large the iterable. Closing the generator early (``break``, an exception, or
+    ``KeyboardInterrupt``) cancels the submitted items that have not started, and waits for the
+    running ones to return.
+
+    Args:
+        fetch: Function that receives a single item and queries the API. It is called from the worker threads.
+        queries: Iterable of items to query.
+        workers: Number of worker threads. Defaults to ``10``.
+        ordered: If set to ``True`` results are yielded in the order of ``queries``, otherwise as they
+            complete. Defaults to ``False``.
+        max_pending: Maximum number of submitted items. Defaults to ``2 * workers``.
+
+    Yields:
+        :py:class:`BatchResult` objects.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1, got {}".format(workers))
+
+    max_pending = max(max_pending or 2 * workers, 1)
+    queries = iter(queries)
+    pending = deque() if ordered else set()
+    exhausted = False
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    query = next(queries)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    future = executor.submit(_call, fetch, query)
+                    if ordered:
+                        pending.append(future)
+                    else:
+                        pending.add(future)
+
+            if not pending:
+                return
+
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
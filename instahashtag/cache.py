@@ -0,0 +1,294 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Union
+
+
+class MemoryCache:
+    """In-memory response cache with a size bound, LRU eviction and per-endpoint TTL.
+
+    Entries are keyed by the final endpoint URL (as built from :py:class:`~instahashtag.http.endpoints`)
+    and hold the processed data returned by :py:func:`~instahashtag.http.Base.process`. The cache is
+    thread-safe, and may be shared by synchronous and asynchronous clients alike.
+
+    .. code-block:: python
+
+        from instahashtag import Client, Tag
+        from instahashtag.cache import MemoryCache
+
+        cache = MemoryCache(maxsize=10000, ttl={"tag": 3600, "graph": 3600, "maps": 300})
+
+        with Client(cache=cache) as client:
+            Tag("miami", client=client)
+            Tag("miami", client=client)  # Served from the cache.
+
+        cache.stats() # >>> {'hits': 1, 'misses': 1, 'evictions': 0, 'expirations': 0, 'size': 1}
+
+    Note:
+        Cached data is returned as-is to every caller, so it should be treated as read-only.
+        For a cache that survives restarts see :py:class:`DiskCache`.
+
+    Args:
+        maxsize: Maximum number of entries held. Defaults to ``1024``.
+        ttl: Seconds an entry stays fresh. Either a single number used for every endpoint, or a
+            dictionary keyed by endpoint kind (``"tag"``, ``"graph"``, ``"maps"``); kinds missing
+            from the dictionary never expire. ``None`` disables expiry. Defaults to ``3600``.
+    """
+
+    raw = False
+
+    def __init__(self, maxsize: int = 1024, ttl: Union[float, Dict[str, float]] = 3600.0) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1, got {}".format(maxsize))
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, kind: str = None) -> Union[float, None]:
+        """Returns the TTL (in seconds) of the given endpoint kind, or ``None`` if it never expires."""
+        if isinstance(self.ttl, dict):
+            return self.ttl.get(kind)
+        return self.ttl
+
+    def get(self, key: str) -> Any:
+        """Returns the fresh entry stored under ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, kind: str = None) -> None:
+        """Stores ``value`` under ``key``, evicting the least recently used entries if full."""
+        ttl = self.ttl_for(kind)
+        expires = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry from the cache. Counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Returns the hit, miss, eviction and expiration counters along with the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+
+class DiskCache:
+    """On-disk response cache backed by SQLite, which survives process restarts.
+
+    Unlike :py:class:`MemoryCache`, entries hold the raw (``zlib`` compressed) response body rather
+    than the processed data, so a cache hit is re-parsed through :py:func:`~instahashtag.http.Base.process`.
+    This allows the processing to change without re-downloading anything. Each endpoint URL is
+    stored as a single row along with the time it was fetched.
+
+    The database runs in WAL mode with a busy timeout, so several worker processes (and threads,
+    each with their own connection) may share the same file safely.
+
+    .. code-block:: python
+
+        from instahashtag import Client, Tag
+        from instahashtag.cache import DiskCache
+
+        cache = DiskCache("responses.db", ttl={"tag": 86400, "maps": 3600}, max_bytes=512 * 2 ** 20)
+
+        with Client(cache=cache) as client:
+            Tag("miami", client=client)
+
+    Args:
+        path: Path to the SQLite database file. It is created if it does not exist.
+        ttl: Same as in :py:class:`MemoryCache`, measured against the fetched-at timestamp.
+        max_bytes: Maximum size of the stored (compressed) bodies. When exceeded, the oldest rows
+            are removed by :py:func:`vacuum`. ``None`` disables the bound. Defaults to ``None``.
+        vacuum_every: Number of writes between automatic calls to :py:func:`vacuum`. Defaults to ``1000``.
+        timeout: Seconds to wait on a database locked by another process. Defaults to ``30``.
+    """
+
+    raw = True
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Union[float, Dict[str, float]] = 3600.0,
+        max_bytes: int = None,
+        vacuum_every: int = 1000,
+        timeout: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.vacuum_every = vacuum_every
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._writes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " url TEXT PRIMARY KEY,"
+                " kind TEXT,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    ttl_for = MemoryCache.ttl_for
+
+    def get(self, key: str) -> Union[bytes, None]:
+        """Returns the raw body stored under ``key`` if it is still fresh, or ``None`` on a miss."""
+        row = self._connection().execute(
+            "SELECT kind, body, fetched_at FROM responses WHERE url = ?", (key,)
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+
+            kind, body, fetched_at = row
+            ttl = self.ttl_for(kind)
+            if ttl is not None and fetched_at + ttl <= time.time():
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return zlib.decompress(body)
+
+    def set(self, key: str, value: Union[str, bytes], kind: str = None) -> None:
+        """Stores the raw body ``value`` under ``key``, replacing any previous row."""
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        body = zlib.compress(value)
+
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, kind, body, size, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, body, len(body), time.time()),
+            )
+
+        with self._lock:
+            self._writes += 1
+            due = self.vacuum_every and self._writes % self.vacuum_every == 0
+
+        if due:
+            self.vacuum()
+
+    def vacuum(self) -> None:
+        """Removes expired rows and, if ``max_bytes`` is set, the oldest rows above the size bound."""
+        now = time.time()
+
+        with self._connection() as conn:
+            removed = 0
+            for kind, in conn.execute("SELECT DISTINCT kind FROM responses").fetchall():
+                ttl = self.ttl_for(kind)
+                if ttl is not None:
+                    removed += conn.execute(
+                        "DELETE FROM responses WHERE kind IS ? AND fetched_at <= ?",
+                        (kind, now - ttl),
+                    ).rowcount
+
+            evicted = 0
+            if self.max_bytes is not None:
+                total, = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+                if total > self.max_bytes:
+                    rows = conn.execute("SELECT url, size FROM responses ORDER BY fetched_at").fetchall()
+                    for url, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                        total -= size
+                        evicted += 1
+
+        with self._lock:
+            self.expirations += removed
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        """Removes every row from the database. Counters are kept."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Closes the database connection of the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> dict:
+        """Returns the hit, miss, eviction and expiration counters along with the current size."""
+        size, nbytes = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": size,
+                "bytes": nbytes,
+            }
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        row = self._connection().execute("SELECT 1 FROM responses WHERE url = ?", (key,)).fetchone()
+        return row is not None
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, Iterator, Tuple
+
+
+class Checkpoint:
+    """Persistent, resumable state of a crawl or batch job.
+
+    Tracks the frontier (hashtags queued along with their depth and score) and the set of completed
+    hashtags. Every change is appended to a log file as it happens, and the log is periodically
+    compacted into a snapshot, so a restarted job resumes where it stopped without re-requesting
+    any completed hashtag. Hashtags that were in-flight (or failed) when the job stopped are still
+    in the frontier, and are requested again.
+
+    .. code-block:: python
+
+        from instahashtag import api
+        from instahashtag.checkpoint import Checkpoint
+        from instahashtag.crawl import Crawler
+        from instahashtag.export import JsonLinesWriter
+
+        # Resumable crawl, streaming the results to 'crawl/results.jsonl'.
+        checkpoint = Checkpoint("crawl")
+        await Crawler(["miami"], depth=3, checkpoint=checkpoint).dump("crawl/results.jsonl")
+
+        # Resumable batch.
+        checkpoint = Checkpoint("batch")
+        with JsonLinesWriter("batch/results.jsonl") as writer:
+            async for result in api.tag_many(checkpoint.pending(hashtags)):
+                writer.write({"query": result.query, "data": result.data})
+                if result.error is None:
+                    checkpoint.done(result.query)
+
+    Args:
+        directory: Directory holding the ``snapshot.json`` and ``log.jsonl`` files. Created if missing.
+        compact_every: Number of completed hashtags between compactions. Defaults to ``1000``.
+    """
+
+    def __init__(self, directory: str, compact_every: int = 1000) -> None:
+        self.directory = directory
+        self.compact_every = compact_every
+        self.frontier = {}
+        self.completed = set()
+        self._since_compact = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, "snapshot.json")
+        self._log_path = os.path.join(directory, "log.jsonl")
+        self._load()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.completed = set(snapshot["completed"])
+            self.frontier = {tag: (depth, score) for tag, depth, score in snapshot["frontier"]}
+
+        if os.path.exists(self._log_path):
+            with open(self._log_path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+
+            for line in lines:
+                try:
+                    self._apply(json.loads(line))
+                except ValueError:
+                    continue  # Empty or partially written line of a killed process.
+
+            if lines[-1]:
+                with open(self._log_path, "a", encoding="utf-8") as f:
+                    f.write("\n")
+
+    def _apply(self, entry: dict) -> None:
+        if entry["op"] == "push":
+            self.frontier[entry["tag"]] = (entry["depth"], entry["score"])
+        elif entry["op"] == "done":
+            self.frontier.pop(entry["tag"], None)
+            self.completed.add(entry["tag"])
+
+    def _append(self, entry: dict) -> None:
+        self._apply(entry)
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+
+    def push(self, hashtag: str, depth: int = 0, score: float = 0.0) -> None:
+        """Records ``hashtag`` as queued in the frontier."""
+        with self._lock:
+            if hashtag not in self.completed:
+                self._append({"op": "push", "tag": hashtag, "depth": depth, "score": score})
+
+    def done(self, hashtag: str) -> None:
+        """Records ``hashtag`` as completed, compacting the log every ``compact_every`` calls."""
+        with self._lock:
+            self._append({"op": "done", "tag": hashtag})
+            self._since_compact += 1
+            if self._since_compact >= self.compact_every:
+                self._compact()
+
+    def is_done(self, hashtag: str) -> bool:
+        """Returns whether ``hashtag`` was completed."""
+        return hashtag in self.completed
+
+    def pending(self, hashtags: Iterable[str]) -> Iterator[str]:
+        """Yields the items of ``hashtags`` that were not completed yet."""
+        for hashtag in hashtags:
+            if hashtag not in self.completed:
+                yield hashtag
+
+    def queued(self) -> Dict[str, Tuple[int, float]]:
+        """Returns a copy of the frontier, as ``{hashtag: (depth, score)}``."""
+        with self._lock:
+            return dict(self.frontier)
+
+    def compact(self) -> None:
+        """Writes the whole state to the snapshot and truncates the log."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        snapshot = {
+            "completed": sorted(self.completed),
+            "frontier": [[tag, depth, score] for tag, (depth, score) in self.frontier.items()],
+        }
+        tmp = self._snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._snapshot_path)
+
+        self._log.close()
+        self._log = open(self._log_path, "w", encoding="utf-8")
+        self._since_compact = 0
+
+    def close(self) -> None:
+        """Compacts the state and closes the log."""
+        with self._lock:
+            self._compact()
+            self._log.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import sys
+import time
+from typing import IO, Any, Iterable, Iterator, List, Tuple
+
+from . import api, utils
+from .cache import DiskCache, MemoryCache
+from .crawl import Crawler
+from .http import Client
+from .limiter import TokenBucket
+from .retry import Retry
+
+
+class Progress:
+    """Counts completed queries, printing the throughput to ``stream`` at most every ``interval`` seconds.
+
+    Args:
+        stream: Output stream of the progress lines, usually ``sys.stderr``. ``None`` disables them.
+        interval: Minimum number of seconds between two progress lines. Defaults to ``1``.
+    """
+
+    def __init__(self, stream: IO = None, interval: float = 1.0) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.done = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._printed = self.started
+
+    def update(self, error: Exception = None) -> bool:
+        """Counts a completed query. Returns ``True`` when a progress line was printed."""
+        self.done += 1
+        if error is not None:
+            self.errors += 1
+
+        now = time.monotonic()
+        if self.stream is None or now - self._printed < self.interval:
+            return False
+
+        self._printed = now
+        self.stream.write(self.line() + "\n")
+        self.stream.flush()
+        return True
+
+    def line(self) -> str:
+        """Returns the progress line: completed queries, errors and throughput."""
+        elapsed = time.monotonic() - self.started
+        return "{} done, {} errors in {:.1f}s ({:.1f}/s)".format(
+            self.done,
+            self.errors,
+            elapsed,
+            self.done / elapsed if elapsed > 0 else 0.0,
+        )
+
+
+def read_queries(stream: IO) -> Iterator[str]:
+    """Yields the non-empty, non-comment (``#``) lines of ``stream``, stripped."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def parse_bbox(line: str) -> Tuple[float, ...]:
+    """Parses a ``x1,y1,x2,y2[,zoom]`` (comma or whitespace separated) bounding box.
+
+    Raises:
+        ValueError: The line does not hold four or five numbers.
+    """
+    values = line.replace(",", " ").split()
+    if len(values) not in (4, 5):
+        raise ValueError("expected 'x1,y1,x2,y2[,zoom]', got {!r}".format(line))
+    bbox = tuple(float(v) for v in values[:4])
+    return bbox + (int(values[4]),) if len(values) == 5 else bbox
+
+
+def parser() -> argparse.ArgumentParser:
+    """Returns the argument parser of the ``instahashtag`` command."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "queries",
+        nargs="*",
+        help="hashtags, or 'x1,y1,x2,y2[,zoom]' bounding boxes for maps; read from --input if omitted",
+    )
+    common.add_argument("-i", "--input", default="-", help="file with one query per line, '-' for stdin (default)")
+    common.add_argument("-c", "--concurrency", type=int, default=10, help="in-flight requests (default: 10)")
+    common.add_argument("--rate", type=float, help="maximum requests per second")
+    common.add_argument("--cache", help="SQLite response cache file, shared across runs")
+    common.add_argument("--ttl", type=float, default=86400.0, help="cache time-to-live in seconds (default: 86400)")
+    common.add_argument("--retries", type=int, default=3, help="attempts per request (default: 3)")
+    common.add_argument("--timeout", type=float, default=30.0, help="request timeout in seconds (default: 30)")
+    common.add_argument("--base-url", help="API host to query instead of the default, e.g. a mock server")
+    common.add_argument("-q", "--quiet", action="store_true", help="do not print progress to stderr")
+
+    root = argparse.ArgumentParser(
+        prog="instahashtag",
+        description="Queries DisplayPurposes.com in bulk, writing JSON Lines to stdout as results complete.",
+    )
+    commands = root.add_subparsers(dest="command", metavar="{tag,graph,maps,crawl}")
+    commands.required = True
+    commands.add_parser("tag", parents=[common], help="related hashtags of every hashtag")
+    commands.add_parser("graph", parents=[common], help="hashtag graph of every hashtag")
+    commands.add_parser("maps", parents=[common], help="hashtags inside every bounding box")
+
+    crawl = commands.add_parser("crawl", parents=[common], help="crawl the hashtag graph from seed hashtags")
+    crawl.add_argument("--depth", type=int, default=2, help="maximum hops from the seeds (default: 2)")
+    crawl.add_argument("--max-tags", type=int, default=1000, help="maximum crawled hashtags (default: 1000)")
+    crawl.add_argument("--related", action="store_true", help="also query the tag endpoint of every hashtag")
+    return root
+
+
+def client(args: argparse.Namespace) -> Client:
+    """Builds the asynchronous :py:class:`~instahashtag.http.Client` described by the command-line options."""
+    return Client(
+        aio=True,
+        limit_per_host=max(args.concurrency, 1),
+        cache=DiskCache(args.cache, ttl=args.ttl) if args.cache else MemoryCache(ttl=args.ttl),
+        limiter=TokenBucket(args.rate) if args.rate else None,
+        timeout=args.timeout,
+        retry=Retry(attempts=args.retries) if args.retries > 1 else None,
+        base_url=args.base_url,
+    )
+
+
+async def run(args: argparse.Namespace, queries: Iterable[str], out: IO, progress: Progress) -> None:
+    """Runs a parsed command over ``queries``, writing a JSON line per result to ``out``."""
+    async with client(args) as session:
+        if args.command == "crawl":
+            crawler = Crawler(
+                list(queries),
+                depth=args.depth,
+                max_tags=args.max_tags,
+                concurrency=args.concurrency,
+                client=session,
+                results=args.related,
+            )
+            async for result in crawler:
+                _write(out, Crawler.record(result))
+                progress.update(result.error)
+            return
+
+        if args.command == "maps":
+            queries = _bboxes(queries, out, progress)
+        fetch = {"tag": api.tag_many, "graph": api.graph_many, "maps": api.maps_many}[args.command]
+
+        async for result in fetch(queries, concurrency=args.concurrency, client=session):
+            record = {
+                "query": result.query,
+                "data": result.data,
+                "error": repr(result.error) if result.error is not None else None,
+            }
+            _write(out, record)
+            progress.update(result.error)
+
+
+def _bboxes(queries: Iterable[str], out: IO, progress: Progress) -> Iterator[Tuple[float, ...]]:
+    for query in queries:
+        try:
+            yield parse_bbox(query)
+        except ValueError as error:
+            _write(out, {"query": query, "data": None, "error": repr(error)})
+            progress.update(error)
+
+
+def _write(out: IO, record: Any) -> None:
+    # Flushed line by line, so results reach a pipe as soon as they complete.
+    out.write(json.dumps(record, default=str) + "\n")
+    out.flush()
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point of the ``instahashtag`` command. Returns ``1`` if any query failed, otherwise ``0``.
+
+    .. code-block:: bash
+
+        $ instahashtag tag miami travel > tags.jsonl
+        $ cat hashtags.txt | instahashtag graph --concurrency 50 --rate 20 --cache cache.db > graphs.jsonl
+        $ instahashtag maps -- "-80.48,25.75,-79.82,25.85,12"
+        $ instahashtag crawl miami --depth 2 --max-tags 500 > crawl.jsonl
+
+    """
+    args = parser().parse_args(argv)
+    progress = Progress(None if args.quiet else sys.stderr)
+
+    stream = None
+    if args.queries:
+        queries = iter(args.queries)
+    elif args.input == "-":
+        queries = read_queries(sys.stdin)
+    else:
+        stream = open(args.input, encoding="utf-8")
+        queries = read_queries(stream)
+
+    try:
+        utils.run(run(args, queries, sys.stdout, progress))
+    except KeyboardInterrupt:  # pragma: no cover
+        sys.stderr.write("interrupted\n")
+        return 130
+    finally:
+        sys.stdout.flush()
+        if stream is not None:
+            stream.close()
+
+    if not args.quiet:
+        sys.stderr.write(progress.line() + "\n")
+    return 1 if progress.errors else 0
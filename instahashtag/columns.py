@@ -0,0 +1,85 @@
+import array
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+NAN = float("nan")
+
+#: Columns of ``Tag.results``: ``(name, getter, typecode)``. A ``None`` typecode keeps a plain list.
+TAG_RESULTS = (
+    ("tag", lambda r: r["tag"], None),
+    ("rank", lambda r: r["rank"], "q"),
+    ("media_count", lambda r: r["media_count"], "q"),
+    ("relevance", lambda r: r["relevance"], "d"),
+    ("absRelevance", lambda r: r["absRelevance"], "d"),
+    ("geo_lat", lambda r: r["geo"][0] if r.get("geo") else NAN, "d"),
+    ("geo_lon", lambda r: r["geo"][1] if r.get("geo") else NAN, "d"),
+)
+
+#: Columns of ``Graph.nodes``.
+GRAPH_NODES = (
+    ("id", lambda n: n["id"], None),
+    ("relevance", lambda n: n["relevance"], "d"),
+    ("weight", lambda n: n["weight"], "d"),
+    ("x", lambda n: n["x"], "d"),
+    ("y", lambda n: n["y"], "d"),
+)
+
+#: Columns of ``Graph.edges``, with ``a`` and ``b`` as hashtag names (see :py:func:`edge_columns` for indices).
+GRAPH_EDGES = (
+    ("id", lambda e: e["id"], None),
+    ("a", lambda e: e["a"], None),
+    ("b", lambda e: e["b"], None),
+    ("weight", lambda e: e["weight"], "d"),
+)
+
+#: Columns of ``Maps.tags``.
+MAPS_TAGS = (
+    ("tag", lambda t: t["tag"], None),
+    ("weight", lambda t: t["weight"], "q"),
+    ("centroid_lat", lambda t: t["centroid"][0] if t.get("centroid") else NAN, "d"),
+    ("centroid_lon", lambda t: t["centroid"][1] if t.get("centroid") else NAN, "d"),
+)
+
+
+def column(values: Any, typecode: str, count: int) -> Any:
+    """Builds a typed column out of an iterable of ``count`` values.
+
+    Returns a NumPy array if NumPy is installed, otherwise an ``array.array``. Typecodes follow the
+    ``array`` module (``"d"`` for floats, ``"q"`` for 64-bit integers), which NumPy understands too.
+    """
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=typecode, count=count)
+    return array.array(typecode, values)
+
+
+def columns(rows: Sequence[dict], spec: Sequence[Tuple[str, Callable, str]]) -> Dict[str, Any]:
+    """Builds a dictionary of columns out of the raw JSON ``rows``, following ``spec``.
+
+    No per-row objects are created: every column is filled straight from the parsed JSON.
+    """
+    rows = rows or []
+    result = {}
+    for name, getter, typecode in spec:
+        values = (getter(row) for row in rows)
+        result[name] = list(values) if typecode is None else column(values, typecode, len(rows))
+    return result
+
+
+def edge_columns(nodes: Sequence[dict], edges: Sequence[dict]) -> Dict[str, Any]:
+    """Builds the columns of ``Graph.edges``, with ``a``/``b`` as indices into ``Graph.nodes``.
+
+    Edges referencing a hashtag missing from ``nodes`` get the index ``-1``.
+    """
+    nodes, edges = nodes or [], edges or []
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    count = len(edges)
+    return {
+        "id": [edge["id"] for edge in edges],
+        "a": column((index.get(edge["a"], -1) for edge in edges), "q", count),
+        "b": column((index.get(edge["b"], -1) for edge in edges), "q", count),
+        "weight": column((edge["weight"] for edge in edges), "d", count),
+    }
@@ -0,0 +1,240 @@
+import asyncio
+import heapq
+import itertools
+from collections import namedtuple
+from typing import AsyncIterator, Dict, Iterable, Union
+
+from . import api
+from .checkpoint import Checkpoint
+from .export import JsonLinesWriter
+from .http import Client
+from .wrapper import Graph, Tag
+
+CrawlResult = namedtuple("CrawlResult", ["hashtag", "depth", "graph", "tag", "error"])
+CrawlResult.__doc__ = """Result of a single crawled hashtag.
+
+Attributes:
+    hashtag: Crawled hashtag.
+    depth: Distance (in hops) from the closest seed, the seeds being at depth ``0``.
+    graph: :py:class:`~instahashtag.wrapper.Graph` of the hashtag, or ``None`` if the request failed.
+    tag: :py:class:`~instahashtag.wrapper.Tag` of the hashtag if the crawl expands through
+        ``Tag.results``, otherwise ``None``.
+    error: Exception raised while querying the hashtag, or ``None`` if the requests succeeded.
+"""
+
+
+class Crawler:
+    """Breadth-first crawler of the related-hashtag network.
+
+    Starting from the seed hashtags, every crawled hashtag is expanded into its neighbours in
+    ``Graph.nodes`` (and, optionally, the related hashtags in ``Tag.results``), up to ``depth`` hops
+    away and ``max_tags`` hashtags in total. Each hashtag is requested once, frontiers are fetched
+    concurrently over a single shared client, and hashtags of the same depth are fetched by
+    descending priority. Results are streamed as they complete.
+
+    .. code-block:: python
+
+        from instahashtag.crawl import Crawler
+
+        async def main():
+            crawler = Crawler(["miami"], depth=2, max_tags=500, concurrency=20)
+            async for result in crawler:
+                if result.error is None:
+                    print(result.hashtag, result.depth, len(result.graph.nodes))
+
+    Args:
+        seeds: Hashtags to start from.
+        depth: Maximum number of hops from the seeds. Defaults to ``2``.
+        max_tags: Maximum number of hashtags crawled. Defaults to ``1000``.
+        concurrency: Maximum number of in-flight hashtags. Defaults to ``10``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+            If not given, one is opened for the duration of the crawl.
+        results: If set to ``True``, also queries ``Tag`` for every hashtag and expands through its
+            ``results``. Defaults to ``False``.
+        priority: Score that orders the frontier: ``"weight"`` uses the weight of the edge leading
+            to the neighbour (or the node weight if there is none), ``"relevance"`` the node relevance.
+            Related hashtags found in ``Tag.results`` are scored by ``relevance / 100``. Defaults to ``"weight"``.
+        checkpoint: Optional :py:class:`~instahashtag.checkpoint.Checkpoint` persisting the frontier
+            and the completed hashtags, so a restarted crawl resumes where it stopped. A hashtag is
+            only recorded as completed once its result was consumed.
+
+    Attributes:
+        visited: Hashtags crawled (or being crawled) so far.
+    """
+
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        depth: int = 2,
+        max_tags: int = 1000,
+        concurrency: int = 10,
+        client: Client = None,
+        results: bool = False,
+        priority: str = "weight",
+        checkpoint: Checkpoint = None,
+    ) -> None:
+        if priority not in ("weight", "relevance"):
+            raise ValueError("priority must be 'weight' or 'relevance', got {!r}".format(priority))
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1, got {}".format(concurrency))
+
+        self.seeds = list(seeds)
+        self.depth = depth
+        self.max_tags = max_tags
+        self.concurrency = concurrency
+        self.client = client
+        self.results = results
+        self.priority = priority
+        self.checkpoint = checkpoint
+        self.visited = set()
+        self._frontier = []
+        self._counter = itertools.count()
+        self._queued = {}
+
+    def push(self, hashtag: str, depth: int, score: float = 0.0) -> None:
+        """Adds ``hashtag`` to the frontier, unless it was already visited or is too deep."""
+        if self._enqueue(hashtag, depth, score) and self.checkpoint is not None:
+            self.checkpoint.push(hashtag, depth, score)
+
+    def _enqueue(self, hashtag: str, depth: int, score: float) -> bool:
+        if depth > self.depth or hashtag in self.visited:
+            return False
+
+        queued = self._queued.get(hashtag)
+        if queued is not None and queued <= (depth, -score):
+            return False
+
+        self._queued[hashtag] = (depth, -score)
+        heapq.heappush(self._frontier, (depth, -score, next(self._counter), hashtag))
+        return True
+
+    def pop(self) -> Union[tuple, None]:
+        """Returns the next ``(hashtag, depth)`` of the frontier, or ``None`` if it is empty."""
+        while self._frontier:
+            depth, score, _, hashtag = heapq.heappop(self._frontier)
+            if hashtag in self.visited or self._queued.get(hashtag) != (depth, score):
+                continue
+            del self._queued[hashtag]
+            self.visited.add(hashtag)
+            return hashtag, depth
+        return None
+
+    def neighbours(self, result: CrawlResult) -> Dict[str, float]:
+        """Returns the neighbours of a crawled hashtag along with their priority score."""
+        scores = {}
+
+        if result.graph is not None and result.graph.data is not None:
+            data = result.graph.data
+            for node in data.get("nodes") or []:
+                score = node.get(self.priority if self.priority == "relevance" else "weight")
+                scores[node["id"]] = score or 0.0
+
+            if self.priority == "weight":
+                edges = {}
+                for edge in data.get("edges") or []:
+                    if edge["a"] == result.hashtag:
+                        edges[edge["b"]] = max(edges.get(edge["b"], 0.0), edge["weight"])
+                    elif edge["b"] == result.hashtag:
+                        edges[edge["a"]] = max(edges.get(edge["a"], 0.0), edge["weight"])
+                scores.update(edges)
+
+        if result.tag is not None and result.tag.data is not None:
+            for related in result.tag.data.get("results") or []:
+                score = (related.get("relevance") or 0) / 100
+                scores[related["tag"]] = max(scores.get(related["tag"], 0.0), score)
+
+        scores.pop(result.hashtag, None)
+        return scores
+
+    async def fetch(self, hashtag: str, depth: int, client: Client) -> CrawlResult:
+        """Queries a single hashtag, collecting any error into the result."""
+        try:
+            graph = Graph(hashtag, aio=True, client=client)
+            graph.data = await api.graph(hashtag, client=client)
+            graph.process()
+
+            tag = None
+            if self.results:
+                tag = Tag(hashtag, aio=True, client=client)
+                tag.data = await api.tag(hashtag, client=client)
+                tag.process()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            return CrawlResult(hashtag, depth, None, None, error)
+        return CrawlResult(hashtag, depth, graph, tag, None)
+
+    async def crawl(self) -> AsyncIterator[CrawlResult]:
+        """Runs the crawl, yielding a :py:class:`CrawlResult` per hashtag as it completes."""
+        if self.checkpoint is not None:
+            self.visited.update(self.checkpoint.completed)
+            for hashtag, (depth, score) in self.checkpoint.queued().items():
+                self._enqueue(hashtag, depth, score)
+
+        for seed in self.seeds:
+            self.push(seed, 0, float("inf"))
+
+        client = self.client
+        owned = client is None
+        if owned:
+            client = Client(aio=True)
+        elif not client.aio:
+            raise ValueError("crawling requires an asynchronous client (aio=True)")
+
+        pending = set()
+        try:
+            while True:
+                while len(pending) < self.concurrency and len(self.visited) < self.max_tags:
+                    item = self.pop()
+                    if item is None:
+                        break
+                    pending.add(asyncio.ensure_future(self.fetch(*item, client)))
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result.error is None and result.depth < self.depth:
+                        for hashtag, score in self.neighbours(result).items():
+                            self.push(hashtag, result.depth + 1, score)
+                    yield result
+
+                    if result.error is None and self.checkpoint is not None:
+                        self.checkpoint.done(result.hashtag)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if owned:
+                await client.aclose()
+
+    @staticmethod
+    def record(result: CrawlResult) -> dict:
+        """Converts a :py:class:`CrawlResult` into a JSON serializable dictionary of the raw API data."""
+        return {
+            "hashtag": result.hashtag,
+            "depth": result.depth,
+            "graph": result.graph.data if result.graph is not None else None,
+            "tag": result.tag.data if result.tag is not None else None,
+            "error": repr(result.error) if result.error is not None else None,
+        }
+
+    async def dump(self, path: str) -> int:
+        """Runs the crawl, streaming every result to the JSON Lines file ``path`` (see :py:func:`record`).
+
+        The file is appended to, so a resumed crawl continues the output of the previous run.
+        Returns the number of results written.
+        """
+        with JsonLinesWriter(path) as writer:
+            async for result in self.crawl():
+                writer.write(self.record(result))
+
+        if self.checkpoint is not None:
+            self.checkpoint.compact()
+        return writer.count
+
+    def __aiter__(self) -> AsyncIterator[CrawlResult]:
+        return self.crawl()
@@ -0,0 +1,47 @@
+import json
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+#: Available decoders, by name. Every decoder accepts both ``bytes`` and ``str``.
+DECODERS = {"json": json.loads}
+if ujson is not None:  # pragma: no cover
+    DECODERS["ujson"] = ujson.loads
+if orjson is not None:  # pragma: no cover
+    DECODERS["orjson"] = orjson.loads
+
+#: Name of the fastest installed decoder, used by default.
+DEFAULT = next(name for name in ("orjson", "ujson", "json") if name in DECODERS)
+
+
+def get(decoder: Union[str, Callable[[Union[str, bytes]], Any], None] = None) -> Callable:
+    """Returns a JSON decoding function.
+
+    Args:
+        decoder: Either the name of an installed decoder (``"orjson"``, ``"ujson"`` or ``"json"``),
+            a decoding function, or ``None`` for the fastest installed decoder (see :py:data:`DEFAULT`).
+
+    Raises:
+        ValueError: If the named decoder is not installed.
+    """
+    if decoder is None:
+        return DECODERS[DEFAULT]
+    if callable(decoder):
+        return decoder
+    try:
+        return DECODERS[decoder]
+    except KeyError:
+        raise ValueError("decoder {!r} is not installed, choose from {}".format(decoder, sorted(DECODERS)))
+
+
+def loads(body: Union[str, bytes]) -> Any:
+    """Decodes ``body`` with the fastest installed decoder."""
+    return DECODERS[DEFAULT](body)
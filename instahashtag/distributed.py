@@ -0,0 +1,534 @@
+import asyncio
+import bisect
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from . import utils
+from .crawl import Crawler
+from .export import JsonLinesWriter
+from .http import Client
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class ConsistentHash:
+    """Consistent hash ring assigning hashtags to ``shards``.
+
+    Every shard owns ``replicas`` points of the ring, and a hashtag belongs to the shard of the first
+    point following its hash. Growing the ring from ``n`` to ``n + 1`` shards only moves about
+    ``1 / (n + 1)`` of the hashtags, so a job can be resharded (see :py:func:`WorkQueue.reshard`) when
+    workers join without reshuffling the whole queue.
+
+    .. code-block:: python
+
+        ring = ConsistentHash(4)
+        ring.shard("miami") # >>> 2
+
+    """
+
+    def __init__(self, shards: int, replicas: int = 64) -> None:
+        if shards < 1:
+            raise ValueError("shards must be at least 1, got {}".format(shards))
+
+        self.shards = shards
+        self.replicas = replicas
+        points = sorted((_hash("{}:{}".format(shard, r)), shard) for shard in range(shards) for r in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    def shard(self, hashtag: str) -> int:
+        """Returns the shard owning ``hashtag``."""
+        i = bisect.bisect(self._hashes, _hash(hashtag))
+        return self._shards[i % len(self._shards)]
+
+
+class WorkQueue:
+    """Lease-based crawl queue shared by many processes of one host through a SQLite file.
+
+    Every hashtag of the crawl is a row, which doubles as the global visited set. Workers lease
+    pending hashtags for ``lease`` seconds, preferably from their own shard, and either complete them
+    (storing the result and queueing its neighbours in the same transaction) or fail them (putting
+    them back in the queue, up to ``attempts`` times). A lease that expires, because its worker died
+    or stalled, makes the hashtag available again, so nothing is lost when a worker goes away.
+
+    The results and failures of every worker end up in the same file, from which they are read
+    centrally (see :py:func:`results` and :py:func:`failures`).
+
+    The database runs in WAL mode, which relies on memory shared between the processes using it:
+    the file must be on a local disk of the host running every worker. Network filesystems (NFS,
+    SMB) do not support it, and their unreliable file locking may corrupt or deadlock the queue.
+
+    .. code-block:: python
+
+        from instahashtag.distributed import WorkQueue
+
+        queue = WorkQueue("crawl.db")
+        queue.setup(["miami", "travel"], depth=2, max_tags=10000, shards=8)
+
+        queue.counts() # >>> {"pending": 2}
+
+    Args:
+        path: Path of the SQLite database, on a local disk.
+        lease: Seconds a leased hashtag stays owned by its worker before it may be leased again. Defaults to ``120``.
+        timeout: Seconds to wait on a database locked by another process. Defaults to ``30``.
+    """
+
+    def __init__(self, path: str, lease: float = 120.0, timeout: float = 30.0) -> None:
+        self.path = path
+        self.lease_time = lease
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " hashtag TEXT PRIMARY KEY,"
+                " depth INTEGER NOT NULL,"
+                " score REAL NOT NULL,"
+                " shard INTEGER NOT NULL,"
+                " state TEXT NOT NULL DEFAULT 'pending',"
+                " owner TEXT,"
+                " lease_until REAL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " error TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " hashtag TEXT PRIMARY KEY,"
+                " depth INTEGER NOT NULL,"
+                " record TEXT NOT NULL,"
+                " worker TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_queue ON tasks (state, shard, depth, score)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Parameters of the job, as given to :py:func:`setup`."""
+        rows = self._connection().execute("SELECT key, value FROM meta")
+        return {key: json.loads(value) for key, value in rows}
+
+    def setup(
+        self,
+        seeds: Iterable[str],
+        depth: int = 2,
+        max_tags: int = 1000,
+        shards: int = 1,
+        results: bool = False,
+        priority: str = "weight",
+        attempts: int = 3,
+    ) -> None:
+        """Records the job parameters (see :py:class:`~instahashtag.crawl.Crawler`) and queues the ``seeds``.
+
+        Calling it again on an existing job keeps the original parameters, and only queues new seeds.
+
+        Args:
+            attempts: Number of times a failing hashtag is tried before being recorded as failed.
+                Defaults to ``3``.
+        """
+        meta = {
+            "depth": depth,
+            "max_tags": max_tags,
+            "shards": shards,
+            "results": results,
+            "priority": priority,
+            "attempts": attempts,
+        }
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value)) for key, value in meta.items()),
+            )
+        self.push(((seed, 0, float("inf")) for seed in seeds))
+
+    def _ring(self) -> ConsistentHash:
+        shards = self.meta.get("shards", 1)
+        ring = getattr(self._local, "ring", None)
+        if ring is None or ring.shards != shards:
+            ring = self._local.ring = ConsistentHash(shards)
+        return ring
+
+    def push(self, tasks: Iterable[Tuple[str, int, float]]) -> int:
+        """Queues ``(hashtag, depth, score)`` tasks, skipping known hashtags and stopping at ``max_tags``.
+
+        Returns the number of queued hashtags.
+        """
+        with self._transaction() as conn:
+            return self._push(conn, tasks)
+
+    def _push(self, conn: sqlite3.Connection, tasks: Iterable[Tuple[str, int, float]]) -> int:
+        meta = self.meta
+        ring = self._ring()
+        room = meta.get("max_tags", float("inf")) - conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+        queued = 0
+        for hashtag, depth, score in tasks:
+            if queued >= room:
+                break
+            if depth > meta.get("depth", depth):
+                continue
+            queued += conn.execute(
+                "INSERT OR IGNORE INTO tasks (hashtag, depth, score, shard) VALUES (?, ?, ?, ?)",
+                (hashtag, depth, score, ring.shard(hashtag)),
+            ).rowcount
+        return queued
+
+    def lease(self, owner: str, shard: int = None, limit: int = 1) -> List[Tuple[str, int]]:
+        """Leases up to ``limit`` hashtags to ``owner``, shallowest and highest scored first.
+
+        Hashtags of ``shard`` are preferred; when it is drained, hashtags of any shard are taken
+        (work stealing). Expired leases count as pending.
+
+        Returns:
+            List of ``(hashtag, depth)`` tuples.
+        """
+        now = time.time()
+        available = "(state = 'pending' OR (state = 'leased' AND lease_until < ?))"
+        with self._transaction() as conn:
+            rows = []
+            if shard is not None:
+                rows = conn.execute(
+                    "SELECT hashtag, depth FROM tasks WHERE " + available + " AND shard = ?"
+                    " ORDER BY depth, score DESC LIMIT ?",
+                    (now, shard, limit),
+                ).fetchall()
+            if len(rows) < limit:
+                taken = {hashtag for hashtag, _ in rows}
+                rows += [
+                    row
+                    for row in conn.execute(
+                        "SELECT hashtag, depth FROM tasks WHERE " + available + " ORDER BY depth, score DESC LIMIT ?",
+                        (now, limit),
+                    )
+                    if row[0] not in taken
+                ][: limit - len(rows)]
+
+            conn.executemany(
+                "UPDATE tasks SET state = 'leased', owner = ?, lease_until = ? WHERE hashtag = ?",
+                ((owner, now + self.lease_time, hashtag) for hashtag, _ in rows),
+            )
+        return rows
+
+    def renew(self, owner: str) -> int:
+        """Extends every lease held by ``owner``. Returns the number of renewed leases."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE state = 'leased' AND owner = ?",
+                (time.time() + self.lease_time, owner),
+            ).rowcount
+
+    def complete(
+        self,
+        hashtag: str,
+        depth: int,
+        record: Dict[str, Any],
+        owner: str,
+        neighbours: Dict[str, float] = None,
+    ) -> bool:
+        """Stores the result of ``hashtag`` and queues its ``neighbours`` (hashtag to score) one level deeper.
+
+        Returns ``False``, storing nothing, if ``owner`` no longer holds the lease of ``hashtag``
+        (it expired and was taken over by another worker).
+        """
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET state = 'done', lease_until = NULL, error = NULL"
+                " WHERE hashtag = ? AND state = 'leased' AND owner = ?",
+                (hashtag, owner),
+            ).rowcount
+            if not updated:
+                return False
+
+            conn.execute(
+                "INSERT OR REPLACE INTO results (hashtag, depth, record, worker) VALUES (?, ?, ?, ?)",
+                (hashtag, depth, json.dumps(record, default=str), owner),
+            )
+            if neighbours:
+                ranked = sorted(neighbours.items(), key=lambda item: item[1], reverse=True)
+                self._push(conn, ((tag, depth + 1, score) for tag, score in ranked))
+        return True
+
+    def fail(self, hashtag: str, error: Exception, owner: str) -> bool:
+        """Records a failed attempt, re-queueing ``hashtag`` unless it ran out of attempts.
+
+        Nothing is recorded if ``owner`` no longer holds the lease of ``hashtag``.
+
+        Returns ``True`` if the hashtag was given up on.
+        """
+        attempts = self.meta.get("attempts", 3)
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET attempts = attempts + 1, error = ?, lease_until = NULL,"
+                " state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE hashtag = ? AND state = 'leased' AND owner = ?",
+                (repr(error), attempts, hashtag, owner),
+            ).rowcount
+            if not updated:
+                return False
+            state = conn.execute("SELECT state FROM tasks WHERE hashtag = ?", (hashtag,)).fetchone()
+        return state is not None and state[0] == "failed"
+
+    def reshard(self, shards: int) -> None:
+        """Changes the number of shards, reassigning the unfinished hashtags whose shard moved."""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('shards', ?)", (json.dumps(shards),))
+            ring = ConsistentHash(shards)
+            rows = conn.execute("SELECT hashtag, shard FROM tasks WHERE state IN ('pending', 'leased')").fetchall()
+            conn.executemany(
+                "UPDATE tasks SET shard = ? WHERE hashtag = ?",
+                ((ring.shard(hashtag), hashtag) for hashtag, shard in rows if ring.shard(hashtag) != shard),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of hashtags per state (``pending``, ``leased``, ``done`` and ``failed``)."""
+        return dict(self._connection().execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+
+    def finished(self) -> bool:
+        """Whether no hashtag is left pending or leased."""
+        row = self._connection().execute(
+            "SELECT 1 FROM tasks WHERE state IN ('pending', 'leased') LIMIT 1"
+        ).fetchone()
+        return row is None
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Iterates over the stored results (see :py:func:`~instahashtag.crawl.Crawler.record`), shallowest first."""
+        rows = self._connection().execute("SELECT record FROM results ORDER BY depth, hashtag")
+        return (json.loads(row[0]) for row in rows)
+
+    def failures(self) -> Dict[str, str]:
+        """Returns the hashtags given up on, along with their last error."""
+        return dict(
+            self._connection().execute("SELECT hashtag, error FROM tasks WHERE state = 'failed' ORDER BY hashtag")
+        )
+
+    def close(self) -> None:
+        """Closes the database connection of the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+async def work(
+    path: str,
+    shard: int = None,
+    concurrency: int = 10,
+    lease: float = 120.0,
+    poll: float = 0.5,
+    client: Client = None,
+    owner: str = None,
+) -> int:
+    """Runs a crawl worker until the job of the :py:class:`WorkQueue` at ``path`` is finished.
+
+    Up to ``concurrency`` hashtags are fetched at once through an asynchronous client, and the
+    leases of in-flight hashtags are renewed as long as the worker runs. Any process of the host
+    holding ``path`` may join a job this way.
+
+    The blocking SQLite calls run on a dedicated thread, off the event loop, so waiting on a
+    database locked by another worker does not stall the in-flight requests.
+
+    .. code-block:: python
+
+        from instahashtag import utils
+        from instahashtag.distributed import work
+
+        utils.run(work("crawl.db", shard=3, concurrency=20))
+
+    Args:
+        path: Path of the job's SQLite database.
+        shard: Preferred shard of the worker. Defaults to ``None`` (no preference).
+        concurrency: Maximum number of in-flight hashtags. Defaults to ``10``.
+        lease: See :py:class:`WorkQueue`. Defaults to ``120``.
+        poll: Seconds to wait for new work while other workers hold the remaining leases. Defaults to ``0.5``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client`. If not given, one is
+            opened for the duration of the work.
+        owner: Name of the worker in the leases. Defaults to ``host:pid:random``.
+
+    Returns:
+        Number of hashtags processed by this worker.
+    """
+    # SQLite calls block (up to the busy timeout while another worker holds the lock), so they run
+    # on a thread of their own, which also owns the queue's connection.
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    def db(function, *args, **kwargs):
+        return loop.run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+    queue = None
+    owned = False
+    processed = 0
+    pending = set()
+    try:
+        queue = await db(WorkQueue, path, lease=lease)
+        meta = await db(lambda: queue.meta)
+        if not meta:
+            raise ValueError("no crawl job was set up in {!r}, see WorkQueue.setup".format(path))
+        crawler = Crawler([], depth=meta["depth"], results=meta["results"], priority=meta["priority"])
+        owner = owner or "{}:{}:{}".format(socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8])
+
+        owned = client is None
+        if owned:
+            client = Client(aio=True, limit_per_host=concurrency)
+
+        renewed = time.monotonic()
+        while True:
+            if len(pending) < concurrency:
+                for hashtag, depth in await db(queue.lease, owner, shard=shard, limit=concurrency - len(pending)):
+                    pending.add(asyncio.ensure_future(crawler.fetch(hashtag, depth, client)))
+
+            if not pending:
+                if await db(queue.finished):
+                    return processed
+                await asyncio.sleep(poll)
+                continue
+
+            done, pending = await asyncio.wait(pending, timeout=lease / 3, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                processed += 1
+                if result.error is None:
+                    neighbours = crawler.neighbours(result)
+                    record = Crawler.record(result)
+                    await db(queue.complete, result.hashtag, result.depth, record, owner, neighbours)
+                else:
+                    await db(queue.fail, result.hashtag, result.error, owner)
+
+            if time.monotonic() - renewed > lease / 3:
+                await db(queue.renew, owner)
+                renewed = time.monotonic()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if owned:
+            await client.aclose()
+        if queue is not None:
+            await db(queue.close)
+        executor.shutdown(wait=False)
+
+
+def _process(path: str, shard: int, concurrency: int, lease: float, options: Dict[str, Any]) -> None:
+    options = dict(options)
+    options.setdefault("limit_per_host", concurrency)
+
+    async def main():
+        async with Client(aio=True, **options) as client:
+            await work(path, shard=shard, concurrency=concurrency, lease=lease, client=client)
+
+    utils.run(main())
+
+
+def run(
+    path: str,
+    seeds: Iterable[str] = (),
+    processes: int = None,
+    depth: int = 2,
+    max_tags: int = 1000,
+    results: bool = False,
+    priority: str = "weight",
+    attempts: int = 3,
+    concurrency: int = 10,
+    lease: float = 120.0,
+    output: str = None,
+    **options,
+) -> Dict[str, int]:
+    """Runs a sharded crawl over a pool of worker processes, each with its own asynchronous client.
+
+    The job is set up in the :py:class:`WorkQueue` at ``path`` (with one shard per process), and
+    the processes run :py:func:`work` until it is finished. Running ``run`` (or :py:func:`work`) with
+    the same ``path`` from other processes of the host makes them join the job; a finished or
+    interrupted job is resumed by running it again.
+
+    .. code-block:: python
+
+        from instahashtag.distributed import run
+
+        if __name__ == "__main__":
+            counts = run("crawl.db", ["miami"], processes=8, depth=3, max_tags=100000, output="crawl.jsonl")
+            counts # >>> {"done": 99874, "failed": 126}
+
+    Args:
+        path: Path of the job's SQLite database.
+        seeds: Hashtags to start from.
+        processes: Number of worker processes. Defaults to the number of CPUs.
+        depth, max_tags, results, priority, attempts: Job parameters, see :py:func:`WorkQueue.setup`.
+        concurrency: Maximum number of in-flight hashtags per process. Defaults to ``10``.
+        lease: See :py:class:`WorkQueue`. Defaults to ``120``.
+        output: Optional JSON Lines file where every merged result is written once the job is finished.
+        **options: Picklable keyword arguments of every worker's :py:class:`~instahashtag.http.Client`
+            (e.g. ``base_url``, ``timeout``).
+            ``limit_per_host`` defaults to ``concurrency``.
+
+    Returns:
+        Number of hashtags per state, see :py:func:`WorkQueue.counts`.
+    """
+    processes = processes or os.cpu_count() or 1
+    queue = WorkQueue(path, lease=lease)
+    queue.setup(
+        seeds,
+        depth=depth,
+        max_tags=max_tags,
+        shards=processes,
+        results=results,
+        priority=priority,
+        attempts=attempts,
+    )
+    shards = queue.meta["shards"]
+
+    workers = [
+        multiprocessing.Process(target=_process, args=(path, i % shards, concurrency, lease, options), daemon=True)
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    if output is not None:
+        with JsonLinesWriter(output, append=False) as writer:
+            for record in queue.results():
+                writer.write(record)
+
+    counts = queue.counts()
+    queue.close()
+    return counts
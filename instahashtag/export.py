@@ -0,0 +1,296 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+from . import columns
+
+#: Columns identifying the query of a ``tag`` or ``graph`` reply.
+TAG_QUERY = (("query", lambda obj: obj.hashtag, None),)
+
+#: Columns identifying the query of a ``maps`` reply.
+MAPS_QUERY = (
+    ("x1", lambda obj: obj.x1, "d"),
+    ("y1", lambda obj: obj.y1, "d"),
+    ("x2", lambda obj: obj.x2, "d"),
+    ("y2", lambda obj: obj.y2, "d"),
+    ("zoom", lambda obj: float(obj.zoom), "d"),
+)
+
+#: Flat schema of every exportable entity: ``(data key, query columns, row columns)``. Column specs
+#: follow :py:mod:`instahashtag.columns`.
+ENTITIES = {
+    "tag_results": ("results", TAG_QUERY, columns.TAG_RESULTS),
+    "graph_nodes": ("nodes", TAG_QUERY, columns.GRAPH_NODES),
+    "graph_edges": ("edges", TAG_QUERY, columns.GRAPH_EDGES),
+    "maps_tags": ("tags", MAPS_QUERY, columns.MAPS_TAGS),
+}
+
+#: Default number of rows buffered before a batch (row group) is written.
+ROW_GROUP_SIZE = 65536
+
+
+class JsonLinesWriter:
+    """Streams records to a JSON Lines file, one JSON object per line.
+
+    Every record is written (and flushed) as soon as it is given, so nothing accumulates in memory
+    and a killed process loses at most the line it was writing.
+
+    Args:
+        path: Path of the output file.
+        append: If set to ``True`` appends to an existing file instead of truncating it. Defaults to ``True``.
+    """
+
+    def __init__(self, path: str, append: bool = True) -> None:
+        self.path = path
+        self.count = 0
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record: Any) -> None:
+        """Writes a single record."""
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        """Closes the output file."""
+        self._file.close()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Exporter(ABC):
+    """Base class of the streaming exporters of ``Tag``, ``Graph`` and ``Maps`` results.
+
+    Rows are taken straight from the raw API data of every written object (no per-row objects are
+    built) into a column buffer, which is written out as a batch (as row groups, for the columnar
+    formats) once it holds ``row_group_size`` rows. Memory therefore stays flat however many rows
+    are exported. Objects whose query failed (see the ``error`` attribute) are skipped.
+
+    .. code-block:: python
+
+        from instahashtag import Tag
+        from instahashtag.export import exporter
+
+        with exporter("results.parquet", "tag_results") as out:
+            async for tag in Tag.many(hashtags):
+                out.write(tag)
+
+    Subclasses implement :py:func:`_write`, receiving every batch as a dictionary of column lists,
+    and optionally :py:func:`_close`.
+
+    Args:
+        path: Path of the output file.
+        entity: Flat schema to export, one of :py:data:`ENTITIES`: ``"tag_results"``, ``"graph_nodes"``,
+            ``"graph_edges"`` or ``"maps_tags"``.
+        row_group_size: Number of rows per written batch. Defaults to :py:data:`ROW_GROUP_SIZE`.
+
+    Attributes:
+        count: Number of rows written so far.
+    """
+
+    def __init__(self, path: str, entity: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        if entity not in ENTITIES:
+            raise ValueError("unknown entity {!r}, choose from {}".format(entity, sorted(ENTITIES)))
+
+        self.path = path
+        self.entity = entity
+        self.row_group_size = row_group_size
+        self.count = 0
+        self._key, query, rows = ENTITIES[entity]
+        self.spec = tuple(query) + tuple(rows)
+        self._query, self._rows = query, rows
+        self._reset()
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the exported columns."""
+        return [name for name, _, _ in self.spec]
+
+    def _reset(self) -> None:
+        self._buffer = {name: [] for name, _, _ in self.spec}
+        self._buffered = 0
+
+    def write(self, obj: Any) -> int:
+        """Buffers the rows of a ``Tag``, ``Graph`` or ``Maps`` object, writing full batches. Returns the number of rows."""
+        if getattr(obj, "error", None) is not None or obj.data is None:
+            return 0
+
+        rows = obj.data.get(self._key) or []
+        buffer = self._buffer
+        for name, getter, _ in self._query:
+            buffer[name].extend([getter(obj)] * len(rows))
+        for name, getter, _ in self._rows:
+            buffer[name].extend(getter(row) for row in rows)
+
+        self._buffered += len(rows)
+        if self._buffered >= self.row_group_size:
+            self.flush()
+        return len(rows)
+
+    def write_many(self, objs: Iterable[Any]) -> int:
+        """Writes every object of ``objs``. Returns the number of rows."""
+        return sum(self.write(obj) for obj in objs)
+
+    def flush(self) -> None:
+        """Writes the buffered rows as a batch."""
+        if self._buffered:
+            self._write(self._buffer)
+            self.count += self._buffered
+            self._reset()
+
+    @abstractmethod
+    def _write(self, batch: Dict[str, list]) -> None:  # pragma: no cover
+        """Writes a batch of rows, given as a dictionary of column lists."""
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Writes the remaining rows and closes the output file."""
+        self.flush()
+        self._close()
+
+    def __enter__(self) -> "Exporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CsvExporter(Exporter):
+    """Exports rows to a CSV file with a header line. Missing coordinates are written as ``nan``."""
+
+    def __init__(self, path: str, entity: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        super().__init__(path, entity, row_group_size=row_group_size)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.names)
+
+    def _write(self, batch: Dict[str, list]) -> None:
+        self._writer.writerows(zip(*(batch[name] for name in self.names)))
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class JsonLinesExporter(Exporter):
+    """Exports rows to a JSON Lines file, one flat JSON object per row. Missing coordinates are written as ``null``."""
+
+    def __init__(self, path: str, entity: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        super().__init__(path, entity, row_group_size=row_group_size)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write(self, batch: Dict[str, list]) -> None:
+        names = self.names
+        self._file.writelines(
+            json.dumps({name: None if value != value else value for name, value in zip(names, row)}) + "\n"
+            for row in zip(*(batch[name] for name in names))
+        )
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+def schema(spec: Sequence[Tuple[str, Callable, str]]) -> "pyarrow.Schema":
+    """Returns the Arrow schema of a column ``spec``: strings, ``int64`` (``"q"``) and ``float64`` (``"d"``)."""
+    _require_pyarrow()
+    types = {None: pyarrow.string(), "q": pyarrow.int64(), "d": pyarrow.float64()}
+    return pyarrow.schema([(name, types[typecode]) for name, _, typecode in spec])
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet exports: pip install instahashtag[arrow]")
+
+
+class _ArrowExporter(Exporter):
+    def __init__(self, path: str, entity: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        super().__init__(path, entity, row_group_size=row_group_size)
+        self.schema = schema(self.spec)
+
+    def _batch(self, batch: Dict[str, list]) -> "pyarrow.RecordBatch":
+        return pyarrow.record_batch(
+            [pyarrow.array(batch[field.name], type=field.type) for field in self.schema],
+            schema=self.schema,
+        )
+
+
+class ArrowExporter(_ArrowExporter):
+    """Exports rows to an Arrow IPC (Feather v2) file, one record batch per row group. Requires ``pyarrow``."""
+
+    def __init__(self, path: str, entity: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        super().__init__(path, entity, row_group_size=row_group_size)
+        self._writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def _write(self, batch: Dict[str, list]) -> None:
+        self._writer.write_batch(self._batch(batch))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class ParquetExporter(_ArrowExporter):
+    """Exports rows to a Parquet file, one row group per batch. Requires ``pyarrow``.
+
+    Args:
+        compression: Parquet compression codec. Defaults to ``"snappy"``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entity: str,
+        row_group_size: int = ROW_GROUP_SIZE,
+        compression: str = "snappy",
+    ) -> None:
+        super().__init__(path, entity, row_group_size=row_group_size)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression)
+
+    def _write(self, batch: Dict[str, list]) -> None:
+        self._writer.write_batch(self._batch(batch), row_group_size=self.row_group_size)
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+#: Exporter of every supported file extension, see :py:func:`exporter`.
+FORMATS = {
+    ".csv": CsvExporter,
+    ".jsonl": JsonLinesExporter,
+    ".arrow": ArrowExporter,
+    ".feather": ArrowExporter,
+    ".parquet": ParquetExporter,
+}
+
+
+def exporter(path: str, entity: str, **kwargs) -> Exporter:
+    """Returns the :py:class:`Exporter` matching the extension of ``path`` (see :py:data:`FORMATS`).
+
+    .. code-block:: python
+
+        with exporter("edges.parquet", "graph_edges") as out:
+            out.write_many(graphs)
+
+    Raises:
+        ValueError: The extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError("unsupported export format {!r}, choose from {}".format(extension, sorted(FORMATS)))
+    return FORMATS[extension](path, entity, **kwargs)
@@ -0,0 +1,245 @@
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Tuple, Union
+
+from .wrapper.tag import Tag
+
+#: Key of the queried hashtag itself in :py:func:`History.state`, next to its related hashtags.
+ROOT = ""
+
+#: Tracked fields of the queried hashtag.
+TAG_FIELDS = ("rank",)
+
+#: Tracked fields of every related hashtag (``TagResult``).
+RESULT_FIELDS = ("rank", "media_count", "relevance")
+
+#: Differences between two snapshots of a hashtag, see :py:func:`History.changes`.
+Changes = namedtuple("Changes", ("hashtag", "since", "until", "added", "removed", "rank", "growth"))
+
+State = Dict[str, Dict[str, float]]
+
+
+class History:
+    """Append-only time series of ``tag`` snapshots, backed by SQLite.
+
+    Each snapshot only stores the values that changed since the previous snapshot of the same
+    hashtag (plus the related hashtags that appeared or disappeared), so polling a slowly moving
+    hashtag every day costs a handful of rows instead of a full JSON reply. The latest state of
+    every hashtag is kept materialised, which makes appending a snapshot a single diff, and any
+    past state is rebuilt by replaying the changes up to that time.
+
+    Like :py:class:`~instahashtag.cache.DiskCache`, the database runs in WAL mode and each thread gets
+    its own connection.
+
+    .. code-block:: python
+
+        from instahashtag import Tag
+        from instahashtag.history import History
+
+        history = History("history.db")
+        history.add(Tag("miami"))
+
+        history.series("miami", "rank") # >>> [(1601856000.0, 83), (1602201600.0, 85)]
+        changes = history.changes("miami", since=time.time() - 7 * 86400)
+        changes.added # >>> ["miamivice", ...]
+        changes.rank # >>> {"": (83, 85), "miamibeach": (74, 70), ...}
+
+    Args:
+        path: Path to the SQLite database file. It is created if it does not exist.
+        timeout: Seconds to wait on a database locked by another process. Defaults to ``30``.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " id INTEGER PRIMARY KEY,"
+                " hashtag TEXT NOT NULL,"
+                " time REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS changes ("
+                " snapshot INTEGER NOT NULL,"
+                " related TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value NUMERIC)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS latest ("
+                " hashtag TEXT NOT NULL,"
+                " related TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value NUMERIC NOT NULL,"
+                " PRIMARY KEY (hashtag, related, field))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS snapshots_hashtag_time ON snapshots (hashtag, time)")
+            conn.execute("CREATE INDEX IF NOT EXISTS snapshots_time ON snapshots (time)")
+            conn.execute("CREATE INDEX IF NOT EXISTS changes_snapshot ON changes (snapshot)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def flatten(tag: Tag) -> Dict[Tuple[str, str], float]:
+        """Returns the tracked ``(related, field) -> value`` pairs of a :py:class:`~instahashtag.wrapper.Tag`."""
+        data = tag.data or {}
+        values = {(ROOT, field): data.get(field) for field in TAG_FIELDS}
+        for result in data.get("results") or []:
+            for field in RESULT_FIELDS:
+                values[(result["tag"], field)] = result.get(field)
+        return {key: value for key, value in values.items() if value is not None}
+
+    def add(self, tag: Tag, at: float = None) -> int:
+        """Appends a snapshot of ``tag`` taken at the ``at`` timestamp (defaults to now).
+
+        Snapshots of a hashtag are expected to be appended in time order.
+
+        Returns the number of stored changes; ``0`` means nothing moved since the previous snapshot.
+        """
+        at = time.time() if at is None else at
+        values = self.flatten(tag)
+
+        with self._connection() as conn:
+            latest = {
+                (related, field): value
+                for related, field, value in conn.execute(
+                    "SELECT related, field, value FROM latest WHERE hashtag = ?", (tag.hashtag,)
+                )
+            }
+
+            changed = [(r, f, v) for (r, f), v in values.items() if latest.get((r, f)) != v]
+            changed.extend((r, f, None) for (r, f) in latest if (r, f) not in values)
+
+            snapshot = conn.execute(
+                "INSERT INTO snapshots (hashtag, time) VALUES (?, ?)", (tag.hashtag, at)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO changes (snapshot, related, field, value) VALUES (?, ?, ?, ?)",
+                ((snapshot, r, f, v) for r, f, v in changed),
+            )
+            conn.executemany(
+                "DELETE FROM latest WHERE hashtag = ? AND related = ? AND field = ?",
+                ((tag.hashtag, r, f) for r, f, v in changed if v is None),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO latest (hashtag, related, field, value) VALUES (?, ?, ?, ?)",
+                ((tag.hashtag, r, f, v) for r, f, v in changed if v is not None),
+            )
+
+        return len(changed)
+
+    def state(self, hashtag: str, at: float = None) -> State:
+        """Returns the ``{related: {field: value}}`` state of ``hashtag`` at the ``at`` timestamp (defaults to now).
+
+        The queried hashtag itself is under the :py:data:`ROOT` key.
+        """
+        if at is None:
+            rows = self._connection().execute(
+                "SELECT related, field, value FROM latest WHERE hashtag = ?", (hashtag,)
+            )
+        else:
+            rows = self._connection().execute(
+                "SELECT c.related, c.field, c.value FROM changes c JOIN snapshots s ON c.snapshot = s.id"
+                " WHERE s.hashtag = ? AND s.time <= ? ORDER BY s.time, s.id",
+                (hashtag, at),
+            )
+
+        state = {}
+        for related, field, value in rows:
+            fields = state.setdefault(related, {})
+            if value is None:
+                fields.pop(field, None)
+                if not fields:
+                    del state[related]
+            else:
+                fields[field] = value
+        return state
+
+    def series(self, hashtag: str, field: str = "rank", related: str = ROOT) -> List[Tuple[float, Union[float, None]]]:
+        """Returns the ``(time, value)`` change points of a field; the value holds until the next point.
+
+        A ``None`` value means ``related`` dropped out of the results at that time.
+        """
+        return self._connection().execute(
+            "SELECT s.time, c.value FROM changes c JOIN snapshots s ON c.snapshot = s.id"
+            " WHERE s.hashtag = ? AND c.related = ? AND c.field = ? ORDER BY s.time, s.id",
+            (hashtag, related, field),
+        ).fetchall()
+
+    def snapshots(self, hashtag: str) -> List[float]:
+        """Returns the times of every snapshot of ``hashtag``, oldest first."""
+        rows = self._connection().execute(
+            "SELECT time FROM snapshots WHERE hashtag = ? ORDER BY time, id", (hashtag,)
+        )
+        return [row[0] for row in rows]
+
+    def hashtags(self, since: float = None) -> List[str]:
+        """Returns the tracked hashtags, or only those with a change after the ``since`` timestamp."""
+        if since is None:
+            rows = self._connection().execute("SELECT DISTINCT hashtag FROM snapshots ORDER BY hashtag")
+        else:
+            rows = self._connection().execute(
+                "SELECT DISTINCT s.hashtag FROM snapshots s WHERE s.time > ?"
+                " AND EXISTS (SELECT 1 FROM changes c WHERE c.snapshot = s.id) ORDER BY s.hashtag",
+                (since,),
+            )
+        return [row[0] for row in rows]
+
+    def changes(self, hashtag: str, since: float, until: float = None, min_jump: float = 1) -> Changes:
+        """Returns what changed for ``hashtag`` between the ``since`` and ``until`` (defaults to now) timestamps.
+
+        Returns:
+            A :py:class:`Changes` tuple whose ``added`` and ``removed`` are the related hashtags that
+            appeared or disappeared, ``rank`` maps every hashtag (:py:data:`ROOT` for the queried one)
+            whose rank moved by at least ``min_jump`` to its ``(old, new)`` ranks, and ``growth`` maps
+            every related hashtag to its relative ``media_count`` growth per day.
+        """
+        before, after = self.state(hashtag, at=since), self.state(hashtag, at=until)
+        times = [t for t in self.snapshots(hashtag) if t <= (until if until is not None else float("inf"))]
+        start = max((t for t in times if t <= since), default=None)
+        days = (times[-1] - start) / 86400.0 if times and start is not None else 0.0
+
+        rank, growth = {}, {}
+        for related, fields in after.items():
+            old = before.get(related, {})
+            if "rank" in fields and "rank" in old and abs(fields["rank"] - old["rank"]) >= min_jump:
+                rank[related] = (old["rank"], fields["rank"])
+            if days > 0 and old.get("media_count") and "media_count" in fields:
+                growth[related] = (fields["media_count"] / old["media_count"] - 1.0) / days
+
+        return Changes(
+            hashtag=hashtag,
+            since=since,
+            until=until,
+            added=sorted(r for r in after if r not in before and r != ROOT),
+            removed=sorted(r for r in before if r not in after and r != ROOT),
+            rank=rank,
+            growth=growth,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of stored snapshots and changes."""
+        conn = self._connection()
+        return {
+            "snapshots": conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0],
+            "changes": conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0],
+        }
+
+    def close(self) -> None:
+        """Closes the database connection of the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
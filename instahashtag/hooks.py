@@ -0,0 +1,60 @@
+from typing import Callable
+
+
+class Hooks:
+    """Event hooks called by :py:func:`instahashtag.http.Base.request` around every upstream call.
+
+    Each event holds a list of callbacks, called in order with the arguments listed below, where
+    ``request`` is the :py:class:`~instahashtag.http.Base` object being sent (its ``kind``,
+    ``endpoint`` and ``body`` attributes are available to the callbacks):
+
+    * ``before_request(request)``: before each attempt is sent.
+    * ``after_response(request, latency)``: after an attempt succeeds, ``latency`` being the seconds
+      it took, parsing included.
+    * ``on_error(request, error, latency)``: after an attempt fails with ``error``.
+    * ``on_parse(request, seconds)``: after the reply is parsed by :py:func:`~instahashtag.http.Base.process`.
+    * ``on_retry(request, error, attempt, delay)``: before waiting ``delay`` seconds to retry.
+    * ``on_cache_hit(request)``: when the reply is served by the client's cache.
+
+    Hooks are attached to a :py:class:`~instahashtag.http.Client` through its ``hooks`` argument.
+    Events without callbacks cost a single attribute check.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.hooks import Hooks
+
+        hooks = Hooks()
+
+        @hooks.on("after_response")
+        def log(request, latency):
+            print(request.endpoint, latency)
+
+        client = Client(hooks=hooks)
+    """
+
+    EVENTS = ("before_request", "after_response", "on_error", "on_parse", "on_retry", "on_cache_hit")
+
+    def __init__(self) -> None:
+        for event in self.EVENTS:
+            setattr(self, event, [])
+
+    def register(self, event: str, callback: Callable) -> None:
+        """Appends ``callback`` to the callbacks of ``event``."""
+        if event not in self.EVENTS:
+            raise ValueError("unknown event {!r}, choose from {}".format(event, self.EVENTS))
+        getattr(self, event).append(callback)
+
+    def on(self, event: str) -> Callable[[Callable], Callable]:
+        """Decorator version of :py:func:`register`."""
+
+        def decorator(callback: Callable) -> Callable:
+            self.register(event, callback)
+            return callback
+
+        return decorator
+
+    def emit(self, event: str, *args) -> None:
+        """Calls every callback of ``event`` with ``args``."""
+        for callback in getattr(self, event):
+            callback(*args)
@@ -1,21 +1,68 @@
+import asyncio
+import copy
+import inspect
 import json
+import time
+import types
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable, Tuple, Union
 
 import aiohttp as aiohttp_module
 import requests as requests_module
 
+from . import decoder as decoder_module
 from . import utils
+from .singleflight import SingleFlight
+
+#: Exceptions of a request aborted by the caller rather than failed, e.g. when breaking out of
+#: :py:func:`~instahashtag.api.tag_many`. They are re-raised without being recorded.
+ABORTS = (asyncio.CancelledError, KeyboardInterrupt, GeneratorExit)
+
+#: Default ``(connect, read)`` timeout in seconds, also used by requests sent without a :py:class:`Client`.
+TIMEOUT = (10.0, 30.0)
+
+
+class _processmethod:
+    """Descriptor of :py:func:`Base.process`: a method on instances, while ``Base.process(resp)``
+    (called on the class) still parses a reply on its own, as when it was a ``staticmethod``."""
+
+    def __init__(self, method: Callable) -> None:
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    def __get__(self, obj: Any, cls: type = None) -> Callable:
+        if obj is None:
+            return _process
+        return types.MethodType(self.method, obj)
+
+
+def _process(resp: Union[str, bytes], loads: Callable = None) -> dict:
+    return (loads or decoder_module.loads)(resp)
 
 
 class endpoints:
     """API endpoints."""
 
+    host = "https://apidisplaypurposes.com"
     tag = "https://apidisplaypurposes.com/tag/{}"
     graph = "https://apidisplaypurposes.com/graph/{}"
     maps = "https://apidisplaypurposes.com/local/?bbox={},{},{},{}&zoom={}"
 
 
+class HTTPError(Exception):
+    """Raised when the API replies with an error status.
+
+    Attributes:
+        status: HTTP status code of the reply.
+        endpoint: Endpoint that was queried.
+    """
+
+    def __init__(self, status: int, endpoint: str) -> None:
+        super().__init__("{} returned HTTP status {}".format(endpoint, status))
+        self.status = status
+        self.endpoint = endpoint
+
+
 class Base(ABC):
     """Base class that properly processes and calls the API.
 
@@ -34,6 +81,7 @@ class Base(ABC):
             class httpx_io(Base):
                 def call(self):
                     req = httpx.get(self.endpoint, headers=self.headers)
+                    self.raise_for_status(req.status_code)
                     resp = req.text
 
                     # Note that self.process is just a simple wrapper for 'json.loads'.
@@ -46,6 +94,7 @@ class Base(ABC):
                     async with httpx.AsyncClient() as client:
                         req = await client.get(self.endpoint, headers=self.headers)
 
+                    self.raise_for_status(req.status_code)
                     resp = req.text
                     return self.process(resp)
 
@@ -71,64 +120,364 @@ class Base(ABC):
                     zoom=12,
                 )
 
+        Retries, timeouts and the circuit breaker configured on a :py:class:`Client` are inherited
+        by such subclasses. To have the transport errors of another library retried, extend
+        :py:attr:`retryable` (e.g. ``retryable = Base.retryable + (httpx.TransportError,)``), and
+        honor :py:attr:`timeout` inside of :py:func:`call`.
     """
 
-    def __init__(self, endpoint: str, headers: dict) -> None:
+    #: Errors (besides :py:class:`HTTPError`) that are considered transient and may be retried.
+    retryable = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: dict,
+        client: "Client" = None,
+        kind: str = None,
+    ) -> None:
         self.endpoint = endpoint
         self.headers = headers
+        self.kind = kind
+        self.body = None
+        self.client = client
+        self.timeout = client.timeout if client is not None else TIMEOUT
+        self.loads = client.loads if client is not None else decoder_module.loads
+
+    @property
+    def session(self) -> Any:
+        """Pooled session of the :py:attr:`client`, opened when a request is first sent (``None`` without a client)."""
+        return self.client.session if self.client is not None else None
+
+    @classmethod
+    def open_session(cls, client: "Client") -> Any:
+        """Creates the pooled session object that is shared by every request of a :py:class:`Client`.
+
+        The default implementation returns ``None``, meaning that :py:func:`call` is responsible
+        for opening its own connection. Transports that support connection pooling should overwrite
+        this method and honor the pooling options of the given client (``limit``, ``limit_per_host``
+        and ``keepalive_timeout``).
+        """
+        return None
 
     @abstractmethod
     def call(self) -> NotImplemented:  # pragma: no cover
         """Abstract method that needs to be written to query the API endpoint."""
         raise NotImplementedError
 
-    @staticmethod
-    def process(resp: str) -> dict:
+    def raise_for_status(self, status: int) -> None:
+        """Raises :py:class:`HTTPError` if ``status`` is an error status (``4xx`` or ``5xx``).
+
+        Should be called by :py:func:`call` before processing the reply, so error pages are not
+        mistaken for malformed data and transient errors may be retried.
+        """
+        if status >= 400:
+            raise HTTPError(status, self.endpoint)
+
+    @_processmethod
+    def process(self, resp: Union[str, bytes]) -> dict:
         """Processes the reply returned back by :py:data:`tag`, :py:data:`graph`, and :py:data:`maps`.
 
         The current implementation of this function is a simple ``json.loads(resp)``, returning
         back a Python dictionary object. However, one may chose to overwrite this function to
         process the data in some more meaningful way.
+
+        The reply may be given as raw ``bytes``, which skips decoding it to ``str`` first, and is
+        parsed with the fastest installed JSON decoder (see :py:mod:`instahashtag.decoder`), or the
+        one chosen by the client. It is kept in :py:attr:`body`, which is what raw caches (such as
+        :py:class:`~instahashtag.cache.DiskCache`) store so it can be re-processed later on.
+
+        Called on the class, as in ``Base.process(resp)``, it only parses the reply, with the
+        fastest installed decoder or the ``loads`` function given as second argument.
+        """
+        self.body = resp
+
+        hooks = self.client.hooks if self.client is not None else None
+        if hooks is None or not hooks.on_parse:
+            return self.loads(resp)
+
+        start = time.perf_counter()
+        data = self.loads(resp)
+        hooks.emit("on_parse", self, time.perf_counter() - start)
+        return data
+
+    def request(self) -> Any:
+        """Queries the endpoint through the layers configured on the :py:attr:`client`.
+
+        Without a client this is the same as :py:func:`call`. With one, the client's cache is
+        consulted before (and filled after) the call, concurrent identical requests are
+        coalesced into one if the client was created with ``coalesce=True``, the upstream call
+        is paced by the client's rate and concurrency limiters, guarded by its circuit breaker,
+        and retried according to its retry policy. The client's :py:class:`~instahashtag.hooks.Hooks`
+        are called along the way. Since the layers wrap :py:func:`call`, every
+        subclass inherits them, whether its ``call`` is synchronous or a coroutine.
         """
-        return json.loads(resp)
+        if self.client is None:
+            return self.call()
+        elif self.client.aio:
+            return self._request_async()
+        else:
+            return self._request_sync()
+
+    def _cached(self) -> Any:
+        """Returns the cached data of the endpoint, re-processing raw entries, or ``None`` on a miss."""
+        cache = self.client.cache
+        if cache is None:
+            return None
+
+        entry = cache.get(self.endpoint)
+        if entry is None:
+            return None
+
+        hooks = self.client.hooks
+        if hooks is not None and hooks.on_cache_hit:
+            hooks.emit("on_cache_hit", self)
+
+        if cache.raw:
+            return self.process(entry)
+        return entry
+
+    def _store(self, data: Any) -> None:
+        """Stores the processed data (or the raw body, for raw caches) in the client's cache."""
+        cache = self.client.cache
+        if cache is None:
+            return
+
+        if cache.raw:
+            body = self.body if self.body is not None else json.dumps(data)
+            cache.set(self.endpoint, body, kind=self.kind)
+        else:
+            cache.set(self.endpoint, data, kind=self.kind)
+
+    def _retrying(self, error: BaseException, attempt: int, delay: float) -> None:
+        hooks = self.client.hooks
+        if hooks is not None and hooks.on_retry:
+            hooks.emit("on_retry", self, error, attempt, delay)
+
+    def _request_sync(self) -> Any:
+        data = self._cached()
+        if data is not None:
+            return data
+
+        flight = self.client.flight
+        if flight is not None:
+            return flight.do(self.endpoint, self._fetch_sync)
+        return self._fetch_sync()
+
+    def _fetch_sync(self) -> Any:
+        retry = self.client.retry
+        attempt = 0
+
+        while True:
+            try:
+                data = self._attempt_sync()
+            except Exception as error:
+                if retry is None or not retry.should_retry(error, attempt, self.retryable):
+                    raise
+                delay = retry.delay(attempt)
+                self._retrying(error, attempt, delay)
+                time.sleep(delay)
+                attempt += 1
+            else:
+                break
+
+        self._store(data)
+        return data
+
+    def _attempt_sync(self) -> Any:
+        breaker = self.client.breaker
+        if breaker is not None:
+            breaker.before()
+
+        slot = False
+        try:
+            limiter = self.client.limiter
+            if limiter is not None:
+                limiter.acquire()
+
+            concurrency = self.client.concurrency_limiter
+            if concurrency is not None:
+                concurrency.acquire()
+                slot = True
+
+            hooks = self.client.hooks
+            if hooks is not None and hooks.before_request:
+                hooks.emit("before_request", self)
+        except BaseException as error:
+            self._abandon(error, slot)
+            raise
+
+        start = time.monotonic()
+        try:
+            data = self.call()
+        except BaseException as error:
+            self._record(time.monotonic() - start, error)
+            raise
+        self._record(time.monotonic() - start)
+        return data
+
+    def _abandon(self, error: BaseException, slot: bool) -> None:
+        """Frees the circuit breaker's half-open trial, and the concurrency slot if ``slot`` was taken,
+        of an attempt that raised (or was cancelled) before its call."""
+        breaker = self.client.breaker
+        if breaker is not None:
+            breaker.record(error, self.retryable)
+
+        if slot:
+            self.client.concurrency_limiter.release(0.0, error, self.retryable)
+
+    def _record(self, latency: float, error: BaseException = None) -> None:
+        """Feeds the outcome of an attempt back to the hooks, circuit breaker and concurrency limiter.
+
+        A request aborted by the caller (see :py:data:`ABORTS`) is not an outcome: the hooks are
+        skipped, and the breaker and limiter only free what the request held.
+        """
+        hooks = self.client.hooks
+        if hooks is not None and not isinstance(error, ABORTS):
+            if error is None and hooks.after_response:
+                hooks.emit("after_response", self, latency)
+            elif error is not None and hooks.on_error:
+                hooks.emit("on_error", self, error, latency)
+
+        breaker = self.client.breaker
+        if breaker is not None:
+            breaker.record(error, self.retryable)
+
+        concurrency = self.client.concurrency_limiter
+        if concurrency is not None:
+            concurrency.release(latency, error, self.retryable)
+
+    async def _request_async(self) -> Any:
+        data = self._cached()
+        if data is not None:
+            return data
+
+        flight = self.client.flight
+        if flight is not None:
+            return await flight.ado(self.endpoint, self._fetch_async)
+        return await self._fetch_async()
+
+    async def _fetch_async(self) -> Any:
+        retry = self.client.retry
+        attempt = 0
+
+        while True:
+            try:
+                data = await self._attempt_async()
+            except Exception as error:
+                if retry is None or not retry.should_retry(error, attempt, self.retryable):
+                    raise
+                delay = retry.delay(attempt)
+                self._retrying(error, attempt, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                break
+
+        self._store(data)
+        return data
+
+    async def _attempt_async(self) -> Any:
+        breaker = self.client.breaker
+        if breaker is not None:
+            breaker.before()
+
+        slot = False
+        try:
+            limiter = self.client.limiter
+            if limiter is not None:
+                await limiter.aacquire()
+
+            concurrency = self.client.concurrency_limiter
+            if concurrency is not None:
+                await concurrency.aacquire()
+                slot = True
+
+            hooks = self.client.hooks
+            if hooks is not None and hooks.before_request:
+                hooks.emit("before_request", self)
+        except BaseException as error:
+            self._abandon(error, slot)
+            raise
+
+        start = time.monotonic()
+        try:
+            data = await self.call()
+        except BaseException as error:
+            self._record(time.monotonic() - start, error)
+            raise
+        self._record(time.monotonic() - start)
+        return data
 
     @classmethod
-    def tag(cls, hashtag: str) -> Any:
+    def tag(cls, hashtag: str, client: "Client" = None) -> Any:
         """Sends an API request to the ``tag`` endpoint."""
 
         endpoint = endpoints.tag.format(hashtag)
         headers = utils.generate_header(hashtag=hashtag)
+        if client is not None:
+            endpoint = client.url(endpoint)
 
-        obj = cls(endpoint, headers)
-        return obj.call()
+        obj = cls(endpoint, headers, client, kind="tag")
+        return obj.request()
 
     @classmethod
-    def graph(cls, hashtag: str) -> Any:
+    def graph(cls, hashtag: str, client: "Client" = None) -> Any:
         """Sends an API request to the ``graph`` endpoint."""
 
         endpoint = endpoints.graph.format(hashtag)
         headers = utils.generate_header(hashtag=hashtag)
+        if client is not None:
+            endpoint = client.url(endpoint)
 
-        obj = cls(endpoint, headers)
-        return obj.call()
+        obj = cls(endpoint, headers, client, kind="graph")
+        return obj.request()
 
     @classmethod
-    def maps(cls, x1: float, y1: float, x2: float, y2: float, zoom: int) -> Any:
+    def maps(
+        cls,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        zoom: int,
+        client: "Client" = None,
+    ) -> Any:
         """Sends an API request to the ``maps`` endpoint."""
 
         endpoint = endpoints.maps.format(x1, y1, x2, y2, zoom)
         headers = utils.generate_header(hashtag=None)
+        if client is not None:
+            endpoint = client.url(endpoint)
 
-        obj = cls(endpoint, headers)
-        return obj.call()
+        obj = cls(endpoint, headers, client, kind="maps")
+        return obj.request()
 
 
 class Requests(Base):
     """Class that utilitizes the ``request`` module to make API request."""
 
+    retryable = Base.retryable + (
+        requests_module.ConnectionError,
+        requests_module.Timeout,
+    )
+
+    @classmethod
+    def open_session(cls, client: "Client") -> requests_module.Session:
+        session = requests_module.Session()
+        adapter = requests_module.adapters.HTTPAdapter(
+            pool_connections=client.limit,
+            pool_maxsize=client.limit_per_host,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def call(self):
-        req = requests_module.get(url=self.endpoint, headers=self.headers)
-        resp = req.text
+        session = self.session or requests_module
+        req = session.get(url=self.endpoint, headers=self.headers, timeout=self.timeout)
+        self.raise_for_status(req.status_code)
+        resp = req.content
 
         return self.process(resp)
 
@@ -136,9 +485,193 @@ class Requests(Base):
 class Aiohttp(Base):
     """Class that utilitizes the ``aiohttp`` module to make API request."""
 
+    retryable = Base.retryable + (
+        aiohttp_module.ClientConnectionError,
+        aiohttp_module.ClientPayloadError,
+    )
+
+    @classmethod
+    def open_session(cls, client: "Client") -> aiohttp_module.ClientSession:
+        connector = aiohttp_module.TCPConnector(
+            limit=client.limit,
+            limit_per_host=client.limit_per_host,
+            keepalive_timeout=client.keepalive_timeout,
+        )
+        return aiohttp_module.ClientSession(connector=connector)
+
+    def client_timeout(self) -> aiohttp_module.ClientTimeout:
+        """Converts :py:attr:`timeout` into the equivalent ``aiohttp.ClientTimeout``."""
+        if self.timeout is None:
+            return aiohttp_module.ClientTimeout(total=None)
+
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+        else:
+            connect = read = self.timeout
+        return aiohttp_module.ClientTimeout(sock_connect=connect, sock_read=read)
+
     async def call(self):
-        async with aiohttp_module.ClientSession(headers=self.headers) as session:
-            async with session.get(self.endpoint) as response:
-                resp = await response.text()
+        timeout = self.client_timeout()
+
+        if self.session is None:
+            async with aiohttp_module.ClientSession(headers=self.headers) as session:
+                async with session.get(self.endpoint, timeout=timeout) as response:
+                    self.raise_for_status(response.status)
+                    resp = await response.read()
+        else:
+            get = self.session.get(self.endpoint, headers=self.headers, timeout=timeout)
+            async with get as response:
+                self.raise_for_status(response.status)
+                resp = await response.read()
 
         return self.process(resp)
+
+
+class Client:
+    """Reusable HTTP client that owns a keep-alive connection pool.
+
+    Every call made through :py:class:`Requests` or :py:class:`Aiohttp` without a client opens (and
+    tears down) its own connection, paying DNS, TCP and TLS setup each time. A client keeps a single
+    pooled session alive for its whole lifetime, so consecutive calls reuse open connections.
+
+    Example
+        The client may be used as a context manager (``with`` for ``requests`` and ``async with``
+        for ``aiohttp``), and passed to the :ref:`api` functions and the :ref:`wrapper` objects.
+
+        .. code-block:: python
+
+            from instahashtag import api, Client, Tag
+
+            def io():
+                with Client() as client:
+                    tag = api.tag(hashtag="instagram", client=client)
+                    graph = client.graph(hashtag="instagram")
+
+            async def aio():
+                async with Client(aio=True, limit_per_host=20) as client:
+                    tag = Tag("instagram", client=client)
+                    await tag.call()
+
+    Args:
+        aio: If set to ``True`` uses :py:class:`Aiohttp` as the transport. Defaults to ``False``.
+        transport: Custom :py:class:`Base` subclass to use as the transport. Overrides ``aio``.
+        limit: Maximum number of pooled connections. Defaults to ``100``.
+        limit_per_host: Maximum number of pooled connections per host. Defaults to ``10``.
+        keepalive_timeout: Seconds an idle connection is kept alive (``aiohttp`` only). Defaults to ``15``.
+        cache: Optional response cache (see :py:class:`~instahashtag.cache.MemoryCache` and
+            :py:class:`~instahashtag.cache.DiskCache`) consulted before every request.
+        coalesce: If set to ``True``, concurrent requests to the same endpoint share a single
+            upstream call and result (see :py:class:`~instahashtag.singleflight.SingleFlight`).
+            Defaults to ``False``.
+        limiter: Optional :py:class:`~instahashtag.limiter.TokenBucket` pacing the upstream calls.
+            It may be shared by several clients.
+        concurrency_limiter: Optional :py:class:`~instahashtag.limiter.AdaptiveConcurrency` bounding
+            the number of in-flight upstream calls.
+        timeout: Either a number of seconds, or a ``(connect, read)`` tuple, after which a stalled
+            request is aborted. ``None`` waits forever. Defaults to ``(10, 30)``.
+        retry: Optional :py:class:`~instahashtag.retry.Retry` policy for transient failures.
+        breaker: Optional :py:class:`~instahashtag.retry.CircuitBreaker` that fails fast while the
+            upstream is down.
+        decoder: JSON decoder used by :py:func:`Base.process`, either by name (``"orjson"``,
+            ``"ujson"``, ``"json"``) or as a function. Defaults to the fastest installed one.
+        hooks: Optional :py:class:`~instahashtag.hooks.Hooks` called around every upstream call.
+        base_url: Host that replaces :py:attr:`endpoints.host` in every endpoint, e.g. the URL of
+            a local :py:class:`~instahashtag.mock.MockServer`. Defaults to ``None``.
+    """
+
+    def __init__(
+        self,
+        aio: bool = False,
+        transport: type = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 15.0,
+        cache: Any = None,
+        coalesce: bool = False,
+        limiter: Any = None,
+        concurrency_limiter: Any = None,
+        timeout: Union[float, Tuple[float, float], None] = TIMEOUT,
+        retry: Any = None,
+        breaker: Any = None,
+        decoder: Union[str, Callable, None] = None,
+        hooks: Any = None,
+        base_url: str = None,
+    ) -> None:
+        self.transport = transport or (Aiohttp if aio else Requests)
+        self.aio = asyncio.iscoroutinefunction(self.transport.call)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.cache = cache
+        self.flight = SingleFlight() if coalesce else None
+        self.limiter = limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.timeout = timeout
+        self.retry = retry
+        self.breaker = breaker
+        self.loads = decoder_module.get(decoder)
+        self.hooks = hooks
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._session = None
+
+    @property
+    def session(self) -> Any:
+        """Pooled session of the transport, lazily opened on first use."""
+        if self._session is None:
+            self._session = self.transport.open_session(self)
+        return self._session
+
+    def url(self, endpoint: str) -> str:
+        """Returns ``endpoint`` with its host replaced by :py:attr:`base_url`, if one was given."""
+        if self.base_url is not None and endpoint.startswith(endpoints.host):
+            return self.base_url + endpoint[len(endpoints.host):]
+        return endpoint
+
+    def tag(self, hashtag: str) -> Any:
+        """Sends an API request to the ``tag`` endpoint through the pooled session."""
+        return self.transport.tag(hashtag=hashtag, client=self)
+
+    def graph(self, hashtag: str) -> Any:
+        """Sends an API request to the ``graph`` endpoint through the pooled session."""
+        return self.transport.graph(hashtag=hashtag, client=self)
+
+    def maps(self, x1: float, y1: float, x2: float, y2: float, zoom: int) -> Any:
+        """Sends an API request to the ``maps`` endpoint through the pooled session."""
+        return self.transport.maps(x1=x1, y1=y1, x2=x2, y2=y2, zoom=zoom, client=self)
+
+    def fork(self) -> "Client":
+        """Returns a copy of the client with its own (lazily opened) session.
+
+        Everything else, such as the cache, limiters, retry policy, circuit breaker and hooks, is shared
+        with the original client. Used to give every worker thread its own ``requests.Session``,
+        which is not safe to share between threads (see :py:func:`~instahashtag.api.tag_threaded`).
+        """
+        clone = copy.copy(self)
+        clone._session = None
+        return clone
+
+    def close(self) -> None:
+        """Closes the pooled session of a synchronous client."""
+        session, self._session = self._session, None
+        if session is not None and hasattr(session, "close"):
+            session.close()
+
+    async def aclose(self) -> None:
+        """Closes the pooled session of an asynchronous client."""
+        session, self._session = self._session, None
+        if session is not None and hasattr(session, "close"):
+            result = session.close()
+            if inspect.isawaitable(result):
+                await result
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
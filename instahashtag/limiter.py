@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+from typing import Tuple
+
+
+#: Errors treated as overloads when no transport-specific ``retryable`` tuple is given.
+TRANSPORT_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+
+def is_overload(error: BaseException, retryable: Tuple[type, ...] = None) -> bool:
+    """Returns whether ``error`` signals an overloaded upstream.
+
+    Errors carrying an HTTP ``status`` are overloads when the status is ``429`` or ``5xx``. Errors
+    without one are overloads only if they are transport errors (timeouts, refused or dropped
+    connections), i.e. instances of ``retryable`` (defaults to :py:data:`TRANSPORT_ERRORS`).
+    Cancellations, undecodable replies and other client-side errors are not.
+    """
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, retryable or TRANSPORT_ERRORS)
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter.
+
+    Tokens are refilled continuously at ``rate`` per second up to ``burst``, and each request takes
+    one. When the bucket is empty the caller waits until its token is refilled. The same bucket may
+    be shared by synchronous and asynchronous clients, pacing all of them together.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.limiter import TokenBucket
+
+        bucket = TokenBucket(rate=20, burst=40)
+
+        sync_client = Client(limiter=bucket)
+        async_client = Client(aio=True, limiter=bucket)
+
+    Args:
+        rate: Number of requests allowed per second.
+        burst: Maximum number of requests allowed at once. Defaults to ``rate``.
+    """
+
+    def __init__(self, rate: float, burst: float = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive, got {}".format(rate))
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.tokens = self.burst
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, returning the number of seconds to wait before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    def acquire(self) -> None:
+        """Blocks the calling thread until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Suspends the calling coroutine until a token is available."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def state(self) -> dict:
+        """Returns the current state of the bucket."""
+        with self._lock:
+            tokens = min(self.burst, self.tokens + (time.monotonic() - self._updated) * self.rate)
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": tokens,
+                "waited": self.waited,
+            }
+
+
+class AdaptiveConcurrency:
+    """Adaptive (AIMD) limit on the number of in-flight requests.
+
+    Every healthy response grows the limit additively by ``increase / limit`` (so roughly by
+    ``increase`` per round of ``limit`` requests), while an overload (``429``, ``5xx``, a timeout,
+    or a latency above ``latency_target``) multiplies it by ``decrease``. Backing off happens at
+    most once per round, so a burst of failures from the same round only shrinks the limit once.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.limiter import AdaptiveConcurrency
+
+        adaptive = AdaptiveConcurrency(initial=8, maximum=128, latency_target=2.0)
+
+        async with Client(aio=True, concurrency_limiter=adaptive) as client:
+            ...
+
+        adaptive.state() # >>> {'limit': 23.4, 'in_flight': 0, ...}
+
+    Args:
+        initial: Initial limit. Defaults to ``4``.
+        minimum: Lowest limit backing off may reach. Defaults to ``1``.
+        maximum: Highest limit growing may reach. Defaults to ``256``.
+        increase: Additive increase per round of healthy requests. Defaults to ``1``.
+        decrease: Multiplicative decrease on overload. Defaults to ``0.5``.
+        latency_target: Latency (in seconds) above which a response counts as an overload.
+            ``None`` only considers errors. Defaults to ``None``.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        minimum: float = 1,
+        maximum: float = 256,
+        increase: float = 1,
+        decrease: float = 0.5,
+        latency_target: float = None,
+    ) -> None:
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1, got {}".format(decrease))
+
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.successes = 0
+        self.overloads = 0
+        self.backoffs = 0
+        self._since_backoff = self.limit
+        self._cond = threading.Condition()
+        self._waiters = []
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < max(int(self.limit), 1):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        """Blocks the calling thread until a slot is available."""
+        with self._cond:
+            while not self._try_acquire():
+                self._cond.wait()
+
+    async def aacquire(self) -> None:
+        """Suspends the calling coroutine until a slot is available."""
+        loop = asyncio.get_event_loop()
+        while True:
+            with self._cond:
+                if self._try_acquire():
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, latency: float, error: BaseException = None, retryable: Tuple[type, ...] = None) -> None:
+        """Frees a slot and feeds back the outcome of the request.
+
+        Only overloads (see :py:func:`is_overload`) shrink the limit. Other errors, such as a
+        cancelled request or an undecodable reply, free the slot without any feedback.
+
+        Args:
+            latency: Seconds the request took.
+            error: Exception raised by the request, if any.
+            retryable: Transport errors counted as overloads, see :py:func:`is_overload`.
+        """
+        with self._cond:
+            self.in_flight -= 1
+
+            overloaded = error is not None and is_overload(error, retryable)
+            if not overloaded and error is None and self.latency_target is not None:
+                overloaded = latency > self.latency_target
+            if overloaded or error is None:
+                self._since_backoff += 1
+
+            if overloaded:
+                self.overloads += 1
+                if self._since_backoff >= self.limit:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self.backoffs += 1
+                    self._since_backoff = 0
+            elif error is None:
+                self.successes += 1
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, []
+
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def state(self) -> dict:
+        """Returns the current state of the controller."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "successes": self.successes,
+                "overloads": self.overloads,
+                "backoffs": self.backoffs,
+            }
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,158 @@
+import bisect
+import threading
+from typing import Sequence
+
+from .hooks import Hooks
+
+#: Default upper bounds (in seconds) of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds, as used by Prometheus.
+
+    Args:
+        buckets: Sorted upper bounds of the buckets. An implicit ``+Inf`` bucket is appended.
+    """
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Records a single value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        """Returns the cumulative bucket counts (keyed by upper bound), sum and count."""
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative[bound] = total
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class Metrics:
+    """Built-in metrics collector, fed by :py:class:`~instahashtag.hooks.Hooks`.
+
+    Records, per endpoint kind (``"tag"``, ``"graph"``, ``"maps"``), a latency histogram, a parse
+    time histogram, the number of requests, errors, retries and cache hits, and the number of bytes
+    received.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.hooks import Hooks
+        from instahashtag.metrics import Metrics
+
+        hooks = Hooks()
+        metrics = Metrics().register(hooks)
+
+        with Client(hooks=hooks) as client:
+            ...
+
+        metrics.to_dict()
+        print(metrics.to_prometheus())
+
+    Args:
+        buckets: Upper bounds (in seconds) of the histogram buckets. Defaults to :py:data:`BUCKETS`.
+        prefix: Prefix of the Prometheus metric names. Defaults to ``"instahashtag"``.
+    """
+
+    COUNTERS = ("requests", "errors", "retries", "cache_hits", "bytes")
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS, prefix: str = "instahashtag") -> None:
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def register(self, hooks: Hooks) -> "Metrics":
+        """Registers the collector's callbacks on ``hooks``, returning the collector itself."""
+        hooks.register("after_response", self._after_response)
+        hooks.register("on_error", self._on_error)
+        hooks.register("on_parse", self._on_parse)
+        hooks.register("on_retry", self._on_retry)
+        hooks.register("on_cache_hit", self._on_cache_hit)
+        return self
+
+    def _endpoint(self, kind: str) -> dict:
+        endpoint = self._endpoints.get(kind)
+        if endpoint is None:
+            endpoint = self._endpoints[kind] = dict.fromkeys(self.COUNTERS, 0)
+            endpoint["latency"] = Histogram(self.buckets)
+            endpoint["parse"] = Histogram(self.buckets)
+        return endpoint
+
+    def _after_response(self, request, latency: float) -> None:
+        with self._lock:
+            endpoint = self._endpoint(request.kind)
+            endpoint["requests"] += 1
+            endpoint["latency"].observe(latency)
+            body = request.body
+            if body is not None:
+                endpoint["bytes"] += len(body.encode("utf-8") if isinstance(body, str) else body)
+
+    def _on_error(self, request, error: BaseException, latency: float) -> None:
+        with self._lock:
+            endpoint = self._endpoint(request.kind)
+            endpoint["requests"] += 1
+            endpoint["errors"] += 1
+            endpoint["latency"].observe(latency)
+
+    def _on_parse(self, request, seconds: float) -> None:
+        with self._lock:
+            self._endpoint(request.kind)["parse"].observe(seconds)
+
+    def _on_retry(self, request, error: BaseException, attempt: int, delay: float) -> None:
+        with self._lock:
+            self._endpoint(request.kind)["retries"] += 1
+
+    def _on_cache_hit(self, request) -> None:
+        with self._lock:
+            self._endpoint(request.kind)["cache_hits"] += 1
+
+    def to_dict(self) -> dict:
+        """Returns every metric as a dictionary keyed by endpoint kind."""
+        with self._lock:
+            return {
+                kind: {
+                    key: value.to_dict() if isinstance(value, Histogram) else value
+                    for key, value in endpoint.items()
+                }
+                for kind, endpoint in self._endpoints.items()
+            }
+
+    def to_prometheus(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        metrics = self.to_dict()
+
+        for counter, name in (
+            ("requests", "requests_total"),
+            ("errors", "errors_total"),
+            ("retries", "retries_total"),
+            ("cache_hits", "cache_hits_total"),
+            ("bytes", "received_bytes_total"),
+        ):
+            name = "{}_{}".format(self.prefix, name)
+            lines.append("# TYPE {} counter".format(name))
+            for kind, endpoint in sorted(metrics.items()):
+                lines.append('{}{{endpoint="{}"}} {}'.format(name, kind, endpoint[counter]))
+
+        for histogram, name in (("latency", "request_seconds"), ("parse", "parse_seconds")):
+            name = "{}_{}".format(self.prefix, name)
+            lines.append("# TYPE {} histogram".format(name))
+            for kind, endpoint in sorted(metrics.items()):
+                values = endpoint[histogram]
+                for bound, count in values["buckets"].items():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append('{}_bucket{{endpoint="{}",le="{}"}} {}'.format(name, kind, le, count))
+                lines.append('{}_sum{{endpoint="{}"}} {}'.format(name, kind, values["sum"]))
+                lines.append('{}_count{{endpoint="{}"}} {}'.format(name, kind, values["count"]))
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import random
+import threading
+from typing import Union
+
+from aiohttp import web
+
+
+def tag(hashtag: str = "miami", results: int = 100, seed: int = 0) -> dict:
+    """Returns a synthetic reply of the ``tag`` endpoint with ``results`` related hashtags."""
+    rand = random.Random(seed)
+    return {
+        "geo": [rand.uniform(-90, 90), rand.uniform(-180, 180)],
+        "rank": rand.randint(0, 100),
+        "results": [
+            {
+                "absRelevance": rand.random(),
+                "geo": [rand.uniform(-90, 90), rand.uniform(-180, 180)],
+                "media_count": rand.randint(0, 10 ** 7),
+                "rank": rand.randint(0, 100),
+                "relevance": rand.randint(0, 100),
+                "tag": "{}{}".format(hashtag, i),
+            }
+            for i in range(results)
+        ],
+        "tag": hashtag,
+        "tagExists": True,
+    }
+
+
+def graph(hashtag: str = "miami", nodes: int = 50, edges: int = 150, seed: int = 0) -> dict:
+    """Returns a synthetic reply of the ``graph`` endpoint with ``nodes`` nodes and ``edges`` edges."""
+    rand = random.Random(seed)
+    names = [hashtag] + ["{}{}".format(hashtag, i) for i in range(1, nodes)]
+    pairs = [rand.sample(names, 2) for _ in range(edges)]
+    return {
+        "edges": [
+            {"a": a, "b": b, "id": "{}#{}".format(a, b), "weight": rand.random()}
+            for a, b in pairs
+        ],
+        "exists": True,
+        "nodes": [
+            {
+                "id": name,
+                "relevance": rand.random(),
+                "weight": rand.random(),
+                "x": rand.random(),
+                "y": rand.random(),
+            }
+            for name in names
+        ],
+        "query": hashtag,
+        "root_pos": [rand.random(), rand.random()],
+    }
+
+
+def maps(count: int = 100, seed: int = 0) -> dict:
+    """Returns a synthetic reply of the ``maps`` endpoint with ``count`` hashtags."""
+    rand = random.Random(seed)
+    return {
+        "count": count,
+        "tags": [
+            {
+                "centroid": [rand.uniform(25.7, 25.9), rand.uniform(-80.5, -79.8)],
+                "tag": "place{}".format(i),
+                "weight": rand.randint(1, 100),
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def encode(payload: dict) -> bytes:
+    """Encodes a payload into the raw body the API would reply with."""
+    return json.dumps(payload).encode("utf-8")
+
+
+class MockServer:
+    """Local stand-in for the DisplayPurposes API, serving synthetic replies.
+
+    Mimics the ``/tag/``, ``/graph/`` and ``/local/`` endpoints with configurable latency, error rate
+    and payload sizes, so the client can be tested and benchmarked without network access. Pass its
+    :py:attr:`url` as the ``base_url`` of a :py:class:`~instahashtag.http.Client`.
+
+    .. code-block:: python
+
+        from instahashtag import Client, Tag
+        from instahashtag.mock import MockServer
+
+        async def main():
+            async with MockServer(latency=0.05, error_rate=0.01) as server:
+                async with Client(aio=True, base_url=server.url) as client:
+                    tag = Tag("miami", client=client)
+                    await tag.call()
+
+        def io():
+            with MockServer(results=500).background() as server:
+                with Client(base_url=server.url) as client:
+                    tag = Tag("miami", client=client)
+
+    Args:
+        latency: Seconds each reply is delayed by. Defaults to ``0``.
+        error_rate: Probability (``0`` to ``1``) of replying with ``error_status``. Defaults to ``0``.
+        error_status: HTTP status of the failed replies. Defaults to ``503``.
+        results: Number of related hashtags per ``tag`` reply. Defaults to ``100``.
+        nodes: Number of nodes per ``graph`` reply. Defaults to ``50``.
+        edges: Number of edges per ``graph`` reply. Defaults to ``150``.
+        tags: Number of hashtags per ``maps`` reply. Defaults to ``100``.
+        host: Interface to listen on. Defaults to ``"127.0.0.1"``.
+        port: Port to listen on; ``0`` picks a free one. Defaults to ``0``.
+        seed: Seed of the random error and payload generation. Defaults to ``0``.
+
+    Attributes:
+        requests: Number of requests received, by endpoint (``"tag"``, ``"graph"``, ``"maps"``).
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        results: int = 100,
+        nodes: int = 50,
+        edges: int = 150,
+        tags: int = 100,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.results = results
+        self.nodes = nodes
+        self.edges = edges
+        self.tags = tags
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.requests = {"tag": 0, "graph": 0, "maps": 0}
+        self.url = None
+        self._random = random.Random(seed)
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/tag/{hashtag}", self._tag)
+        self.app.router.add_get("/graph/{hashtag}", self._graph)
+        self.app.router.add_get("/local/", self._maps)
+
+    async def _reply(self, kind: str, payload: Union[dict, None]) -> web.Response:
+        self.requests[kind] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=self.error_status, text="Service Unavailable")
+        return web.Response(body=encode(payload), content_type="application/json")
+
+    async def _tag(self, request: web.Request) -> web.Response:
+        hashtag = request.match_info["hashtag"]
+        return await self._reply("tag", tag(hashtag, results=self.results, seed=self.seed))
+
+    async def _graph(self, request: web.Request) -> web.Response:
+        hashtag = request.match_info["hashtag"]
+        return await self._reply(
+            "graph", graph(hashtag, nodes=self.nodes, edges=self.edges, seed=self.seed)
+        )
+
+    async def _maps(self, request: web.Request) -> web.Response:
+        return await self._reply("maps", maps(count=self.tags, seed=self.seed))
+
+    async def start(self) -> str:
+        """Starts listening, returning the base URL of the server."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.url = "http://{}:{}".format(self.host, port)
+        return self.url
+
+    async def close(self) -> None:
+        """Stops the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def background(self) -> "_Background":
+        """Returns a context manager running the server on an event loop in a background thread.
+
+        Useful to serve synchronous clients, which would otherwise block the server's loop.
+        """
+        return _Background(self)
+
+
+class _Background:
+    """Runs a :py:class:`MockServer` on its own event loop in a daemon thread."""
+
+    def __init__(self, server: MockServer) -> None:
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> MockServer:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self.server
+
+    def __exit__(self, *exc) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -0,0 +1,296 @@
+import array
+import heapq
+import sys
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from .wrapper.graph import Graph
+
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+
+class HashtagGraph:
+    """Merged, in-memory index of many ``graph`` responses.
+
+    Every hashtag gets an integer id, and the (undirected) edges are stored as a compressed sparse
+    row (CSR) adjacency: ``indptr[i]:indptr[i + 1]`` slices ``indices`` and ``weights`` into the
+    neighbours of node ``i``. Node lookups are a single dictionary access, and neighbour iteration,
+    degrees, shortest paths and PageRank run over flat arrays (NumPy arrays if installed, otherwise
+    ``array.array``) instead of per-edge objects.
+
+    An edge seen in several responses is kept once, with its highest weight. The CSR arrays are
+    rebuilt lazily on the first query after new graphs were added.
+
+    .. code-block:: python
+
+        import heapq
+        from instahashtag import Graph
+        from instahashtag.network import HashtagGraph
+
+        network = HashtagGraph()
+        async for graph in Graph.many(["miami", "travel", "beach"]):
+            if graph.error is None:
+                network.add(graph)
+
+        list(network.neighbours("miami")) # >>> [("miamibeach", 0.7), ...]
+        network.shortest_path("miami", "travel") # >>> ["miami", "beach", "travel"]
+
+        scores = network.pagerank(personalization={"miami": 1.0})
+        heapq.nlargest(10, scores, key=scores.get)
+
+    Args:
+        graphs: Optional iterable of :py:class:`~instahashtag.wrapper.Graph` objects (or their raw
+            ``data`` dictionaries) to add straight away.
+    """
+
+    def __init__(self, graphs: Iterable[Union[Graph, Mapping]] = ()) -> None:
+        self.names = []
+        self.index = {}
+        self._edges = {}
+        self._csr = None
+
+        for graph in graphs:
+            self.add(graph)
+
+    def node(self, hashtag: str) -> int:
+        """Returns the integer id of ``hashtag``, adding it to the index if missing."""
+        i = self.index.get(hashtag)
+        if i is None:
+            i = self.index[hashtag] = len(self.names)
+            self.names.append(sys.intern(hashtag))
+        return i
+
+    def add(self, graph: Union[Graph, Mapping]) -> None:
+        """Merges a :py:class:`~instahashtag.wrapper.Graph` (or its raw ``data`` dictionary) into the index.
+
+        Hashtags only referenced by an edge are added as nodes too. Self loops are ignored.
+        """
+        data = graph.data if isinstance(graph, Graph) else graph
+        data = data or {}
+
+        for node in data.get("nodes") or []:
+            self.node(node["id"])
+
+        edges = self._edges
+        for edge in data.get("edges") or []:
+            a, b = self.node(edge["a"]), self.node(edge["b"])
+            if a == b:
+                continue
+
+            key = (a << _SHIFT) | b if a < b else (b << _SHIFT) | a
+            weight = edge["weight"]
+            if weight > edges.get(key, float("-inf")):
+                edges[key] = weight
+
+        self._csr = None
+
+    def csr(self) -> Tuple[Any, Any, Any]:
+        """Returns the ``(indptr, indices, weights)`` adjacency arrays, building them if needed."""
+        if self._csr is None:
+            self._csr = self._build_numpy() if numpy is not None else self._build_python()
+        return self._csr
+
+    def _build_numpy(self) -> Tuple[Any, Any, Any]:
+        count, size = len(self._edges), len(self.names)
+        keys = numpy.fromiter(self._edges.keys(), dtype="q", count=count)
+        weights = numpy.fromiter(self._edges.values(), dtype="d", count=count)
+
+        a, b = keys >> _SHIFT, keys & _MASK
+        src = numpy.concatenate((a, b))
+        order = numpy.argsort(src, kind="stable")
+
+        indptr = numpy.zeros(size + 1, dtype="q")
+        numpy.cumsum(numpy.bincount(src, minlength=size), out=indptr[1:])
+        return indptr, numpy.concatenate((b, a))[order], numpy.concatenate((weights, weights))[order]
+
+    def _build_python(self) -> Tuple[Any, Any, Any]:
+        rows = [[] for _ in self.names]
+        for key, weight in self._edges.items():
+            a, b = key >> _SHIFT, key & _MASK
+            rows[a].append((b, weight))
+            rows[b].append((a, weight))
+
+        indptr, indices, weights = array.array("q", [0]), array.array("q"), array.array("d")
+        for row in rows:
+            row.sort()
+            indices.extend(i for i, _ in row)
+            weights.extend(w for _, w in row)
+            indptr.append(len(indices))
+        return indptr, indices, weights
+
+    def _row(self, i: int) -> Tuple[Any, Any]:
+        indptr, indices, weights = self.csr()
+        start, end = int(indptr[i]), int(indptr[i + 1])
+        return indices[start:end], weights[start:end]
+
+    def neighbours(self, hashtag: str) -> Iterator[Tuple[str, float]]:
+        """Iterates over the ``(hashtag, weight)`` neighbours of ``hashtag``.
+
+        Raises:
+            KeyError: ``hashtag`` is not in the index.
+        """
+        indices, weights = self._row(self.index[hashtag])
+        names = self.names
+        return ((names[j], float(w)) for j, w in zip(indices, weights))
+
+    def degree(self, hashtag: str, weighted: bool = True) -> float:
+        """Returns the sum of the edge weights of ``hashtag``, or its number of neighbours if not ``weighted``.
+
+        Raises:
+            KeyError: ``hashtag`` is not in the index.
+        """
+        indices, weights = self._row(self.index[hashtag])
+        return float(sum(weights)) if weighted else len(indices)
+
+    def shortest_path(self, source: str, target: str, weighted: bool = False) -> Optional[List[str]]:
+        """Returns the shortest path from ``source`` to ``target`` as a list of hashtags, or ``None``.
+
+        Unweighted paths minimise the number of hops (breadth-first search). Weighted paths use
+        Dijkstra's algorithm with a cost of ``1 / weight`` per edge, so strongly related hashtags
+        are "closer".
+
+        Raises:
+            KeyError: ``source`` or ``target`` is not in the index.
+        """
+        start, goal = self.index[source], self.index[target]
+        previous = {start: None}
+
+        if not weighted:
+            queue = deque((start,))
+            while queue and goal not in previous:
+                i = queue.popleft()
+                for j in self._row(i)[0]:
+                    j = int(j)
+                    if j not in previous:
+                        previous[j] = i
+                        queue.append(j)
+        else:
+            distance = {start: 0.0}
+            heap = [(0.0, start)]
+            while heap:
+                cost, i = heapq.heappop(heap)
+                if i == goal:
+                    break
+                if cost > distance[i]:
+                    continue
+                for j, w in zip(*self._row(i)):
+                    if w <= 0:
+                        continue
+                    j, total = int(j), cost + 1.0 / float(w)
+                    if total < distance.get(j, float("inf")):
+                        distance[j] = total
+                        previous[j] = i
+                        heapq.heappush(heap, (total, j))
+
+        if goal not in previous:
+            return None
+
+        path = []
+        node = goal
+        while node is not None:
+            path.append(self.names[node])
+            node = previous[node]
+        return path[::-1]
+
+    def pagerank(
+        self,
+        alpha: float = 0.85,
+        personalization: Mapping[str, float] = None,
+        tol: float = 1.0e-6,
+        max_iter: int = 100,
+    ) -> Dict[str, float]:
+        """Computes the (weighted) PageRank of every hashtag, returning a dictionary of scores summing to one.
+
+        Transitions are proportional to the edge weights. With ``personalization``, both the teleport
+        and the dangling-node mass go to the given hashtags (proportionally to their values) instead
+        of uniformly, ranking the network relative to them.
+
+        Args:
+            alpha: Damping factor. Defaults to ``0.85``.
+            personalization: Optional mapping of hashtag to teleport weight. Unknown hashtags are ignored.
+            tol: Convergence threshold on the L1 change between iterations. Defaults to ``1e-6``.
+            max_iter: Maximum number of iterations. Defaults to ``100``.
+        """
+        size = len(self.names)
+        if not size:
+            return {}
+
+        teleport = [0.0] * size
+        if personalization:
+            for hashtag, value in personalization.items():
+                if hashtag in self.index:
+                    teleport[self.index[hashtag]] = float(value)
+        total = sum(teleport)
+        teleport = [v / total for v in teleport] if total > 0 else [1.0 / size] * size
+
+        if numpy is not None:
+            ranks = self._pagerank_numpy(numpy.array(teleport), alpha, tol, max_iter).tolist()
+        else:
+            ranks = self._pagerank_python(teleport, alpha, tol, max_iter)
+        return dict(zip(self.names, ranks))
+
+    def _pagerank_numpy(self, teleport: Any, alpha: float, tol: float, max_iter: int) -> Any:
+        indptr, indices, weights = self.csr()
+        size = len(teleport)
+        src = numpy.repeat(numpy.arange(size), numpy.diff(indptr))
+        out = numpy.bincount(src, weights=weights, minlength=size)
+        dangling = out <= 0
+        share = weights / numpy.where(dangling, 1.0, out)[src]
+
+        ranks = teleport.copy()
+        for _ in range(max_iter):
+            spread = numpy.bincount(indices, weights=ranks[src] * share, minlength=size)
+            updated = alpha * spread + (alpha * ranks[dangling].sum() + 1.0 - alpha) * teleport
+            done = numpy.abs(updated - ranks).sum() < tol
+            ranks = updated
+            if done:
+                break
+        return ranks
+
+    def _pagerank_python(self, teleport: List[float], alpha: float, tol: float, max_iter: int) -> List[float]:
+        indptr, indices, weights = self.csr()
+        size = len(teleport)
+        out = [sum(weights[indptr[i]:indptr[i + 1]]) for i in range(size)]
+
+        ranks = list(teleport)
+        for _ in range(max_iter):
+            spread = [0.0] * size
+            lost = 0.0
+            for i in range(size):
+                if out[i] <= 0:
+                    lost += ranks[i]
+                    continue
+                scale = ranks[i] / out[i]
+                for k in range(indptr[i], indptr[i + 1]):
+                    spread[indices[k]] += scale * weights[k]
+
+            base = alpha * lost + 1.0 - alpha
+            updated = [alpha * s + base * t for s, t in zip(spread, teleport)]
+            done = sum(abs(u - r) for u, r in zip(updated, ranks)) < tol
+            ranks = updated
+            if done:
+                break
+        return ranks
+
+    @property
+    def edge_count(self) -> int:
+        """Number of unique (undirected) edges."""
+        return len(self._edges)
+
+    def __contains__(self, hashtag: str) -> bool:
+        return hashtag in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return "HashtagGraph(nodes={}, edges={})".format(len(self.names), len(self._edges))
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.__repr__()
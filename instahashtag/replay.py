@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from typing import Iterator, Union
+
+from .http import Base
+
+
+class MissingRecording(KeyError):
+    """Raised by a replay transport when the cassette holds no recording of the endpoint."""
+
+
+class Cassette:
+    """Store of recorded API replies, keyed by endpoint URL.
+
+    A cassette is a single JSON file mapping every endpoint URL to its raw reply body, which is
+    loaded in memory when the cassette is opened. New recordings are only written to the file on
+    :py:func:`save`.
+
+    .. code-block:: python
+
+        from instahashtag import Client, Tag
+        from instahashtag.http import Requests
+        from instahashtag.replay import Cassette, Replay, record
+
+        cassette = Cassette("fixtures/miami.json")
+
+        # Record once, against the real API...
+        with Client(transport=record(Requests, cassette)) as client:
+            Tag("miami", client=client)
+        cassette.save()
+
+        # ...and replay offline afterwards.
+        with Client(transport=Replay.using(cassette)) as client:
+            tag = Tag("miami", client=client)
+
+    Args:
+        path: Path to the cassette file. It does not need to exist until :py:func:`save` is called.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._bodies = json.load(f)
+        else:
+            self._bodies = {}
+
+    def get(self, endpoint: str) -> bytes:
+        """Returns the recorded body of ``endpoint``, raising :py:class:`MissingRecording` if there is none."""
+        try:
+            return self._bodies[endpoint].encode("utf-8")
+        except KeyError:
+            raise MissingRecording(endpoint) from None
+
+    def put(self, endpoint: str, body: Union[str, bytes]) -> None:
+        """Records ``body`` as the reply of ``endpoint``."""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        with self._lock:
+            self._bodies[endpoint] = body
+
+    def save(self) -> None:
+        """Writes every recording to the cassette file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            tmp = "{}.tmp".format(self.path)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._bodies, f, sort_keys=True, indent=0)
+            os.replace(tmp, self.path)
+
+    def __contains__(self, endpoint: str) -> bool:
+        return endpoint in self._bodies
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._bodies))
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+class Replay(Base):
+    """Transport that serves replies from a :py:class:`Cassette` instead of the network.
+
+    Use :py:func:`using` to bind it to a cassette. See :py:class:`AsyncReplay` for asynchronous clients.
+    """
+
+    cassette = None
+
+    @classmethod
+    def using(cls, cassette: Cassette) -> type:
+        """Returns a subclass of the transport bound to ``cassette``."""
+        return type(cls.__name__, (cls,), {"cassette": cassette})
+
+    def call(self):
+        return self.process(self.cassette.get(self.endpoint))
+
+
+class AsyncReplay(Replay):
+    """Asynchronous version of :py:class:`Replay`."""
+
+    async def call(self):
+        return self.process(self.cassette.get(self.endpoint))
+
+
+def record(transport: type, cassette: Cassette) -> type:
+    """Returns a subclass of ``transport`` that records every reply it processes into ``cassette``.
+
+    Works with both synchronous and asynchronous transports. Recordings are kept in memory until
+    :py:func:`Cassette.save` is called.
+    """
+
+    def process(self, resp):
+        data = super(recording, self).process(resp)
+        cassette.put(self.endpoint, resp)
+        return data
+
+    recording = type(transport.__name__, (transport,), {"process": process})
+    return recording
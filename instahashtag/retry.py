@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from typing import Iterable, Tuple
+
+from .limiter import is_overload
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the :py:class:`CircuitBreaker` is open."""
+
+
+class Retry:
+    """Retry policy with exponential backoff and jitter for the idempotent API requests.
+
+    A request is retried when it fails with one of the transport's
+    :py:attr:`~instahashtag.http.Base.retryable` errors (timeouts, dropped connections), or with an
+    :py:class:`~instahashtag.http.HTTPError` whose status is in ``statuses``. The delay before the
+    ``n``-th retry is ``backoff * 2 ** n`` capped at ``max_backoff``, and with ``jitter`` a random
+    value between zero and that delay is used instead ("full jitter"), spreading out retries of
+    concurrent callers.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.retry import Retry
+
+        with Client(retry=Retry(attempts=5, backoff=0.25), timeout=(5, 20)) as client:
+            ...
+
+    Args:
+        attempts: Maximum number of attempts, including the first one. Defaults to ``3``.
+        backoff: Base delay in seconds. Defaults to ``0.5``.
+        max_backoff: Maximum delay in seconds. Defaults to ``30``.
+        jitter: If set to ``True`` randomizes the delays. Defaults to ``True``.
+        statuses: HTTP statuses that are retried. Defaults to ``429`` and the transient ``5xx``.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1, got {}".format(attempts))
+
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, error: BaseException, attempt: int, retryable: Tuple[type, ...]) -> bool:
+        """Returns whether the ``attempt``-th attempt (starting at ``0``) failing with ``error`` is retried."""
+        if attempt + 1 >= self.attempts:
+            return False
+
+        status = getattr(error, "status", None)
+        if status is not None:
+            return status in self.statuses
+        return isinstance(error, retryable)
+
+    def delay(self, attempt: int) -> float:
+        """Returns the number of seconds to wait after the ``attempt``-th attempt (starting at ``0``)."""
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+
+class CircuitBreaker:
+    """Circuit breaker that fails fast while the upstream is down.
+
+    The breaker starts ``"closed"``, letting every request through. After ``threshold`` consecutive
+    overloads (``429``, ``5xx``, timeouts and connection errors) it becomes ``"open"``, and requests
+    immediately raise :py:class:`CircuitOpenError` without touching the network. Once
+    ``reset_timeout`` seconds have passed it becomes ``"half-open"``: a single trial request is let
+    through, closing the breaker on success or re-opening it on failure.
+
+    Args:
+        threshold: Consecutive overloads that open the breaker. Defaults to ``5``.
+        reset_timeout: Seconds the breaker stays open before a trial request. Defaults to ``30``.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before(self) -> None:
+        """Checks whether a request may be sent, raising :py:class:`CircuitOpenError` if not."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._trial = False
+
+            if self.state == "open" or (self.state == "half-open" and self._trial):
+                self.rejected += 1
+                raise CircuitOpenError("circuit breaker is open, failing fast")
+
+            if self.state == "half-open":
+                self._trial = True
+
+    def record(self, error: BaseException = None, retryable: Tuple[type, ...] = None) -> None:
+        """Records the outcome of a request that was let through by :py:func:`before`.
+
+        Overloads (see :py:func:`~instahashtag.limiter.is_overload`, given the transport's
+        ``retryable`` errors) count as failures, while a reply or an HTTP error with any other status
+        closes the breaker. Other errors, such as a cancelled request or an undecodable reply, are
+        neutral: they only free the trial of a half-open breaker.
+        """
+        with self._lock:
+            if error is not None and not is_overload(error, retryable):
+                if getattr(error, "status", None) is None:
+                    self._trial = False
+                    return
+                error = None
+
+            if error is None:
+                self.state = "closed"
+                self.failures = 0
+                return
+
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    """In-flight synchronous call shared by every thread asking for the same key."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into a single execution.
+
+    While a call for a given key is in-flight, every other caller asking for the same key waits
+    for (and receives) the result of that one call instead of running its own. Once the call
+    completes the key is forgotten, so later callers trigger a new execution. Exceptions are
+    propagated to every waiting caller.
+
+    .. code-block:: python
+
+        from instahashtag import Client, Tag
+
+        async def main():
+            async with Client(aio=True, coalesce=True) as client:
+                # A single upstream request is sent for all 100 objects.
+                tags = [Tag("miami", client=client) for _ in range(100)]
+                await asyncio.gather(*(tag.call() for tag in tags))
+
+    Attributes:
+        coalesced: Number of calls that were served by another caller's in-flight execution.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Runs ``fn()`` unless a call for ``key`` is already in-flight in another thread."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable]) -> Any:
+        """Awaits ``fn()`` unless a call for ``key`` is already in-flight on the running event loop.
+
+        The shared call runs as its own task, so cancelling one of the waiting callers does not
+        cancel the call for the others.
+        """
+        loop = asyncio.get_event_loop()
+        task_key = (id(loop), key)
+
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._calls) + len(self._tasks)
@@ -0,0 +1,266 @@
+import array
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from .wrapper.maps import Maps
+from .wrapper.tag import Tag
+
+#: Mean radius of the Earth, in kilometres.
+EARTH_RADIUS = 6371.0088
+
+#: Length of one degree of latitude, in kilometres.
+DEGREE = math.pi * EARTH_RADIUS / 180.0
+
+#: Number of candidates above which NumPy (if installed) filters them, instead of a Python loop.
+VECTORISE = 256
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Returns the great-circle distance between two ``(lat, lon)`` points, in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    """Uniform grid index over geotagged hashtags.
+
+    Points are bucketed into square cells of ``cell`` degrees, so bounding box, radius, polygon and
+    k-nearest queries only look at the points of the few cells around the query instead of every
+    point. Coordinates are kept in flat ``array.array`` columns, which NumPy (if installed) filters
+    vectorised when a query touches many points. Points can be added at any time, e.g. as new
+    :py:class:`~instahashtag.tiles.Tiles` complete.
+
+    .. code-block:: python
+
+        from instahashtag import Maps, Tag
+        from instahashtag.spatial import SpatialIndex
+
+        index = SpatialIndex()
+        index.add_maps(maps)  # MapsTag.centroid
+        index.add_tag(tag)    # TagResult.geo
+
+        index.bbox(-80.5, 25.7, -79.8, 25.9)        # >>> [MapTag(tag=..., ...), ...]
+        index.radius(25.77, -80.19, km=5)           # >>> [MapTag(tag=..., ...), ...]
+        index.nearest(25.77, -80.19, k=3)           # >>> [(0.42, MapTag(tag=..., ...)), ...]
+        index.polygon([(25.7, -80.5), (25.9, -80.5), (25.9, -79.8)])
+
+    Args:
+        cell: Side of the grid cells, in degrees. Cells holding a few hundred points each are a good
+            trade-off; ``0.05`` (about 5km) suits city-level data. Defaults to ``0.05``.
+        unique: If ``True``, adding a hashtag already in the index replaces (and moves) its point
+            instead of adding a second one. Defaults to ``True``.
+
+    Attributes:
+        items: List of the indexed items (:py:class:`~instahashtag.wrapper.maps.MapsTag`,
+            :py:class:`~instahashtag.wrapper.tag.TagResult`, or whatever was passed to :py:func:`add`).
+    """
+
+    def __init__(self, cell: float = 0.05, unique: bool = True) -> None:
+        self.cell = cell
+        self.unique = unique
+        self.items = []
+        self.lats = array.array("d")
+        self.lons = array.array("d")
+        self._cells = {}
+        self._ids = {}
+        self._extent = None
+
+    def _key(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def add(self, name: str, lat: float, lon: float, item: Any = None) -> None:
+        """Adds the point of hashtag ``name`` to the index, with ``item`` (defaults to ``name``) as its value."""
+        item = name if item is None else item
+        key = self._key(lat, lon)
+
+        i = self._ids.get(name) if self.unique else None
+        if i is None:
+            i = len(self.items)
+            self.items.append(item)
+            self.lats.append(lat)
+            self.lons.append(lon)
+            if self.unique:
+                self._ids[name] = i
+        else:
+            old = self._key(self.lats[i], self.lons[i])
+            if old != key:
+                self._cells[old].remove(i)
+                if not self._cells[old]:
+                    del self._cells[old]
+            self.items[i], self.lats[i], self.lons[i] = item, lat, lon
+            if old == key:
+                return
+
+        self._cells.setdefault(key, []).append(i)
+        if self._extent is None:
+            self._extent = [key[0], key[0], key[1], key[1]]
+        else:
+            extent = self._extent
+            extent[0], extent[1] = min(extent[0], key[0]), max(extent[1], key[0])
+            extent[2], extent[3] = min(extent[2], key[1]), max(extent[3], key[1])
+
+    def add_maps(self, maps: Maps) -> None:
+        """Adds every :py:class:`~instahashtag.wrapper.maps.MapsTag` of a ``maps`` reply, by its ``centroid``."""
+        for tag in maps.iter_tags():
+            if tag.centroid:
+                self.add(tag.tag, tag.centroid[0], tag.centroid[1], tag)
+
+    def add_tag(self, tag: Tag) -> None:
+        """Adds every geotagged :py:class:`~instahashtag.wrapper.tag.TagResult` of a ``tag`` reply, by its ``geo``."""
+        for result in tag.iter_results():
+            if result.geo:
+                self.add(result.tag, result.geo[0], result.geo[1], result)
+
+    def extend(self, replies: Iterable[Union[Maps, Tag]]) -> None:
+        """Adds many :py:class:`~instahashtag.wrapper.Maps` and :py:class:`~instahashtag.wrapper.Tag` replies."""
+        for reply in replies:
+            if getattr(reply, "error", None) is not None or reply.data is None:
+                continue
+            if isinstance(reply, Maps):
+                self.add_maps(reply)
+            else:
+                self.add_tag(reply)
+
+    def _candidates(self, lat1: float, lon1: float, lat2: float, lon2: float) -> List[int]:
+        (i1, j1), (i2, j2) = self._key(lat1, lon1), self._key(lat2, lon2)
+        cells = self._cells
+        if (i2 - i1 + 1) * (j2 - j1 + 1) > len(cells):
+            return [
+                k for (i, j), ids in cells.items() if i1 <= i <= i2 and j1 <= j <= j2 for k in ids
+            ]
+
+        candidates = []
+        for i in range(i1, i2 + 1):
+            for j in range(j1, j2 + 1):
+                ids = cells.get((i, j))
+                if ids:
+                    candidates.extend(ids)
+        return candidates
+
+    def _within(self, ids: List[int], lat1: float, lon1: float, lat2: float, lon2: float) -> List[int]:
+        if numpy is not None and len(ids) > VECTORISE:
+            ids = numpy.array(ids, dtype="q")
+            lats = numpy.frombuffer(self.lats, dtype="d")[ids]
+            lons = numpy.frombuffer(self.lons, dtype="d")[ids]
+            mask = (lats >= lat1) & (lats <= lat2) & (lons >= lon1) & (lons <= lon2)
+            return ids[mask].tolist()
+
+        lats, lons = self.lats, self.lons
+        return [i for i in ids if lat1 <= lats[i] <= lat2 and lon1 <= lons[i] <= lon2]
+
+    def _distances(self, ids: List[int], lat: float, lon: float) -> List[float]:
+        if numpy is not None and len(ids) > VECTORISE:
+            index = numpy.array(ids, dtype="q")
+            lats = numpy.radians(numpy.frombuffer(self.lats, dtype="d")[index])
+            lons = numpy.radians(numpy.frombuffer(self.lons, dtype="d")[index])
+            lat, lon = math.radians(lat), math.radians(lon)
+            a = numpy.sin((lats - lat) / 2) ** 2 + math.cos(lat) * numpy.cos(lats) * numpy.sin((lons - lon) / 2) ** 2
+            return (2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))).tolist()
+
+        lats, lons = self.lats, self.lons
+        return [haversine(lat, lon, lats[i], lons[i]) for i in ids]
+
+    def bbox(self, x1: float, y1: float, x2: float, y2: float) -> List[Any]:
+        """Returns the items inside a bounding box, given in the ``(x1, y1, x2, y2)`` order of the ``maps`` endpoint.
+
+        ``x`` is the longitude and ``y`` the latitude.
+        """
+        lon1, lon2 = sorted((x1, x2))
+        lat1, lat2 = sorted((y1, y2))
+        ids = self._within(self._candidates(lat1, lon1, lat2, lon2), lat1, lon1, lat2, lon2)
+        return [self.items[i] for i in ids]
+
+    def radius(self, lat: float, lon: float, km: float) -> List[Any]:
+        """Returns the items within ``km`` kilometres of ``(lat, lon)``, nearest first."""
+        return [item for _, item in self._around(lat, lon, km)]
+
+    def _around(self, lat: float, lon: float, km: float) -> List[Tuple[float, Any]]:
+        dlat = km / DEGREE
+        scale = math.cos(math.radians(min(90.0, abs(lat) + dlat)))
+        dlon = 180.0 if scale * DEGREE * 180.0 <= km else km / (DEGREE * scale)
+
+        ids = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        found = [(d, i) for d, i in zip(self._distances(ids, lat, lon), ids) if d <= km]
+        found.sort()
+        return [(d, self.items[i]) for d, i in found]
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """Returns the ``k`` items nearest to ``(lat, lon)`` as ``(kilometres, item)`` tuples, nearest first.
+
+        Rings of cells around the point are searched outwards, until no unvisited cell can hold a
+        point closer than the ``k``-th found so far.
+        """
+        if not self.items or k <= 0:
+            return []
+
+        ci, cj = self._key(lat, lon)
+        top, bottom, left, right = self._extent
+        reach = max(abs(ci - top), abs(ci - bottom), abs(cj - left), abs(cj - right))
+
+        best = []  # Max-heap of (-distance, id), holding the k nearest so far.
+        for ring in range(reach + 1):
+            if len(best) == k:
+                # Every point of this ring is at least (ring - 1) cells away along one of the axes.
+                gap = (ring - 1) * self.cell
+                scale = math.cos(math.radians(min(90.0, abs(lat) + (ring + 1) * self.cell)))
+                if gap * DEGREE * scale >= -best[0][0]:
+                    break
+
+            ids = []
+            for i in range(ci - ring, ci + ring + 1):
+                step = 1 if abs(i - ci) == ring else 2 * ring
+                for j in range(cj - ring, cj + ring + 1, max(step, 1)):
+                    ids.extend(self._cells.get((i, j), ()))
+
+            for d, i in zip(self._distances(ids, lat, lon), ids):
+                if len(best) < k:
+                    heapq.heappush(best, (-d, i))
+                elif d < -best[0][0]:
+                    heapq.heapreplace(best, (-d, i))
+
+        return [(-d, self.items[i]) for d, i in sorted(best, reverse=True)]
+
+    def polygon(self, points: Sequence[Tuple[float, float]]) -> List[Any]:
+        """Returns the items inside a polygon of ``(lat, lon)`` vertices (even-odd rule)."""
+        points = list(points)
+        lats = [p[0] for p in points]
+        lons = [p[1] for p in points]
+        candidates = self._within(
+            self._candidates(min(lats), min(lons), max(lats), max(lons)), min(lats), min(lons), max(lats), max(lons)
+        )
+
+        edges = list(zip(points, points[1:] + points[:1]))
+        inside = []
+        for i in candidates:
+            lat, lon = self.lats[i], self.lons[i]
+            hit = False
+            for (lat1, lon1), (lat2, lon2) in edges:
+                if (lat1 > lat) != (lat2 > lat) and lon < lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1):
+                    hit = not hit
+            if hit:
+                inside.append(self.items[i])
+        return inside
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the number of points and cells, and the largest cell size."""
+        return {
+            "points": len(self.items),
+            "cells": len(self._cells),
+            "max_cell": max((len(ids) for ids in self._cells.values()), default=0),
+        }
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return "SpatialIndex(cell={}, points={}, cells={})".format(self.cell, len(self.items), len(self._cells))
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.__repr__()
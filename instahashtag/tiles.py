@@ -0,0 +1,175 @@
+import math
+from typing import AsyncIterator, Dict, List, Tuple
+
+from .http import Client
+from .wrapper.maps import Maps, MapsTag
+
+#: Default upper bound of tiles a single :py:class:`Tiles` query may split into.
+MAX_TILES = 256
+
+
+def tile_size(zoom: int) -> float:
+    """Returns the side, in degrees, of a tile at ``zoom`` (``360 / 2 ** zoom``, as in web maps)."""
+    return 360.0 / (1 << int(zoom))
+
+
+def _span(low: float, high: float, size: float) -> range:
+    first = math.floor(low / size)
+    return range(first, max(math.ceil(high / size), first + 1))
+
+
+def grid(
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+    zoom: int,
+    max_tiles: int = MAX_TILES,
+) -> List[Tuple[float, float, float, float, int]]:
+    """Splits a bounding box into the ``(x1, y1, x2, y2, zoom)`` tiles covering it.
+
+    Tiles are aligned to a global grid of :py:func:`tile_size` degrees, so overlapping queries share
+    identical tiles (and therefore identical, cacheable requests).
+
+    .. code-block:: python
+
+        grid(-80.48, 25.75, -79.82, 25.85, zoom=12) # >>> [(-80.5078125, 25.6640625, ..., 12), ...]
+
+    Raises:
+        ValueError: The box would need more than ``max_tiles`` tiles; use a lower ``zoom``.
+    """
+    size = tile_size(zoom)
+    left, right = sorted((x1, x2))
+    bottom, top = sorted((y1, y2))
+
+    columns, rows = _span(left, right, size), _span(bottom, top, size)
+    if len(columns) * len(rows) > max_tiles:
+        raise ValueError(
+            "Bounding box needs {} tiles at zoom {} (max_tiles={})".format(len(columns) * len(rows), zoom, max_tiles)
+        )
+
+    return [(i * size, j * size, (i + 1) * size, (j + 1) * size, zoom) for j in rows for i in columns]
+
+
+class Tiles:
+    """Tiled, concurrent query of the ``maps`` endpoint over a large bounding box.
+
+    The API caps the number of hashtags returned per request, so big regions lose most of their
+    hashtags in a single :py:class:`~instahashtag.wrapper.Maps` query. Instead, the box is split into
+    a grid of tiles (see :py:func:`grid`) that are fetched concurrently, and their hashtags merged,
+    keeping the highest weight of every hashtag seen in several tiles.
+
+    Since tiles are aligned to a global grid, a :py:class:`~instahashtag.http.Client` with a cache
+    (see :py:mod:`instahashtag.cache`) serves already fetched tiles without any request, making panning
+    over a known area free.
+
+    .. code-block:: python
+
+        from instahashtag import Client
+        from instahashtag.cache import MemoryCache
+        from instahashtag.tiles import Tiles
+
+        async with Client(aio=True, cache=MemoryCache()) as client:
+            tiles = Tiles(-80.48, 25.75, -79.82, 25.85, zoom=12, client=client)
+
+            # Per-tile results as they complete...
+            async for maps in tiles:
+                print(maps.x1, maps.y1, maps.error or len(maps.tags))
+
+            # ...and the merged hashtags inside the bounding box.
+            tiles.tags # >>> [MapTag(tag=..., centroid=[..., ...], weight=...), ...]
+
+    Args:
+        x1: Top left x-coordinate corner of the map.
+        y1: Top left y-coordinate corner of the map.
+        x2: Bottom right x-coordinate corner of the map.
+        y2: Bottom right y-coordinate corner of the map.
+        zoom: Zoom factor, deciding the tile size.
+        concurrency: Maximum number of in-flight tile requests. Defaults to ``10``.
+        client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every tile.
+        max_tiles: Maximum number of tiles, see :py:func:`grid`. Defaults to :py:data:`MAX_TILES`.
+
+    Attributes:
+        tiles: List of ``(x1, y1, x2, y2, zoom)`` tiles covering the bounding box.
+        maps: List of the :py:class:`~instahashtag.wrapper.Maps` objects of the completed tiles.
+    """
+
+    def __init__(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        zoom: int,
+        concurrency: int = 10,
+        client: Client = None,
+        max_tiles: int = MAX_TILES,
+    ) -> None:
+        self.x1, self.x2 = sorted((x1, x2))
+        self.y1, self.y2 = sorted((y1, y2))
+        self.zoom = zoom
+        self.concurrency = concurrency
+        self.client = client
+        self.tiles = grid(x1, y1, x2, y2, zoom, max_tiles=max_tiles)
+        self.maps = []
+        self._merged = {}
+
+    async def stream(self) -> AsyncIterator[Maps]:
+        """Fetches the tiles, yielding a :py:class:`~instahashtag.wrapper.Maps` object per tile as it completes.
+
+        A failing tile does not stop the query; its object is yielded with the ``error`` attribute set.
+        """
+        async for maps in Maps.many(self.tiles, concurrency=self.concurrency, client=self.client):
+            self.maps.append(maps)
+            if maps.error is None:
+                self.merge(maps)
+            yield maps
+
+    async def call(self) -> None:
+        """Fetches every tile, filling in ``maps`` and ``tags``."""
+        async for _ in self.stream():
+            pass
+
+    def merge(self, maps: Maps) -> None:
+        """Merges the hashtags of a tile, keeping the highest weight per hashtag."""
+        merged = self._merged
+        for tag in maps.iter_tags():
+            seen = merged.get(tag.tag)
+            if seen is None or tag.weight > seen.weight:
+                merged[tag.tag] = tag
+
+    def contains(self, tag: MapsTag) -> bool:
+        """Whether the centroid of ``tag`` lies inside the queried bounding box."""
+        if not tag.centroid:
+            return False
+        lat, lon = tag.centroid[0], tag.centroid[1]
+        return self.y1 <= lat <= self.y2 and self.x1 <= lon <= self.x2
+
+    @property
+    def tags(self) -> List[MapsTag]:
+        """Merged :py:class:`~instahashtag.wrapper.maps.MapsTag` list inside the bounding box, heaviest first.
+
+        Ties are ordered by hashtag, so the order does not depend on which tile completed first."""
+        return sorted((t for t in self._merged.values() if self.contains(t)), key=lambda t: (-t.weight, t.tag))
+
+    @property
+    def errors(self) -> Dict[Tuple[float, float, float, float, int], Exception]:
+        """Dictionary of the failed tiles and their exceptions."""
+        return {(m.x1, m.y1, m.x2, m.y2, m.zoom): m.error for m in self.maps if m.error is not None}
+
+    def __aiter__(self) -> AsyncIterator[Maps]:
+        return self.stream()
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return "Tiles(x1={}, y1={}, x2={}, y2={}, zoom={}, tiles={}, tags_len={})".format(
+            self.x1,
+            self.y1,
+            self.x2,
+            self.y2,
+            self.zoom,
+            len(self.tiles),
+            len(self._merged),
+        )
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.__repr__()
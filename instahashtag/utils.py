@@ -1,4 +1,8 @@
+import asyncio
+import functools
 import hashlib
+from types import MappingProxyType
+from typing import Any, Awaitable, Iterable, List, Mapping
 
 USERAGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 11_2_0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.146 Safari/537.36"
 STRING = 'function(d){var r = M(V(Y(X(d),8*d.length)));return r.toLowerCase()};function M(d){for(var _,m="0123456789ABCDEF",f="",r=0;r<d.length;r++)_=d.charCodeAt(r)'
@@ -17,38 +21,91 @@ HEADERS = {
 }
 
 
+#: Maximum number of hashtags whose tokens and headers are memoized.
+MEMO_SIZE = 65536
+
+# The token is the MD5 of "USERAGENT|hashtag|STRING". The constant prefix is hashed once, and
+# copies of that state only need to be fed the hashtag and the suffix.
+_PREFIX = hashlib.md5("{}|".format(USERAGENT).encode("utf-8"))
+_SUFFIX = "|{}".format(STRING).encode("utf-8")
+
+# Headers of the 'maps' endpoint, which does not use a generated 'api-token'.
+_MAPS_HEADERS = MappingProxyType(dict(HEADERS, **{"api-token": "test"}))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
 def generate_token(hashtag: str) -> str:
     """Generates the required 'api-token' to send request to DisplayPurposes.
 
+    Tokens are memoized for the last :py:data:`MEMO_SIZE` hashtags.
+
     Args:
         tag: Hashtag to generate token for.
 
     Returns:
-        dict: Dictionary representation of the request headers.
+        str: Hexadecimal MD5 token.
     """
-    value = "{}|{}|{}".format(USERAGENT, hashtag, STRING).encode("utf-8")
-    md5 = hashlib.md5(value)
+    md5 = _PREFIX.copy()
+    md5.update(hashtag.encode("utf-8"))
+    md5.update(_SUFFIX)
     return md5.hexdigest()
 
 
-def generate_header(hashtag: str = None) -> dict:
+def generate_tokens(hashtags: Iterable[str]) -> List[str]:
+    """Generates the 'api-token' of many hashtags at once.
+
+    Args:
+        hashtags: Iterable of hashtags to generate tokens for.
+
+    Returns:
+        list: Tokens, in the same order as ``hashtags``.
+    """
+    return [generate_token(hashtag) for hashtag in hashtags]
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _tag_headers(hashtag: str) -> Mapping[str, str]:
+    return MappingProxyType(dict(HEADERS, **{"api-token": generate_token(hashtag)}))
+
+
+def generate_header(hashtag: str = None) -> Mapping[str, str]:
     """Generates specific headers that DisplayPurposes requires.
 
     Args:
         tag: Hashtag to generate headers for.
 
     Returns:
-        dict: Dictionary representation of the request headers.
+        Mapping: Read-only mapping of the request headers. The same mapping is shared by every
+        request for the same hashtag, so it must be copied (``dict(headers)``) to be modified.
 
     Note:
         'map' request does not use a generated 'api-token'
         header, and instead uses the string "test".
     """
-    headers = HEADERS.copy()
-
     if hashtag:
-        headers["api-token"] = generate_token(hashtag)
-    else:
-        headers["api-token"] = "test"
+        return _tag_headers(hashtag)
+    return _MAPS_HEADERS
+
 
-    return headers
+def run(coroutine: Awaitable) -> Any:
+    """Runs ``coroutine`` to completion in a new event loop, like ``asyncio.run`` (Python 3.7+).
+
+    Tasks still pending when the coroutine returns or raises (e.g. on ``KeyboardInterrupt``) are
+    cancelled, and the loop is closed.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        try:
+            all_tasks = getattr(asyncio, "all_tasks", None) or asyncio.Task.all_tasks
+            pending = [task for task in all_tasks(loop) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -1,7 +1,13 @@
-from .. import api
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Union
+
+from .. import api, columns, decoder
+from ..http import Client
 
 
 class GraphNode:
+    __slots__ = ("id", "relevance", "weight", "x", "y")
+
     def __init__(
         self,
         id: str,
@@ -43,7 +49,7 @@ class GraphNode:
 
                     node.y # >>> 0.6194782200730474
         """
-        self.id = id
+        self.id = sys.intern(id)
         self.relevance = relevance
         self.weight = weight
         self.x = x
@@ -63,6 +69,8 @@ class GraphNode:
 
 
 class GraphEdge:
+    __slots__ = ("a", "b", "id", "weight")
+
     def __init__(self, a: str, b: str, id: str, weight: int) -> None:
         """Object that represents the individual edges inside the ``Graph.edges`` list.
 
@@ -94,8 +102,8 @@ class GraphEdge:
         Note:
             The edge object of the graph represents `which` node is connected to which other node.
         """
-        self.a = a
-        self.b = b
+        self.a = sys.intern(a)
+        self.b = sys.intern(b)
         self.id = id
         self.weight = weight
 
@@ -112,7 +120,7 @@ class GraphEdge:
 
 
 class Graph:
-    def __init__(self, hashtag: str, aio: bool = False) -> None:
+    def __init__(self, hashtag: str, aio: bool = False, client: Client = None) -> None:
         """Initializes a new Graph object.
 
         .. code-block:: python
@@ -128,12 +136,27 @@ class Graph:
 
                     graph.hashtag # >>> miami
 
+            client: Optional :py:class:`~instahashtag.http.Client` used to query the API. When given, the
+                ``aio`` flag is taken from the client's transport.
+
+                .. code-block:: python
+
+                    with Client() as client:
+                        graph = Graph("miami", client=client)
+                        graph.client # >>> <instahashtag.http.Client object at ...>
+
             exists: Boolean that dictates whether or not the passed hashtag exists.
 
                .. code-block:: python
 
                     graph.exists # >>> True
 
+            error: Exception raised while querying the API in a batch (see :py:func:`many`), otherwise ``None``.
+
+                .. code-block:: python
+
+                    graph.error # >>> None
+
             root_pos: List of floats indicating where the root position of the graph is.
 
                 .. code-block:: python
@@ -161,49 +184,165 @@ class Graph:
         """
 
         self.hashtag = hashtag
-        self.edges = None
+        self.client = client
+        self.error = None
         self.exists = None
-        self.nodes = None
         self.query = None
         self.root_pos = None
+        self.data = None
+        self._edges = None
+        self._nodes = None
+
+        if client is not None:
+            aio = client.aio
 
         if not aio:
-            self.data = api.graph(hashtag=self.hashtag)
+            self.data = api.graph(hashtag=self.hashtag, client=self.client)
             self.process()
 
+    @classmethod
+    async def many(
+        cls,
+        hashtags: Iterable[str],
+        concurrency: int = 10,
+        client: Client = None,
+    ) -> AsyncIterator["Graph"]:
+        """Asynchronously queries the API for many hashtags, yielding :py:class:`Graph` objects as they complete.
+
+        All requests share a single connection pool and at most ``concurrency`` are in-flight at once.
+        A failing item does not stop the batch; instead its object is yielded with the ``error``
+        attribute set to the raised exception.
+
+        .. code-block:: python
+
+            from instahashtag import Graph
+
+            async def main():
+                async for graph in Graph.many(["miami", "travel"], concurrency=20):
+                    if graph.error is None:
+                        print(graph)
+
+        Args:
+            hashtags: Iterable of hashtags to retrieve info from.
+            concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+            client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+        """
+        async for result in api.graph_many(hashtags, concurrency=concurrency, client=client):
+            obj = cls(result.query, aio=True, client=client)
+            obj.error = result.error
+            if result.error is None:
+                obj.data = result.data
+                obj.process()
+            yield obj
+
+    @classmethod
+    def from_body(
+        cls,
+        hashtag: str,
+        body: Union[str, bytes],
+        loads: Callable = None,
+    ) -> "Graph":
+        """Builds a :py:class:`Graph` object straight from a raw API reply, without querying the API.
+
+        The reply is parsed with the fastest installed JSON decoder (see :py:mod:`instahashtag.decoder`)
+        unless ``loads`` is given, and its records are built lazily as slotted objects.
+
+        .. code-block:: python
+
+            graph = Graph.from_body("miami", body=b'{...}')
+
+        """
+        obj = cls(hashtag, aio=True)
+        obj.data = (loads or decoder.loads)(body)
+        obj.process()
+        return obj
+
     async def call(self) -> None:
         """Asynchronously queries the API.
 
         See note on the top of the :ref:`wrapper` documentation.
         """
-        self.data = await api.graph(hashtag=self.hashtag, aio=True)
+        self.data = await api.graph(hashtag=self.hashtag, aio=True, client=self.client)
         self.process()
 
     def process(self) -> None:
-        """Processes the incoming data from the API."""
+        """Processes the incoming data from the API.
+
+        Only the top-level attributes are parsed here; ``edges`` and ``nodes`` are built on first access.
+        """
 
         self.exists = self.data.get("exists", None)
         self.root_pos = self.data.get("root_pos", None)
+        self._edges = None
+        self._nodes = None
+
+    @property
+    def edges(self) -> List[GraphEdge]:
+        """List of :py:class:`GraphEdge`, built from the API data on first access."""
+        if self._edges is None and self.data is not None:
+            self._edges = [GraphEdge(**e) for e in self.data.get("edges") or []]
+        return self._edges
+
+    @edges.setter
+    def edges(self, value: List[GraphEdge]) -> None:
+        self._edges = value
+
+    @property
+    def nodes(self) -> List[GraphNode]:
+        """List of :py:class:`GraphNode`, built from the API data on first access."""
+        if self._nodes is None and self.data is not None:
+            self._nodes = [GraphNode(**n) for n in self.data.get("nodes") or []]
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, value: List[GraphNode]) -> None:
+        self._nodes = value
+
+    def iter_edges(self) -> Iterator[GraphEdge]:
+        """Iterates over ``edges`` without building (and keeping) the whole list."""
+        if self._edges is not None:
+            return iter(self._edges)
+        return (GraphEdge(**e) for e in (self.data or {}).get("edges") or [])
+
+    def iter_nodes(self) -> Iterator[GraphNode]:
+        """Iterates over ``nodes`` without building (and keeping) the whole list."""
+        if self._nodes is not None:
+            return iter(self._nodes)
+        return (GraphNode(**n) for n in (self.data or {}).get("nodes") or [])
+
+    def nodes_columns(self) -> Dict[str, Any]:
+        """Returns a columnar view of ``nodes``, built straight from the API data.
 
-        edges = self.data.get("edges", [])
-        if edges:
-            self.edges = [GraphEdge(**e) for e in edges]
-        else:
-            self.edges = edges
+        .. code-block:: python
 
-        nodes = self.data.get("nodes", [])
-        if nodes:
-            self.nodes = [GraphNode(**n) for n in nodes]
-        else:
-            self.nodes = nodes
+            cols = graph.nodes_columns()
+            cols.keys() # >>> id, relevance, weight, x, y
+
+        See :py:func:`instahashtag.wrapper.Tag.results_columns` for the column types.
+        """
+        return columns.columns((self.data or {}).get("nodes"), columns.GRAPH_NODES)
+
+    def edges_columns(self) -> Dict[str, Any]:
+        """Returns a columnar view of ``edges``, built straight from the API data.
+
+        The ``a`` and ``b`` columns hold the indices of the connected hashtags in :py:func:`nodes_columns`.
+
+        .. code-block:: python
+
+            cols = graph.edges_columns()
+            cols.keys() # >>> id, a, b, weight
+
+        """
+        data = self.data or {}
+        return columns.edge_columns(data.get("nodes"), data.get("edges"))
 
     def __repr__(self) -> str:  # pragma: no cover
         return "Graph(hashtag={}, exists={}, root_pos={}, edges_len={}, nodes_len={})".format(
             self.hashtag,
             self.exists,
             self.root_pos,
-            len(self.edges),
-            len(self.nodes),
+            len((self.data or {}).get("edges") or []),
+            len((self.data or {}).get("nodes") or []),
         )
 
     def __str__(self) -> str:  # pragma: no cover
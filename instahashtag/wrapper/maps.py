@@ -1,6 +1,8 @@
-from typing import List
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Tuple, Union
 
-from .. import api
+from .. import api, columns, decoder
+from ..http import Client
 
 
 class MapsTag:
@@ -26,9 +28,11 @@ class MapsTag:
                 tag.weight # >>> 49
     """
 
+    __slots__ = ("centroid", "tag", "weight")
+
     def __init__(self, centroid: List[float], tag: str, weight: int) -> None:
         self.centroid = centroid
-        self.tag = tag
+        self.tag = sys.intern(tag)
         self.weight = weight
 
     def __gt__(self, other: "Result") -> bool:
@@ -77,6 +81,7 @@ class Maps:
         y2: float,
         zoom: int,
         aio: bool = False,
+        client: Client = None,
     ) -> None:
         """Initializes a new map object.
 
@@ -124,6 +129,21 @@ class Maps:
 
                     maps.zoom # >>> 12
 
+            client: Optional :py:class:`~instahashtag.http.Client` used to query the API. When given, the
+                ``aio`` flag is taken from the client's transport.
+
+                .. code-block:: python
+
+                    with Client() as client:
+                        maps = Maps(x1, y1, x2, y2, zoom, client=client)
+                        maps.client # >>> <instahashtag.http.Client object at ...>
+
+            error: Exception raised while querying the API in a batch (see :py:func:`many`), otherwise ``None``.
+
+                .. code-block:: python
+
+                    maps.error # >>> None
+
             count: Number of hashtags in the resulting query.
 
                 .. code-block:: python
@@ -148,6 +168,14 @@ class Maps:
         self.x2 = x2
         self.y2 = y2
         self.zoom = zoom
+        self.client = client
+        self.error = None
+        self.count = None
+        self.data = None
+        self._tags = None
+
+        if client is not None:
+            aio = client.aio
 
         if not aio:
             self.data = api.maps(
@@ -156,9 +184,72 @@ class Maps:
                 x2=self.x2,
                 y2=self.y2,
                 zoom=self.zoom,
+                client=self.client,
             )
             self.process()
 
+    @classmethod
+    async def many(
+        cls,
+        bboxes: Iterable[Tuple[float, float, float, float, int]],
+        concurrency: int = 10,
+        client: Client = None,
+    ) -> AsyncIterator["Maps"]:
+        """Asynchronously queries the API for many bounding boxes, yielding :py:class:`Maps` objects as they complete.
+
+        All requests share a single connection pool and at most ``concurrency`` are in-flight at once.
+        A failing item does not stop the batch; instead its object is yielded with the ``error``
+        attribute set to the raised exception.
+
+        .. code-block:: python
+
+            from instahashtag import Maps
+
+            async def main():
+                async for maps in Maps.many([(x1, y1, x2, y2, 12), ...], concurrency=20):
+                    if maps.error is None:
+                        print(maps)
+
+        Args:
+            bboxes: Iterable of ``(x1, y1, x2, y2, zoom)`` tuples.
+            concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+            client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+        """
+        async for result in api.maps_many(bboxes, concurrency=concurrency, client=client):
+            x1, y1, x2, y2, *zoom = result.query
+            obj = cls(x1, y1, x2, y2, zoom[0] if zoom else 1, aio=True, client=client)
+            obj.error = result.error
+            if result.error is None:
+                obj.data = result.data
+                obj.process()
+            yield obj
+
+    @classmethod
+    def from_body(
+        cls,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        zoom: int,
+        body: Union[str, bytes],
+        loads: Callable = None,
+    ) -> "Maps":
+        """Builds a :py:class:`Maps` object straight from a raw API reply, without querying the API.
+
+        The reply is parsed with the fastest installed JSON decoder (see :py:mod:`instahashtag.decoder`)
+        unless ``loads`` is given, and its records are built lazily as slotted objects.
+
+        .. code-block:: python
+
+            maps = Maps.from_body(x1, y1, x2, y2, zoom, body=b'{...}')
+
+        """
+        obj = cls(x1, y1, x2, y2, zoom, aio=True)
+        obj.data = (loads or decoder.loads)(body)
+        obj.process()
+        return obj
+
     async def call(self) -> None:
         """Asynchronously queries the API.
 
@@ -171,19 +262,47 @@ class Maps:
             y2=self.y2,
             zoom=self.zoom,
             aio=True,
+            client=self.client,
         )
         self.process()
 
     def process(self) -> None:
-        """Processes the incoming data from the API."""
+        """Processes the incoming data from the API.
+
+        Only the top-level attributes are parsed here; ``tags`` is built on first access.
+        """
 
         self.count = self.data.get("count", None)
+        self._tags = None
+
+    @property
+    def tags(self) -> List[MapsTag]:
+        """List of :py:class:`MapsTag`, built from the API data on first access."""
+        if self._tags is None and self.data is not None:
+            self._tags = [MapsTag(**t) for t in self.data.get("tags") or []]
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: List[MapsTag]) -> None:
+        self._tags = value
+
+    def iter_tags(self) -> Iterator[MapsTag]:
+        """Iterates over ``tags`` without building (and keeping) the whole list."""
+        if self._tags is not None:
+            return iter(self._tags)
+        return (MapsTag(**t) for t in (self.data or {}).get("tags") or [])
 
-        tags = self.data.get("tags", [])
-        if tags:
-            self.tags = [MapsTag(**t) for t in tags]
-        else:
-            self.tags = []
+    def tags_columns(self) -> Dict[str, Any]:
+        """Returns a columnar view of ``tags``, built straight from the API data.
+
+        .. code-block:: python
+
+            cols = maps.tags_columns()
+            cols.keys() # >>> tag, weight, centroid_lat, centroid_lon
+
+        See :py:func:`instahashtag.wrapper.Tag.results_columns` for the column types.
+        """
+        return columns.columns((self.data or {}).get("tags"), columns.MAPS_TAGS)
 
     def __repr__(self) -> str:  # pragma: no cover
         return (
@@ -194,7 +313,7 @@ class Maps:
                 self.y2,
                 self.zoom,
                 self.count,
-                len(self.tags),
+                len((self.data or {}).get("tags") or []),
             )
         )
 
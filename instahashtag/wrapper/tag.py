@@ -1,9 +1,13 @@
-from typing import List
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Union
 
-from .. import api
+from .. import api, columns, decoder
+from ..http import Client
 
 
 class TagResult:
+    __slots__ = ("tag", "rank", "geo", "media_count", "relevance", "absRelevance")
+
     def __init__(
         self,
         tag: str,
@@ -52,7 +56,7 @@ class TagResult:
 
                     result.absRelevance # >>> 0.0060874452062492975
         """
-        self.tag = tag
+        self.tag = sys.intern(tag)
         self.rank = rank
         self.geo = geo
         self.media_count = media_count
@@ -93,7 +97,7 @@ class TagResult:
 
 
 class Tag:
-    def __init__(self, hashtag: str, aio: bool = False) -> None:
+    def __init__(self, hashtag: str, aio: bool = False, client: Client = None) -> None:
         """Initializes a new Tag object.
 
         .. code-block:: python
@@ -109,6 +113,15 @@ class Tag:
 
                     tag.hashtag # >>> miami
 
+            client: Optional :py:class:`~instahashtag.http.Client` used to query the API. When given, the
+                ``aio`` flag is taken from the client's transport.
+
+                .. code-block:: python
+
+                    with Client() as client:
+                        tag = Tag("miami", client=client)
+                        tag.client # >>> <instahashtag.http.Client object at ...>
+
             geo: List containing two float coordinates relating to the hashtag.
 
                 .. code-block:: python
@@ -127,6 +140,12 @@ class Tag:
 
                     tag.exists # >>> True
 
+            error: Exception raised while querying the API in a batch (see :py:func:`many`), otherwise ``None``.
+
+                .. code-block:: python
+
+                    tag.error # >>> None
+
             results: List of :py:class:`TagResult` containing information on related hashtags.
 
                 .. code-block:: python
@@ -140,40 +159,141 @@ class Tag:
         """
 
         self.hashtag = hashtag
+        self.client = client
+        self.error = None
         self.geo = None
         self.rank = None
-        self.results = None
         self.exists = None
+        self.data = None
+        self._results = None
+
+        if client is not None:
+            aio = client.aio
 
         if not aio:
-            self.data = api.tag(hashtag=self.hashtag)
+            self.data = api.tag(hashtag=self.hashtag, client=self.client)
             self.process()
 
+    @classmethod
+    async def many(
+        cls,
+        hashtags: Iterable[str],
+        concurrency: int = 10,
+        client: Client = None,
+    ) -> AsyncIterator["Tag"]:
+        """Asynchronously queries the API for many hashtags, yielding :py:class:`Tag` objects as they complete.
+
+        All requests share a single connection pool and at most ``concurrency`` are in-flight at once.
+        A failing item does not stop the batch; instead its object is yielded with the ``error``
+        attribute set to the raised exception.
+
+        .. code-block:: python
+
+            from instahashtag import Tag
+
+            async def main():
+                async for tag in Tag.many(["miami", "travel"], concurrency=20):
+                    if tag.error is None:
+                        print(tag)
+
+        Args:
+            hashtags: Iterable of hashtags to retrieve info from.
+            concurrency: Maximum number of in-flight requests. Defaults to ``10``.
+            client: Optional asynchronous :py:class:`~instahashtag.http.Client` shared by every request.
+        """
+        async for result in api.tag_many(hashtags, concurrency=concurrency, client=client):
+            obj = cls(result.query, aio=True, client=client)
+            obj.error = result.error
+            if result.error is None:
+                obj.data = result.data
+                obj.process()
+            yield obj
+
+    @classmethod
+    def from_body(
+        cls,
+        hashtag: str,
+        body: Union[str, bytes],
+        loads: Callable = None,
+    ) -> "Tag":
+        """Builds a :py:class:`Tag` object straight from a raw API reply, without querying the API.
+
+        The reply is parsed with the fastest installed JSON decoder (see :py:mod:`instahashtag.decoder`)
+        unless ``loads`` is given, and its records are built lazily as slotted objects.
+
+        .. code-block:: python
+
+            tag = Tag.from_body("miami", body=b'{...}')
+
+        """
+        obj = cls(hashtag, aio=True)
+        obj.data = (loads or decoder.loads)(body)
+        obj.process()
+        return obj
+
     async def call(self) -> None:
         """Asynchronously queries the API.
 
         See note on the top of the :ref:`wrapper` documentation.
         """
-        self.data = await api.tag(hashtag=self.hashtag, aio=True)
+        self.data = await api.tag(hashtag=self.hashtag, aio=True, client=self.client)
         self.process()
 
     def process(self) -> None:
+        """Processes the incoming data from the API.
+
+        Only the top-level attributes are parsed here; ``results`` is built on first access.
+        """
         self.geo = self.data.get("geo", None)
         self.rank = self.data.get("rank", None)
         self.exists = self.data.get("tagExists", None)
+        self._results = None
+
+    @property
+    def results(self) -> List[TagResult]:
+        """List of :py:class:`TagResult`, built from the API data on first access."""
+        if self._results is None and self.data is not None:
+            self._results = [TagResult(**r) for r in self.data.get("results") or []]
+        return self._results
+
+    @results.setter
+    def results(self, value: List[TagResult]) -> None:
+        self._results = value
+
+    def iter_results(self) -> Iterator[TagResult]:
+        """Iterates over ``results`` without building (and keeping) the whole list.
+
+        .. code-block:: python
+
+            related = [r.tag for r in tag.iter_results() if r.relevance > 90]
+
+        """
+        if self._results is not None:
+            return iter(self._results)
+        return (TagResult(**r) for r in (self.data or {}).get("results") or [])
+
+    def results_columns(self) -> Dict[str, Any]:
+        """Returns a columnar view of ``results``, built straight from the API data.
 
-        results = self.data.get("results", [])
-        if results:
-            self.results = [TagResult(**r) for r in results]
-        else:
-            self.results = results
+        Numeric columns are NumPy arrays, or ``array.array`` if NumPy is not installed, which makes
+        vectorised sorting, filtering and top-k cheap across many responses. The columns are empty
+        until the data is fetched (e.g. before ``await tag.call()``).
+
+        .. code-block:: python
+
+            cols = tag.results_columns()
+            cols.keys() # >>> tag, rank, media_count, relevance, absRelevance, geo_lat, geo_lon
+            top = cols["rank"].argsort()[::-1][:10]
+
+        """
+        return columns.columns((self.data or {}).get("results"), columns.TAG_RESULTS)
 
     def __repr__(self) -> str: # pragma: no cover
         return "Tag(hashtag={}, exists={}, rank={}, results_len={})".format(
             self.hashtag,
             self.exists,
             self.rank,
-            len(self.results),
+            len((self.data or {}).get("results") or []),
         )
 
     def __str__(self) -> str: # pragma: no cover
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+from instahashtag import Client, Tag, api, batch
+from instahashtag.batch import as_completed
+from instahashtag.http import Base
+
+
+class Fake(Base):
+    async def call(self):
+        await asyncio.sleep(0)
+        if self.endpoint.endswith("broken"):
+            raise RuntimeError("broken")
+        return {"tag": self.endpoint.rsplit("/", 1)[-1], "rank": 1, "results": []}
+
+
+class Test_Batch:
+    @pytest.mark.asyncio
+    async def test_concurrency_bound(self):
+        running, peak = 0, 0
+
+        async def fetch(query):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return query * 2
+
+        results = [r async for r in as_completed(fetch, range(50), concurrency=4)]
+        assert peak == 4
+        assert sorted(r.data for r in results) == [i * 2 for i in range(50)]
+
+    @pytest.mark.asyncio
+    async def test_errors_collected(self):
+        async with Client(transport=Fake) as client:
+            tags = [t async for t in Tag.many(["miami", "broken", "travel"], client=client)]
+
+        errors = {t.hashtag: t.error for t in tags}
+        assert isinstance(errors.pop("broken"), RuntimeError)
+        assert errors == {"miami": None, "travel": None}
+
+    @pytest.mark.asyncio
+    async def test_close_awaits_cancelled(self):
+        cancelled = []
+
+        async def fetch(query):
+            if query:
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.append(query)
+                    raise
+            return query
+
+        results = as_completed(fetch, range(4), concurrency=4)
+        assert (await results.__anext__()).query == 0
+        await results.aclose()
+        # Every cancelled task has run to completion before aclose returns.
+        assert sorted(cancelled) == [1, 2, 3]
+
+
+class Test_Threaded:
+    def test_ordered_and_errors(self):
+        def fetch(query):
+            time.sleep(0.01 * (5 - query % 5))
+            if query == 3:
+                raise ValueError("bad")
+            return query * 2
+
+        results = list(batch.threaded(fetch, range(10), workers=4, ordered=True))
+        assert [r.query for r in results] == list(range(10))
+        assert results[2].data == 4
+        assert isinstance(results[3].error, ValueError)
+
+    def test_bounded_and_cancelled(self):
+        started = []
+        lock = threading.Lock()
+
+        def fetch(query):
+            with lock:
+                started.append(query)
+            time.sleep(0.02)
+            return query
+
+        results = batch.threaded(fetch, itertools.count(), workers=2, max_pending=4)
+        next(results)
+        results.close()
+        assert len(started) <= 6
+
+    def test_api_per_thread_sessions(self):
+        sessions = set()
+        lock = threading.Lock()
+        running, peak = 0, 0
+
+        class Recorder(Base):
+            @classmethod
+            def open_session(cls, client):
+                return object()
+
+            def call(self):
+                nonlocal running, peak
+                with lock:
+                    sessions.add((threading.get_ident(), id(self.session)))
+                    running += 1
+                    peak = max(peak, running)
+                time.sleep(0.01)
+                with lock:
+                    running -= 1
+                return {"tag": self.endpoint.rsplit("/", 1)[-1]}
+
+        with Client(transport=Recorder) as client:
+            results = list(api.tag_threaded(["h{}".format(i) for i in range(40)], workers=8, client=client))
+
+        assert sorted(r.data["tag"] for r in results) == sorted("h{}".format(i) for i in range(40))
+        assert 1 < peak <= 8
+        threads = {thread for thread, _ in sessions}
+        assert len({session for _, session in sessions}) == len(threads) > 1
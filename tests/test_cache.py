@@ -0,0 +1,87 @@
+import pytest
+from instahashtag import Client, Tag
+from instahashtag import cache as cache_module
+from instahashtag.cache import DiskCache, MemoryCache
+from instahashtag.http import Base
+
+
+class Counting(Base):
+    calls = 0
+
+    def call(self):
+        Counting.calls += 1
+        return {"tag": "miami", "rank": 1, "tagExists": True, "results": []}
+
+
+class Test_MemoryCache:
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_per_kind(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = MemoryCache(ttl={"tag": 60, "maps": 10})
+        cache.set("tag", 1, kind="tag")
+        cache.set("maps", 2, kind="maps")
+        cache.set("graph", 3, kind="graph")
+
+        now[0] += 30
+        assert cache.get("tag") == 1
+        assert cache.get("maps") is None
+        assert cache.get("graph") == 3
+        assert cache.stats()["expirations"] == 1
+
+    def test_client_hits(self):
+        cache = MemoryCache()
+        Counting.calls = 0
+
+        with Client(transport=Counting, cache=cache) as client:
+            Tag("miami", client=client)
+            tag = Tag("miami", client=client)
+
+        assert tag.exists is True
+        assert Counting.calls == 1
+        assert cache.stats()["hits"] == 1
+
+
+class Test_DiskCache:
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        Counting.calls = 0
+
+        with Client(transport=Counting, cache=DiskCache(path)) as client:
+            Tag("miami", client=client)
+
+        cache = DiskCache(path)
+        with Client(transport=Counting, cache=cache) as client:
+            tag = Tag("miami", client=client)
+
+        assert tag.exists is True
+        assert Counting.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_vacuum(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+        cache = DiskCache(str(tmp_path / "cache.db"), ttl={"maps": 10}, max_bytes=40)
+        cache.set("maps", b"{}", kind="maps")
+        for i in range(5):
+            now[0] += 1
+            cache.set("tag/{}".format(i), b'{"rank": 1}', kind="tag")
+
+        now[0] += 10
+        cache.vacuum()
+
+        assert "maps" not in cache
+        assert cache.stats()["bytes"] <= 40
+        assert "tag/4" in cache
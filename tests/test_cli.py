@@ -0,0 +1,74 @@
+import io
+import json
+
+import pytest
+
+from instahashtag import cli
+from instahashtag.mock import MockServer
+
+
+def run(capsys, monkeypatch, argv, stdin=""):
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    code = cli.main(argv)
+    out, err = capsys.readouterr()
+    return code, [json.loads(line) for line in out.splitlines()], err
+
+
+class Test_Cli:
+    def test_tag_from_stdin(self, capsys, monkeypatch, tmp_path):
+        with MockServer(results=3).background() as server:
+            argv = ["tag", "--base-url", server.url, "--cache", str(tmp_path / "cache.db"), "-c", "2"]
+            code, lines, err = run(capsys, monkeypatch, argv, stdin="miami\n# comment\n\ntravel\n")
+
+            assert code == 0
+            assert sorted(line["query"] for line in lines) == ["miami", "travel"]
+            assert all(len(line["data"]["results"]) == 3 and line["error"] is None for line in lines)
+            assert "2 done, 0 errors" in err
+
+            # A second run is served from the cache.
+            requests = dict(server.requests)
+            run(capsys, monkeypatch, argv + ["miami"])
+            assert server.requests == requests and sum(requests.values()) == 2
+
+    def test_flushes_every_record(self, monkeypatch):
+        class Stdout(io.StringIO):
+            flushed = []
+
+            def flush(self):
+                Stdout.flushed.append(self.getvalue().count("\n"))
+
+        monkeypatch.setattr("sys.stdout", Stdout())
+        with MockServer().background() as server:
+            assert cli.main(["tag", "miami", "travel", "--base-url", server.url, "-q"]) == 0
+
+        assert Stdout.flushed[:2] == [1, 2]
+
+    def test_maps_errors(self, capsys, monkeypatch, tmp_path):
+        path = tmp_path / "bboxes.txt"
+        path.write_text("-80.4,25.7,-79.8,25.8,12\nnot a bbox\n")
+
+        with MockServer(error_rate=1.0).background() as server:
+            argv = ["maps", "-i", str(path), "--base-url", server.url, "--retries", "1", "-q"]
+            code, lines, err = run(capsys, monkeypatch, argv)
+
+        assert code == 1
+        assert err == ""
+        assert [line["query"] for line in sorted(lines, key=lambda l: str(l["query"]))] == [
+            [-80.4, 25.7, -79.8, 25.8, 12],
+            "not a bbox",
+        ]
+        assert all(line["error"] for line in lines)
+
+    def test_crawl(self, capsys, monkeypatch):
+        with MockServer(nodes=3, edges=3).background() as server:
+            argv = ["crawl", "miami", "--depth", "1", "--max-tags", "3", "--base-url", server.url, "-q"]
+            code, lines, _ = run(capsys, monkeypatch, argv)
+
+        assert code == 0
+        assert len(lines) == 3
+        assert lines[0]["hashtag"] == "miami" and lines[0]["graph"]["nodes"]
+
+    def test_usage(self):
+        with pytest.raises(SystemExit):
+            cli.main(["users"])
+        assert cli.parse_bbox("1 2 3 4") == (1.0, 2.0, 3.0, 4.0)
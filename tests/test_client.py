@@ -0,0 +1,73 @@
+import pytest
+from instahashtag import Client, Tag, Graph, Maps
+from instahashtag import http
+from instahashtag.cache import MemoryCache
+
+
+class Test_Client_sync:
+    def test_session_reused(self):
+        with Client() as client:
+            assert client.aio is False
+            assert client.transport is http.Requests
+            assert client.session is client.session
+        assert client._session is None
+
+    def test_session_opened_lazily(self):
+        opened = []
+
+        class Counting(http.Base):
+            @classmethod
+            def open_session(cls, client):
+                opened.append(client)
+                return object()
+
+            def call(self):
+                assert self.session is not None
+                return {"rank": 1, "results": []}
+
+        cache = MemoryCache()
+        with Client(transport=Counting, cache=cache) as client:
+            Tag("miami", client=client)
+        with Client(transport=Counting, cache=cache) as cached:
+            Tag("miami", client=cached)
+
+        assert opened == [client]
+        assert cached._session is None
+
+    def test_init(self):
+        with Client() as client:
+            tag = Tag("miami", client=client)
+            graph = Graph("miami", client=client)
+
+
+class Test_Client_async:
+    @pytest.mark.asyncio
+    async def test_session_reused(self):
+        async with Client(aio=True, limit=5, limit_per_host=2) as client:
+            assert client.aio is True
+            session = client.session
+            assert session is client.session
+            assert session.connector.limit == 5
+            assert session.connector.limit_per_host == 2
+        assert session.closed
+
+    def test_timeout_without_client(self):
+        timeout = http.Aiohttp("https://apidisplaypurposes.com/tag/miami", {}).client_timeout()
+        assert (timeout.sock_connect, timeout.sock_read) == http.TIMEOUT
+
+        with Client(timeout=None) as client:
+            timeout = http.Aiohttp("https://apidisplaypurposes.com/tag/miami", {}, client).client_timeout()
+        assert timeout.total is None and timeout.sock_read is None
+
+    @pytest.mark.asyncio
+    async def test_init(self):
+        async with Client(aio=True) as client:
+            maps = Maps(
+                x1=-80.48712034709753,
+                y1=25.750749758162012,
+                x2=-79.82794065959753,
+                y2=25.854604964203453,
+                zoom=12,
+                client=client,
+            )
+            await maps.call()
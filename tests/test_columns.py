@@ -0,0 +1,63 @@
+import pytest
+from instahashtag import Client, Graph, Maps, Tag
+from instahashtag.http import Base
+
+
+class Fixed(Base):
+    def call(self):
+        if self.kind == "tag":
+            return {
+                "tag": "miami",
+                "results": [
+                    {"tag": "a", "rank": 3, "geo": [1.0, 2.0], "media_count": 10, "relevance": 99, "absRelevance": 0.5},
+                    {"tag": "b", "rank": 7, "geo": None, "media_count": 20, "relevance": 50, "absRelevance": 0.2},
+                ],
+            }
+        return {
+            "nodes": [
+                {"id": "miami", "relevance": 1.0, "weight": 1.0, "x": 0.1, "y": 0.2},
+                {"id": "liv", "relevance": 0.5, "weight": 0.4, "x": 0.3, "y": 0.4},
+            ],
+            "edges": [
+                {"a": "miami", "b": "liv", "id": "miami#liv", "weight": 0.7},
+                {"a": "liv", "b": "gone", "id": "liv#gone", "weight": 0.1},
+            ],
+        }
+
+
+class Test_Columns:
+    def test_tag_results(self):
+        with Client(transport=Fixed) as client:
+            cols = Tag("miami", client=client).results_columns()
+
+        assert cols["tag"] == ["a", "b"]
+        assert list(cols["rank"]) == [3, 7]
+        assert list(cols["media_count"]) == [10, 20]
+        assert cols["geo_lat"][0] == 1.0
+        assert cols["geo_lat"][1] != cols["geo_lat"][1]
+
+    def test_graph_edges(self):
+        with Client(transport=Fixed) as client:
+            graph = Graph("miami", client=client)
+
+        assert list(graph.nodes_columns()["x"]) == [0.1, 0.3]
+        edges = graph.edges_columns()
+        assert list(edges["a"]) == [0, 1]
+        assert list(edges["b"]) == [1, -1]
+        assert list(edges["weight"]) == [0.7, 0.1]
+
+
+    @pytest.mark.asyncio
+    async def test_not_called(self):
+        class Pending(Fixed):
+            async def call(self):
+                return Fixed.call(self)
+
+        async with Client(transport=Pending) as client:
+            tag, graph = Tag("miami", client=client), Graph("miami", client=client)
+            maps = Maps(x1=0, y1=0, x2=1, y2=1, zoom=12, client=client)
+
+        assert tag.results_columns()["tag"] == [] and len(tag.results_columns()["rank"]) == 0
+        assert len(graph.nodes_columns()["x"]) == 0
+        assert graph.edges_columns()["id"] == []
+        assert maps.tags_columns()["tag"] == []
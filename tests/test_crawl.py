@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from instahashtag import Client
+from instahashtag.checkpoint import Checkpoint
+from instahashtag.crawl import Crawler
+from instahashtag.http import Base
+
+NETWORK = {
+    "a": {"b": 0.9, "c": 0.1},
+    "b": {"a": 0.9, "d": 0.5},
+    "c": {"a": 0.1, "e": 0.5},
+    "d": {"b": 0.5},
+    "e": {"c": 0.5},
+}
+
+
+class Network(Base):
+    async def call(self):
+        hashtag = self.endpoint.rsplit("/", 1)[-1]
+        if hashtag == "e":
+            raise ConnectionError("reset")
+        neighbours = NETWORK[hashtag]
+        return {
+            "nodes": [{"id": n, "relevance": 0.5, "weight": 0.5, "x": 0, "y": 0} for n in neighbours],
+            "edges": [{"a": hashtag, "b": n, "id": hashtag + "#" + n, "weight": w} for n, w in neighbours.items()],
+        }
+
+
+class Test_Crawler:
+    @pytest.mark.asyncio
+    async def test_depth_and_dedupe(self):
+        async with Client(transport=Network) as client:
+            results = [r async for r in Crawler(["a"], depth=1, client=client)]
+
+        assert sorted(r.hashtag for r in results) == ["a", "b", "c"]
+        assert {r.hashtag: r.depth for r in results}["b"] == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_priority_and_errors(self):
+        async with Client(transport=Network) as client:
+            crawler = Crawler(["a"], depth=5, max_tags=2, concurrency=1, client=client)
+            assert [r.hashtag async for r in crawler] == ["a", "b"]
+
+            results = {r.hashtag: r async for r in Crawler(["a"], depth=5, client=client)}
+
+        assert sorted(results) == ["a", "b", "c", "d", "e"]
+        assert isinstance(results["e"].error, ConnectionError)
+
+
+class Test_Checkpoint:
+    @pytest.mark.asyncio
+    async def test_resume(self, tmp_path):
+        directory = str(tmp_path / "state")
+        output = str(tmp_path / "results.jsonl")
+
+        async with Client(transport=Network) as client:
+            checkpoint = Checkpoint(directory)
+            crawler = Crawler(["a"], depth=5, concurrency=1, client=client, checkpoint=checkpoint)
+            async for result in crawler:
+                if result.hashtag == "b":
+                    break
+            await crawler.crawl().aclose()
+
+            # Only 'a' was consumed, and 'b' is still in the frontier.
+            checkpoint = Checkpoint(directory)
+            assert checkpoint.completed == {"a"}
+            assert "b" in checkpoint.queued()
+
+            crawler = Crawler(["a"], depth=5, client=client, checkpoint=checkpoint)
+            written = await crawler.dump(output)
+
+        with open(output) as f:
+            lines = [json.loads(line) for line in f]
+        assert written == 4
+        assert sorted(line["hashtag"] for line in lines) == ["b", "c", "d", "e"]
+        assert Checkpoint(directory).completed == {"a", "b", "c", "d"}
+
+    def test_pending(self, tmp_path):
+        with Checkpoint(str(tmp_path)) as checkpoint:
+            checkpoint.done("miami")
+        assert list(Checkpoint(str(tmp_path)).pending(["miami", "travel"])) == ["travel"]
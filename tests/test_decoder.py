@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from instahashtag import Client, Tag, decoder
+from instahashtag.http import Base
+
+
+class Raw(Base):
+    def call(self):
+        return self.process(b'{"rank": 5, "tagExists": true, "results": []}')
+
+
+class Test_Decoder:
+    def test_get(self):
+        assert decoder.get() is decoder.DECODERS[decoder.DEFAULT]
+        assert decoder.get("json") is json.loads
+        assert decoder.get(len) is len
+        with pytest.raises(ValueError):
+            decoder.get("missing")
+
+    def test_bytes_body(self):
+        with Client(transport=Raw, decoder="json") as client:
+            tag = Tag("miami", client=client)
+
+        assert tag.rank == 5
+        assert client.loads is json.loads
+
+    def test_from_body(self):
+        tag = Tag.from_body("miami", b'{"rank": 1, "results": [{"tag": "a", "rank": 2, "geo": null, '
+                            b'"media_count": 3, "relevance": 4, "absRelevance": 0.5}]}')
+        assert tag.results[0].media_count == 3
+
+    def test_process_on_class(self):
+        assert Base.process('{"rank": 1}') == {"rank": 1}
+        assert Raw.process(b'{"rank": 1}', json.loads) == {"rank": 1}
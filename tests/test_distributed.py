@@ -0,0 +1,121 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from instahashtag import Client
+from instahashtag.distributed import ConsistentHash, WorkQueue, run, work
+from instahashtag.mock import MockServer
+
+from .test_crawl import Network
+
+
+class Test_ConsistentHash:
+    def test_stable_and_minimal_moves(self):
+        tags = ["tag{}".format(i) for i in range(2000)]
+        four, five = ConsistentHash(4), ConsistentHash(5)
+
+        shards = [four.shard(t) for t in tags]
+        assert shards == [ConsistentHash(4).shard(t) for t in tags]
+        assert all(shards.count(s) > 250 for s in range(4))
+
+        moved = sum(four.shard(t) != five.shard(t) for t in tags)
+        assert moved < len(tags) * 0.35
+
+
+class Test_WorkQueue:
+    def test_lease_complete_and_fail(self, tmp_path):
+        queue = WorkQueue(str(tmp_path / "crawl.db"), lease=0.2)
+        queue.setup(["a", "b"], depth=1, max_tags=3, shards=2, attempts=2)
+        queue.setup(["a"], depth=5)
+        assert queue.meta["depth"] == 1
+        assert queue.counts() == {"pending": 2}
+
+        leased = queue.lease("w1", limit=5)
+        assert sorted(h for h, _ in leased) == ["a", "b"]
+        assert queue.lease("w2") == []
+
+        queue.complete("a", 0, {"hashtag": "a"}, "w1", {"c": 0.5, "d": 0.9, "b": 1.0})
+        # Budget of 3 hashtags: only the best scored new neighbour is queued.
+        assert queue.lease("w1", limit=5) == [("d", 1)]
+
+        # Expired leases are taken over.
+        time.sleep(0.25)
+        assert sorted(queue.lease("w2", limit=5)) == [("b", 0), ("d", 1)]
+        assert queue.fail("b", ConnectionError("reset"), "w2") is False
+        assert queue.lease("w2") == [("b", 0)]
+        assert queue.fail("b", ConnectionError("reset"), "w2") is True
+        queue.complete("d", 1, {"hashtag": "d"}, "w2", {"e": 1.0})
+
+        assert queue.finished()
+        assert queue.counts() == {"done": 2, "failed": 1}
+        assert [r["hashtag"] for r in queue.results()] == ["a", "d"]
+        assert queue.failures() == {"b": "ConnectionError('reset')"}
+
+    def test_expired_lease_race(self, tmp_path):
+        queue = WorkQueue(str(tmp_path / "crawl.db"), lease=0.1)
+        queue.setup(["a"], depth=1, attempts=1)
+
+        assert queue.lease("slow") == [("a", 0)]
+        time.sleep(0.15)
+        assert queue.lease("fast") == [("a", 0)]
+        assert queue.complete("a", 0, {"hashtag": "a", "by": "fast"}, "fast", {"b": 1.0}) is True
+
+        # The worker whose lease was taken over can neither overwrite nor fail the result.
+        assert queue.complete("a", 0, {"hashtag": "a", "by": "slow"}, "slow", {"c": 1.0}) is False
+        assert queue.fail("a", ConnectionError("reset"), "slow") is False
+
+        assert queue.counts() == {"done": 1, "pending": 1}
+        assert list(queue.results()) == [{"hashtag": "a", "by": "fast"}]
+        assert queue.failures() == {}
+
+    def test_reshard(self, tmp_path):
+        queue = WorkQueue(str(tmp_path / "crawl.db"))
+        queue.setup(["tag{}".format(i) for i in range(50)], max_tags=100, shards=1)
+        queue.reshard(3)
+        assert queue.meta["shards"] == 3
+        expected = {"tag{}".format(i) for i in range(50) if ConsistentHash(3).shard("tag{}".format(i)) == 2}
+        assert {h for h, _ in queue.lease("w", shard=2, limit=len(expected))} == expected
+
+
+class Test_Work:
+    @pytest.mark.asyncio
+    async def test_workers_merge(self, tmp_path):
+        path = str(tmp_path / "crawl.db")
+        WorkQueue(path).setup(["a"], depth=5, shards=2, attempts=1)
+
+        async with Client(transport=Network) as client:
+            counts = await asyncio.gather(
+                work(path, shard=0, client=client, poll=0.01),
+                work(path, shard=1, client=client, poll=0.01),
+            )
+
+        queue = WorkQueue(path)
+        assert sum(counts) == 5
+        assert sorted(r["hashtag"] for r in queue.results()) == ["a", "b", "c", "d"]
+        assert list(queue.failures()) == ["e"]
+
+    @pytest.mark.asyncio
+    async def test_not_setup(self, tmp_path):
+        with pytest.raises(ValueError):
+            await work(str(tmp_path / "crawl.db"))
+
+    def test_run_processes(self, tmp_path):
+        output = str(tmp_path / "crawl.jsonl")
+        with MockServer(nodes=8, edges=8).background() as server:
+            counts = run(
+                str(tmp_path / "crawl.db"),
+                ["miami"],
+                processes=2,
+                depth=1,
+                max_tags=5,
+                output=output,
+                base_url=server.url,
+                limit_per_host=4,
+            )
+
+        assert counts == {"done": 5}
+        with open(output) as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[0]["hashtag"] == "miami" and len(lines) == 5
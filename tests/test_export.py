@@ -0,0 +1,91 @@
+import csv
+import json
+
+import pytest
+
+from instahashtag import Client, Graph, Tag
+from instahashtag.export import Exporter, JsonLinesWriter, exporter
+from instahashtag.wrapper.maps import Maps
+
+from .test_columns import Fixed
+
+
+@pytest.fixture
+def replies():
+    with Client(transport=Fixed) as client:
+        return Tag("miami", client=client), Graph("miami", client=client)
+
+
+class Test_Exporters:
+    def test_csv_row_groups(self, tmp_path, replies):
+        tag, _ = replies
+        failed = Tag("gone", aio=True)
+        failed.error = ConnectionError("reset")
+
+        path = str(tmp_path / "results.csv")
+        with exporter(path, "tag_results", row_group_size=3) as out:
+            assert out.write_many([tag, failed]) == 2
+            assert out.count == 0
+            out.write(tag)
+            assert out.count == 4
+            out.write(tag)
+        assert out.count == 6
+
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 6
+        assert rows[0]["query"] == "miami" and rows[0]["tag"] == "a" and rows[1]["geo_lat"] == "nan"
+
+    def test_jsonl(self, tmp_path, replies):
+        _, graph = replies
+        path = str(tmp_path / "edges.jsonl")
+        with exporter(path, "graph_edges") as out:
+            out.write(graph)
+
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        assert rows[1] == {"query": "miami", "id": "liv#gone", "a": "liv", "b": "gone", "weight": 0.1}
+
+    @pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+    def test_arrow(self, tmp_path, extension):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        body = b'{"count": 2, "tags": [{"centroid": [25.8, -80.2], "tag": "a", "weight": 5}, {"tag": "b", "weight": 1}]}'
+        maps = Maps.from_body(-81.0, 25.0, -80.0, 26.0, 12.5, body=body)
+
+        path = str(tmp_path / ("tags" + extension))
+        with exporter(path, "maps_tags", row_group_size=2) as out:
+            out.write_many([maps, maps, maps])
+
+        if extension == ".parquet":
+            table = pyarrow.parquet.read_table(path)
+            assert pyarrow.parquet.ParquetFile(path).num_row_groups == 3
+        else:
+            table = pyarrow.ipc.open_file(path).read_all()
+
+        assert table.num_rows == 6
+        assert table.schema.field("zoom").type == pyarrow.float64()
+        assert table.column("zoom").to_pylist()[0] == 12.5
+        assert table.column("tag").to_pylist()[:2] == ["a", "b"]
+        assert table.column("x1").to_pylist()[0] == -81.0
+
+    def test_unsupported(self, tmp_path):
+        with pytest.raises(ValueError):
+            exporter(str(tmp_path / "out.xlsx"), "tag_results")
+        with pytest.raises(TypeError):
+            Exporter(str(tmp_path / "out.bin"), "tag_results")
+        with pytest.raises(ValueError):
+            exporter(str(tmp_path / "out.csv"), "users")
+
+
+class Test_JsonLinesWriter:
+    def test_append(self, tmp_path):
+        path = str(tmp_path / "out.jsonl")
+        for value in (1, 2):
+            with JsonLinesWriter(path) as writer:
+                writer.write({"value": value})
+
+        with open(path) as f:
+            assert [json.loads(line)["value"] for line in f] == [1, 2]
@@ -15,3 +15,14 @@ class Test_Graph_async:
     async def test_init(self):
         graph = Graph("miami", aio=True)
         await graph.call()
+
+
+class Test_GraphEdge:
+    def test_slots_and_interning(self):
+        from instahashtag.wrapper.graph import GraphEdge
+
+        a = GraphEdge(a="".join(["mia", "mi"]), b="liv", id="miami#liv", weight=0.5)
+        b = GraphEdge(a="liv", b="".join(["mi", "ami"]), id="liv#miami", weight=0.5)
+
+        assert a.a is b.b
+        assert not hasattr(a, "__dict__")
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from instahashtag import Tag
+from instahashtag.history import ROOT, History
+
+DAY = 86400.0
+
+
+def tag(rank, results):
+    body = {
+        "tag": "miami",
+        "rank": rank,
+        "tagExists": True,
+        "results": [
+            {"tag": t, "rank": r, "geo": None, "media_count": m, "relevance": 90, "absRelevance": 0.1}
+            for t, r, m in results
+        ],
+    }
+    return Tag.from_body("miami", body=json.dumps(body))
+
+
+class Test_History:
+    def test_delta_and_state(self, tmp_path):
+        history = History(str(tmp_path / "history.db"))
+
+        assert history.add(tag(80, [("beach", 70, 1000), ("vice", 50, 100)]), at=0) == 7
+        assert history.add(tag(80, [("beach", 70, 1000), ("vice", 50, 100)]), at=DAY) == 0
+        assert history.add(tag(85, [("beach", 70, 1100), ("wynwood", 60, 10)]), at=2 * DAY) == 8
+
+        assert history.stats() == {"snapshots": 3, "changes": 15}
+        assert history.snapshots("miami") == [0, DAY, 2 * DAY]
+        assert history.series("miami") == [(0, 80), (2 * DAY, 85)]
+        assert history.series("miami", "media_count", related="vice") == [(0, 100), (2 * DAY, None)]
+
+        assert history.state("miami", at=DAY) == {
+            ROOT: {"rank": 80},
+            "beach": {"rank": 70, "media_count": 1000, "relevance": 90},
+            "vice": {"rank": 50, "media_count": 100, "relevance": 90},
+        }
+        assert sorted(history.state("miami")) == [ROOT, "beach", "wynwood"]
+
+        # The materialised latest state survives a reopen.
+        history.close()
+        assert History(str(tmp_path / "history.db")).state("miami") == history.state("miami")
+
+    def test_changes(self, tmp_path):
+        history = History(str(tmp_path / "history.db"))
+        history.add(tag(80, [("beach", 70, 1000), ("vice", 50, 100)]), at=0)
+        history.add(tag(85, [("beach", 71, 1100), ("wynwood", 60, 10)]), at=2 * DAY)
+
+        changes = history.changes("miami", since=DAY, min_jump=2)
+        assert changes.added == ["wynwood"]
+        assert changes.removed == ["vice"]
+        assert changes.rank == {ROOT: (80, 85)}
+        assert changes.growth["beach"] == pytest.approx(0.05)
+
+        assert history.hashtags() == ["miami"]
+        assert history.hashtags(since=DAY) == ["miami"]
+        assert history.hashtags(since=2 * DAY) == []
@@ -0,0 +1,23 @@
+from instahashtag import Client, Graph, Tag
+
+from .test_columns import Fixed
+
+
+class Test_Lazy:
+    def test_results_built_on_access(self):
+        with Client(transport=Fixed) as client:
+            tag = Tag("miami", client=client)
+
+        assert tag._results is None
+        assert [r.tag for r in tag.iter_results()] == ["a", "b"]
+        assert tag._results is None
+        assert max(tag.results).tag == "b"
+        assert tag.results is tag.results
+
+    def test_graph_built_on_access(self):
+        with Client(transport=Fixed) as client:
+            graph = Graph("miami", client=client)
+
+        assert graph._edges is None and graph._nodes is None
+        assert [n.id for n in graph.iter_nodes()] == ["miami", "liv"]
+        assert len(graph.edges) == 2
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from instahashtag import Client, Tag
+from instahashtag import limiter as limiter_module
+from instahashtag.http import Base
+from instahashtag.limiter import AdaptiveConcurrency, TokenBucket
+
+
+class Status(Exception):
+    def __init__(self, status):
+        self.status = status
+
+
+class Test_TokenBucket:
+    def test_burst_then_paced(self, monkeypatch):
+        monkeypatch.setattr(limiter_module.time, "monotonic", lambda: 100.0)
+        bucket = TokenBucket(rate=10, burst=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+        assert bucket.state()["tokens"] == pytest.approx(-2)
+
+
+class Test_AdaptiveConcurrency:
+    def test_aimd(self):
+        adaptive = AdaptiveConcurrency(initial=4, maximum=8)
+
+        for _ in range(8):
+            adaptive.acquire()
+            adaptive.release(0.1)
+        grown = adaptive.limit
+        assert grown > 4
+
+        for _ in range(3):
+            adaptive.acquire()
+            adaptive.release(0.1, Status(503))
+        assert adaptive.limit == pytest.approx(grown / 2)
+        assert adaptive.state()["backoffs"] == 1
+
+        adaptive.acquire()
+        adaptive.release(0.1, Status(404))
+        assert adaptive.state()["overloads"] == 3
+
+    @pytest.mark.asyncio
+    async def test_bounds_in_flight(self):
+        adaptive = AdaptiveConcurrency(initial=3, maximum=3)
+        peak = 0
+
+        class Slow(Base):
+            async def call(self):
+                nonlocal peak
+                peak = max(peak, adaptive.in_flight)
+                await asyncio.sleep(0.001)
+                return {"rank": 1, "results": []}
+
+        async with Client(transport=Slow, concurrency_limiter=adaptive) as client:
+            tags = [Tag(str(i), client=client) for i in range(20)]
+            await asyncio.gather(*(tag.call() for tag in tags))
+
+        assert peak == 3
+        assert adaptive.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_ignores_cancellations(self):
+        adaptive = AdaptiveConcurrency(initial=4, maximum=16)
+        started = asyncio.Event()
+
+        class Hanging(Base):
+            async def call(self):
+                started.set()
+                await asyncio.sleep(60)
+
+        async with Client(transport=Hanging, concurrency_limiter=adaptive) as client:
+            tasks = [asyncio.ensure_future(Tag(str(i), client=client).call()) for i in range(4)]
+            await started.wait()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert adaptive.limit == 4
+        assert adaptive.in_flight == 0
+        assert adaptive.state()["overloads"] == 0
+
+    def test_ignores_client_errors(self):
+        adaptive = AdaptiveConcurrency(initial=4, maximum=16)
+
+        for error in (ValueError("Expecting value"), asyncio.CancelledError()):
+            adaptive.acquire()
+            adaptive.release(0.1, error)
+        assert adaptive.limit == 4
+
+        adaptive.acquire()
+        adaptive.release(0.1, asyncio.TimeoutError())
+        assert adaptive.limit == 2
@@ -0,0 +1,56 @@
+from instahashtag import Client, Tag
+from instahashtag.cache import MemoryCache
+from instahashtag.hooks import Hooks
+from instahashtag.http import Base
+from instahashtag.metrics import Histogram, Metrics
+from instahashtag.retry import Retry
+
+
+class Flaky(Base):
+    fail = 1
+
+    def call(self):
+        if Flaky.fail:
+            Flaky.fail -= 1
+            raise ConnectionError("reset")
+        return self.process(b'{"rank": 1, "results": []}')
+
+
+class Test_Metrics:
+    def test_histogram(self):
+        histogram = Histogram(buckets=(1, 2))
+        for value in (0.5, 1.5, 3):
+            histogram.observe(value)
+        assert histogram.to_dict()["buckets"] == {1: 1, 2: 2, float("inf"): 3}
+
+    def test_collects(self, monkeypatch):
+        monkeypatch.setattr("instahashtag.http.time.sleep", lambda delay: None)
+        hooks = Hooks()
+        metrics = Metrics().register(hooks)
+        events = []
+        hooks.register("before_request", lambda request: events.append(request.endpoint))
+
+        with Client(transport=Flaky, hooks=hooks, retry=Retry(), cache=MemoryCache()) as client:
+            Tag("miami", client=client)
+            Tag("miami", client=client)
+
+        tag = metrics.to_dict()["tag"]
+        assert len(events) == 2
+        assert (tag["requests"], tag["errors"], tag["retries"], tag["cache_hits"]) == (2, 1, 1, 1)
+        assert tag["bytes"] == len(b'{"rank": 1, "results": []}')
+        assert tag["parse"]["count"] == 1
+        assert 'instahashtag_requests_total{endpoint="tag"} 2' in metrics.to_prometheus()
+
+    def test_counts_bytes_of_text_bodies(self):
+        body = '{"rank": 1, "results": [{"tag": "café"}]}'
+
+        class Text(Base):
+            def call(self):
+                return self.process(body)
+
+        hooks = Hooks()
+        metrics = Metrics().register(hooks)
+        with Client(transport=Text, hooks=hooks) as client:
+            Tag("miami", client=client)
+
+        assert metrics.to_dict()["tag"]["bytes"] == len(body.encode("utf-8")) == len(body) + 1
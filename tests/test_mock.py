@@ -0,0 +1,59 @@
+import pytest
+from instahashtag import Client, Graph, Maps, Tag
+from instahashtag.http import HTTPError, Requests
+from instahashtag.mock import MockServer
+from instahashtag.replay import AsyncReplay, Cassette, MissingRecording, Replay, record
+
+
+class Test_MockServer:
+    @pytest.mark.asyncio
+    async def test_async(self):
+        async with MockServer(results=7, nodes=5, edges=4, tags=3) as server:
+            async with Client(aio=True, base_url=server.url) as client:
+                tag = Tag("miami", client=client)
+                graph = Graph("miami", client=client)
+                maps = Maps(0, 0, 1, 1, 12, client=client)
+                for obj in (tag, graph, maps):
+                    await obj.call()
+
+        assert len(tag.results) == 7
+        assert len(graph.nodes) == 5 and len(graph.edges) == 4
+        assert maps.count == 3
+        assert server.requests == {"tag": 1, "graph": 1, "maps": 1}
+
+    def test_sync_errors(self):
+        with MockServer(error_rate=1.0).background() as server:
+            with Client(base_url=server.url) as client:
+                with pytest.raises(HTTPError) as error:
+                    Tag("miami", client=client)
+
+        assert error.value.status == 503
+
+
+class Test_Replay:
+    def test_record_and_replay(self, tmp_path):
+        cassette = Cassette(str(tmp_path / "cassette.json"))
+
+        with MockServer(results=3).background() as server:
+            with Client(transport=record(Requests, cassette), base_url=server.url) as client:
+                recorded = Tag("miami", client=client)
+        cassette.save()
+
+        cassette = Cassette(cassette.path)
+        with Client(transport=Replay.using(cassette), base_url=server.url) as client:
+            replayed = Tag("miami", client=client)
+            with pytest.raises(MissingRecording):
+                Tag("travel", client=client)
+
+        assert replayed.data == recorded.data
+
+    @pytest.mark.asyncio
+    async def test_async_replay(self, tmp_path):
+        cassette = Cassette(str(tmp_path / "cassette.json"))
+        cassette.put("https://apidisplaypurposes.com/tag/miami", b'{"rank": 9}')
+
+        async with Client(transport=AsyncReplay.using(cassette)) as client:
+            tag = Tag("miami", client=client)
+            await tag.call()
+
+        assert tag.rank == 9
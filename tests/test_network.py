@@ -0,0 +1,72 @@
+import pytest
+
+from instahashtag import network
+from instahashtag.network import HashtagGraph
+
+
+def graph(*edges):
+    return {
+        "nodes": [{"id": a, "relevance": 1.0, "weight": 1.0, "x": 0.0, "y": 0.0} for a, _, _ in edges],
+        "edges": [{"a": a, "b": b, "id": "{}#{}".format(a, b), "weight": w} for a, b, w in edges],
+    }
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(network, "numpy", None)
+    return request.param
+
+
+class Test_HashtagGraph:
+    def test_merge(self, backend):
+        index = HashtagGraph([
+            graph(("miami", "beach", 0.5), ("miami", "travel", 0.2)),
+            graph(("beach", "miami", 0.9), ("beach", "beach", 1.0), ("travel", "nyc", 0.3)),
+        ])
+
+        assert len(index) == 4
+        assert index.edge_count == 3
+        assert "nyc" in index and "paris" not in index
+        assert sorted(index.neighbours("miami")) == [("beach", 0.9), ("travel", 0.2)]
+        assert index.degree("miami") == pytest.approx(1.1)
+        assert index.degree("nyc", weighted=False) == 1
+
+        index.add(graph(("nyc", "paris", 0.4)))
+        assert list(index.neighbours("paris")) == [("nyc", 0.4)]
+
+    def test_shortest_path(self, backend):
+        index = HashtagGraph([
+            graph(("a", "b", 0.1), ("b", "d", 0.1), ("a", "c", 1.0), ("c", "e", 1.0), ("e", "d", 1.0)),
+            graph(("x", "y", 1.0)),
+        ])
+
+        assert index.shortest_path("a", "d") == ["a", "b", "d"]
+        assert index.shortest_path("a", "d", weighted=True) == ["a", "c", "e", "d"]
+        assert index.shortest_path("a", "a") == ["a"]
+        assert index.shortest_path("a", "x") is None
+
+    def test_pagerank(self, backend):
+        index = HashtagGraph([graph(("hub", "a", 1.0), ("hub", "b", 1.0), ("hub", "c", 1.0), ("c", "d", 1.0))])
+        index.node("lonely")
+
+        scores = index.pagerank()
+        assert sum(scores.values()) == pytest.approx(1.0)
+        assert max(scores, key=scores.get) == "hub"
+
+        personal = index.pagerank(personalization={"d": 1.0})
+        assert sum(personal.values()) == pytest.approx(1.0)
+        assert personal["d"] > scores["d"]
+        assert personal["lonely"] == pytest.approx(0.0)
+
+    def test_backends_agree(self, monkeypatch):
+        pytest.importorskip("numpy")
+        index = HashtagGraph([graph(("a", "b", 0.5), ("b", "c", 2.0), ("c", "a", 1.0), ("c", "d", 0.1))])
+        fast = index.pagerank(personalization={"a": 1.0})
+
+        monkeypatch.setattr(network, "numpy", None)
+        index._csr = None
+        slow = index.pagerank(personalization={"a": 1.0})
+        assert slow == pytest.approx(fast, abs=1e-6)
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from instahashtag import Client, Tag
+from instahashtag import retry as retry_module
+from instahashtag.hooks import Hooks
+from instahashtag.http import Base, HTTPError
+from instahashtag.limiter import AdaptiveConcurrency
+from instahashtag.retry import CircuitBreaker, CircuitOpenError, Retry
+
+
+class Flaky(Base):
+    statuses = []
+
+    def call(self):
+        status = Flaky.statuses.pop(0)
+        self.raise_for_status(status)
+        return self.process('{"rank": 1, "tagExists": true, "results": []}')
+
+
+class Test_Retry:
+    def test_retries_transient(self, monkeypatch):
+        monkeypatch.setattr("instahashtag.http.time.sleep", lambda delay: None)
+        Flaky.statuses = [502, 503, 200]
+
+        with Client(transport=Flaky, retry=Retry(attempts=3)) as client:
+            tag = Tag("miami", client=client)
+
+        assert tag.exists is True
+        assert Flaky.statuses == []
+
+    def test_does_not_retry_client_errors(self, monkeypatch):
+        monkeypatch.setattr("instahashtag.http.time.sleep", lambda delay: None)
+        Flaky.statuses = [404, 200]
+
+        with Client(transport=Flaky, retry=Retry(attempts=3)) as client:
+            with pytest.raises(HTTPError) as error:
+                Tag("miami", client=client)
+
+        assert error.value.status == 404
+
+    def test_delay(self):
+        retry = Retry(backoff=1, max_backoff=5, jitter=False)
+        assert [retry.delay(n) for n in range(4)] == [1, 2, 4, 5]
+        assert 0 <= Retry(backoff=1).delay(3) <= 8
+
+
+class Test_CircuitBreaker:
+    def test_open_and_reset(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(retry_module.time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker(threshold=2, reset_timeout=10)
+
+        for _ in range(2):
+            breaker.before()
+            breaker.record(HTTPError(503, "tag"))
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before()
+
+        now[0] += 10
+        breaker.before()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before()
+
+        breaker.record()
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_ignores_cancellations_and_bad_bodies(self):
+        breaker = CircuitBreaker(threshold=1)
+        started = asyncio.Event()
+
+        class Hanging(Base):
+            async def call(self):
+                started.set()
+                await asyncio.sleep(60)
+
+        async with Client(transport=Hanging, breaker=breaker) as client:
+            task = asyncio.ensure_future(Tag("miami", client=client).call())
+            await started.wait()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        assert breaker.state == "closed"
+
+        class Garbled(Base):
+            async def call(self):
+                return self.process("<html>")
+
+        async with Client(transport=Garbled, breaker=breaker) as client:
+            with pytest.raises(ValueError):
+                await Tag("miami", client=client).call()
+        assert breaker.state == "closed"
+
+        breaker.record(asyncio.TimeoutError())
+        assert breaker.state == "open"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_is_released(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        breaker.record(asyncio.TimeoutError())
+        adaptive = AdaptiveConcurrency(initial=1, maximum=1)
+        adaptive.acquire()
+
+        class Ok(Base):
+            async def call(self):
+                return self.process('{"rank": 1, "results": []}')
+
+        async with Client(transport=Ok, breaker=breaker, concurrency_limiter=adaptive) as client:
+            # The half-open trial waits for the held concurrency slot, and is cancelled meanwhile.
+            task = asyncio.ensure_future(Tag("miami", client=client).call())
+            await asyncio.sleep(0.01)
+            assert breaker.state == "half-open"
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            adaptive.release(0.0)
+
+            await Tag("travel", client=client).call()
+
+        assert breaker.state == "closed"
+        assert adaptive.in_flight == 0
+
+    def test_failing_hook_releases_slot(self):
+        adaptive = AdaptiveConcurrency(initial=1, maximum=1)
+        hooks = Hooks()
+
+        def broken(request):
+            raise RuntimeError("hook")
+
+        hooks.register("before_request", broken)
+        Flaky.statuses = [200]
+        with Client(transport=Flaky, hooks=hooks, concurrency_limiter=adaptive) as client:
+            with pytest.raises(RuntimeError):
+                Tag("miami", client=client)
+        assert adaptive.in_flight == 0
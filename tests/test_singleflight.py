@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from instahashtag import Client, Tag
+from instahashtag.http import Base
+from instahashtag.singleflight import SingleFlight
+
+
+class Slow(Base):
+    calls = 0
+
+    async def call(self):
+        Slow.calls += 1
+        await asyncio.sleep(0.01)
+        return {"tag": "miami", "rank": 1, "tagExists": True, "results": []}
+
+
+class Test_SingleFlight:
+    @pytest.mark.asyncio
+    async def test_async_coalesced(self):
+        Slow.calls = 0
+        async with Client(transport=Slow, coalesce=True) as client:
+            tags = [Tag("miami", client=client) for _ in range(20)]
+            await asyncio.gather(*(tag.call() for tag in tags))
+
+        assert Slow.calls == 1
+        assert client.flight.coalesced == 19
+        assert all(tag.data is tags[0].data for tag in tags)
+
+    def test_threads_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"rank": 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("key", fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert len(flight) == 0
+
+    def test_error_propagated(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do("key", fail)
+        assert flight.do("key", lambda: 1) == 1
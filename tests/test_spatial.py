@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from instahashtag import Client, Tag
+from instahashtag import spatial
+from instahashtag.spatial import SpatialIndex, haversine
+from instahashtag.wrapper.maps import Maps
+
+from .test_columns import Fixed
+
+
+def points(count=2000, seed=0):
+    rand = random.Random(seed)
+    return [("p{}".format(i), rand.uniform(25.0, 26.0), rand.uniform(-81.0, -80.0)) for i in range(count)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(spatial, "numpy", None)
+    return request.param
+
+
+class Test_SpatialIndex:
+    def test_queries_match_brute_force(self, backend):
+        data = points()
+        index = SpatialIndex(cell=0.1)
+        for name, lat, lon in data:
+            index.add(name, lat, lon)
+
+        inside = sorted(n for n, lat, lon in data if 25.2 <= lat <= 25.8 and -80.9 <= lon <= -80.1)
+        assert sorted(index.bbox(-80.9, 25.8, -80.1, 25.2)) == inside
+
+        near = sorted((haversine(25.5, -80.5, lat, lon), n) for n, lat, lon in data)
+        assert [n for n in index.radius(25.5, -80.5, km=10)] == [n for d, n in near if d <= 10]
+        assert [n for _, n in index.nearest(25.5, -80.5, k=5)] == [n for _, n in near[:5]]
+        assert [n for _, n in index.nearest(30.0, -70.0, k=3)] == [
+            n for _, n in sorted((haversine(30.0, -70.0, lat, lon), n) for n, lat, lon in data)[:3]
+        ]
+
+        triangle = [(25.0, -81.0), (26.0, -81.0), (26.0, -80.0)]
+        assert sorted(index.polygon(triangle)) == sorted(n for n, lat, lon in data if lon - -81.0 < lat - 25.0)
+
+    def test_unique_and_incremental(self):
+        index = SpatialIndex(cell=1.0)
+        index.add("miami", 25.7, -80.2)
+        index.add("miami", 40.7, -74.0)
+        index.add("nyc", 40.8, -73.9)
+
+        assert len(index) == 2
+        assert index.bbox(-81, 25, -80, 26) == []
+        assert [n for _, n in index.nearest(40.7, -74.0, k=2)] == ["miami", "nyc"]
+        assert index.stats()["cells"] == 1
+
+    def test_ingest_replies(self):
+        maps = Maps.from_body(0, 0, 1, 1, 12, body=b'{"count": 1, "tags": [{"centroid": [25.8, -80.2], "tag": "wynwood", "weight": 5}]}')
+        with Client(transport=Fixed) as client:
+            tag = Tag("miami", client=client)
+
+        index = SpatialIndex()
+        index.extend([maps, tag])
+        assert sorted(r.tag for r in index.bbox(-81, 0, 3, 26)) == ["a", "wynwood"]
+        assert index.nearest(25.8, -80.2)[0][1].weight == 5
@@ -18,3 +18,15 @@ class Test_Tag_async:
     async def test_init(self):
         tag = Tag("miami", aio=True)
         await tag.call()
+
+
+class Test_TagResult:
+    def test_slots_and_interning(self):
+        from instahashtag.wrapper.tag import TagResult
+
+        kwargs = dict(rank=1, geo=[0.0, 0.0], media_count=1, relevance=1, absRelevance=0.1)
+        a = TagResult(tag="".join(["mia", "mi"]), **kwargs)
+        b = TagResult(tag="".join(["mi", "ami"]), **kwargs)
+
+        assert a.tag is b.tag
+        assert not hasattr(a, "__dict__")
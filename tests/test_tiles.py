@@ -0,0 +1,56 @@
+import pytest
+
+from instahashtag import Client
+from instahashtag.cache import MemoryCache
+from instahashtag.http import Base
+from instahashtag.tiles import Tiles, grid, tile_size
+
+
+class Tiled(Base):
+    calls = []
+
+    async def call(self):
+        bbox = self.endpoint.split("bbox=")[1].split("&")[0]
+        x1, y1, x2, y2 = map(float, bbox.split(","))
+        Tiled.calls.append((x1, y1))
+        if x1 < 0:
+            raise ConnectionError("reset")
+        lat, lon = (y1 + y2) / 2, (x1 + x2) / 2
+        return {
+            "count": 2,
+            "tags": [
+                {"centroid": [lat, lon], "tag": "t{}_{}".format(x1, y1), "weight": 1},
+                {"centroid": [lat, lon], "tag": "shared", "weight": int(x1 + y1)},
+            ],
+        }
+
+
+class Test_Grid:
+    def test_aligned(self):
+        assert tile_size(2) == 90.0
+        assert grid(10, 10, 100, 50, 2) == [(0.0, 0.0, 90.0, 90.0, 2), (90.0, 0.0, 180.0, 90.0, 2)]
+        assert grid(100, 50, 10, 10, 2) == grid(10, 10, 100, 50, 2)
+        assert grid(5, 5, 5, 5, 2) == [(0.0, 0.0, 90.0, 90.0, 2)]
+
+    def test_max_tiles(self):
+        with pytest.raises(ValueError):
+            grid(-80.5, 25.7, -79.8, 25.9, 16, max_tiles=10)
+
+
+class Test_Tiles:
+    @pytest.mark.asyncio
+    async def test_merge_and_cache(self):
+        Tiled.calls = []
+        async with Client(transport=Tiled, cache=MemoryCache()) as client:
+            tiles = Tiles(-10, 10, 170, 80, zoom=2, client=client)
+            streamed = [maps async for maps in tiles]
+
+            assert len(streamed) == len(tiles.tiles) == 3
+            assert list(tiles.errors) == [(-90.0, 0.0, 0.0, 90.0, 2)]
+            # 'shared' keeps the highest weight; tags of tiles centred outside the box are dropped.
+            assert [(t.tag, t.weight) for t in tiles.tags] == [("shared", 90), ("t0.0_0.0", 1), ("t90.0_0.0", 1)]
+
+            # Panning over fetched tiles only requests the new ones.
+            Tiled.calls = []
+            await Tiles(100, 10, 200, 80, zoom=2, client=client).call()
+            assert Tiled.calls == [(180.0, 0.0)]
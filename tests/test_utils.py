@@ -0,0 +1,43 @@
+import asyncio
+import hashlib
+
+import pytest
+from instahashtag import utils
+
+
+class Test_Utils:
+    def test_token(self):
+        value = "{}|miami|{}".format(utils.USERAGENT, utils.STRING).encode("utf-8")
+        assert utils.generate_token("miami") == hashlib.md5(value).hexdigest()
+        assert utils.generate_tokens(["miami", "travel"]) == [
+            utils.generate_token("miami"),
+            utils.generate_token("travel"),
+        ]
+
+    def test_header(self):
+        headers = utils.generate_header("miami")
+        assert headers["api-token"] == utils.generate_token("miami")
+        assert headers is utils.generate_header("miami")
+        assert utils.generate_header()["api-token"] == "test"
+        assert utils.HEADERS["api-token"] is None
+
+        with pytest.raises(TypeError):
+            headers["api-token"] = "test"
+
+    def test_run(self):
+        cancelled = []
+
+        async def background():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main():
+            asyncio.ensure_future(background())
+            await asyncio.sleep(0)
+            return 42
+
+        assert utils.run(main()) == 42
+        assert cancelled == [True]